@@ -5,18 +5,25 @@ Created on Thu Jan  3 16:04:05 2026
 # ================================
 # controller/dashboard_controller.py
 # ================================
-# File version: v1.0.10
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.0.13
+# Sync'd to dashboard release: v3.10.0
 # Description: DashboardController — orchestrates startup, config loading, file watching, and shutdown
 #
 # Feature Update: v1.0.10
 # ✅ Auto-reload now instant by default with "Don't ask again" checkbox
 # ✅ Preference stored in preferences.json
 # ✅ Preserved on_file_changed method from v1.0.8
+#
+# Feature Update: v1.0.11
+# ✅ Preferences loaded before the dispatcher so ingest settings apply at startup
+# Feature Update: v1.0.12
+# ✅ apply_config() — every reload path rebuilds tiles AND rebinds dispatcher sources
+# Feature Update: v1.0.13
+# ✅ Layout-file debounce is a one-shot job on the dispatcher's scheduler (no private QTimer)
 # ================================
 """
 
-from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer
+from PyQt6.QtCore import QObject, QFileSystemWatcher
 from pathlib import Path
 from PyQt6.QtWidgets import QCheckBox, QMessageBox
 
@@ -32,15 +39,15 @@ class DashboardController(QObject):
         super().__init__()
         self.main_window = main_window
 
+        # Preferences — dispatcher reads ingest settings from here
+        self.prefs = load_prefs()
+
         # Dispatcher first
-        self.dispatcher = DataDispatcher()
+        self.dispatcher = DataDispatcher(self.prefs)
 
         # View — pass dispatcher
         self.view = DashboardView(self.dispatcher)
 
-        # Preferences
-        self.prefs = load_prefs()
-
         # File watcher in controller domain
         self.setup_file_watcher()
 
@@ -55,6 +62,11 @@ class DashboardController(QObject):
         LOG3(300 + 10, f"Loaded {len(config)} tiles")
         self.view.load_config(config)
 
+    def apply_config(self, config):
+        """Reload tiles and rebind sources (subscription delta is computed by the dispatcher)."""
+        self.view.load_config(config)
+        self.dispatcher.bind_config(config)
+
     def setup_file_watcher(self):
         config_path = Path(CONFIG_FILE)
         if config_path.exists():
@@ -65,23 +77,22 @@ class DashboardController(QObject):
 			 
 																						  
 
-        # Debounce timer
-        self.debounce_timer = QTimer()
-        self.debounce_timer.setSingleShot(True)
-        self.debounce_timer.setInterval(500)
-        self.debounce_timer.timeout.connect(self.on_file_changed_debounced)
+        # Debounce — one-shot scheduler job, restarted on every change event
+        self.debounce_job = None
 
     def trigger_debounce(self):
-														  
-        self.debounce_timer.start()
+        if self.debounce_job:
+            self.debounce_job.release()
+        self.debounce_job = self.dispatcher.scheduler.call_later(
+            "layout debounce", 0.5, self.on_file_changed_debounced
+        )
 
     def on_file_changed_debounced(self):
 														  
         LOG3(300 + 61, "External change detected in layout.json (debounced)")
         if self.prefs.get("auto_reload_no_prompt", False):
             LOG3(300 + 62, "Auto-reloading (no prompt)")
-            new_config = load_config()
-            self.view.load_config(new_config)
+            self.apply_config(load_config())
         else:
             self.prompt_reload()
 
@@ -102,8 +113,7 @@ class DashboardController(QObject):
                 self.prefs["auto_reload_no_prompt"] = True
                 save_prefs(self.prefs)
                 LOG3(300 + 63, "Auto-reload prompt disabled")
-            new_config = load_config()
-            self.view.load_config(new_config)
+            self.apply_config(load_config())
 
     def on_file_changed(self, path):
         """Preserved from v1.0.8 — routes to debounce"""
@@ -112,8 +122,8 @@ class DashboardController(QObject):
 
     def stop_file_watcher(self):
 									 
-        if hasattr(self, 'debounce_timer'):
-            self.debounce_timer.stop()
+        if getattr(self, 'debounce_job', None):
+            self.debounce_job.release()
 																					  
         if hasattr(self, 'watcher'):
             try:
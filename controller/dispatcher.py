@@ -5,13 +5,13 @@ Created on Thu Jan  6 16:04:05 2026
 # ================================
 # controller/dispatcher.py
 # ================================
-# File version: v1.9.4
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.32.1
+# Sync'd to dashboard release: v3.10.0
 # Description: DataDispatcher — central data bus for inbound sources
 #
 # Features:		   
 # ✅ Manages MQTT client lifecycle and message routing
-# ✅ Creates and manages SystemPropertySource instances
+# ✅ Creates and manages system property sampling
 # ✅ register_cb(key, callback) — appends callbacks for multi-sink support
 # ✅ Emits data to registered callbacks
 # ✅ Graceful shutdown
@@ -19,162 +19,524 @@ Created on Thu Jan  6 16:04:05 2026
 #
 # Feature Update: v1.9.4
 # ✅ Added weather polling source (WeatherAPI.com, 15-min interval)
+# Feature Update: v1.10.0
+# ✅ Coalescing MQTT ingest — per-topic last-value buffer drained once per frame
+#    (prefs "mqtt_coalesce_hz"), coalesced counters shown in dump_registrations()
+# Feature Update: v1.11.0
+# ✅ mqtt:* channels carry the MqttMessage record parsed once in the MQTT thread,
+#    so fan-out to N tiles costs one parse
+# Feature Update: v1.12.0
+# ✅ Wildcard MQTT bindings ('+' / '#') routed through a TopicTrie — each message
+#    reaches its exact channel plus every matching mqtt:<pattern> channel
+# Feature Update: v1.13.0
+# ✅ bind_config() diffs MQTT topic refcounts against the previous layout and
+#    subscribes / unsubscribes the delta on the live connection
+# Feature Update: v1.14.0
+# ✅ MqttBrokerPool replaces the single client — bindings may name a "broker",
+#    channels are broker-qualified (mqtt@<name>:<topic>), per-broker stats in dump
+# Feature Update: v1.15.0
+# ✅ Binding "rate_limit" caps — per-topic limits enforced in the MQTT thread, stricter
+#    per-binding limits via register_binding(); held values released on the frame tick
+# Feature Update: v1.16.0
+# ✅ Retained-message burst after (re)connect delivered as one batch, one frame later
+# ✅ Binding "qos" (0 / 1) — topic subscribed at the highest QoS among its bindings
+# Feature Update: v1.17.0
+# ✅ Binding "path" (e.g. "t", "outdoor.temp", "readings.0") — field channels
+#    mqtt:<topic>|<path> with the extractor compiled once at registration; every
+#    field is cut from the one payload parse done in the MQTT thread
+# Feature Update: v1.18.0
+# ✅ Binding "decode" (struct format + field names, msgpack, cbor) — binary frames
+#    decoded in the MQTT thread; "path" fans one frame out to named field channels
+# Feature Update: v1.19.0
+# ✅ register_cb() / register_binding() return a Subscription handle; release() drops
+#    the sink and prunes empty channels (wildcard trie, field extractors)
+# ✅ owner= — channel lists hold weakrefs, the owner keeps the handle; dead sinks are
+#    pruned on emit so tile reloads no longer accumulate callbacks
+# ✅ Binding throttles tracked in a WeakSet — released bindings leave the frame tick
+# Feature Update: v1.20.0
+# ✅ ChannelRouter — channels interned to integer IDs, flat per-channel sink tuples
+#    rebuilt only when registrations change; MQTT messages resolve broker → topic → cid
+#    without building key strings. Field channels and wildcard tries carry cids too
+# ✅ register_cb() de-duplicates by callback hash (O(1) instead of a list scan)
+# Feature Update: v1.21.0
+# ✅ register_batch(keys, on_batch) — updates to any of the keys collected per frame and
+#    delivered as one on_batch({channel_key: value}) call on the frame tick
+# Feature Update: v1.22.0
+# ✅ SystemSampler thread replaces one SystemPropertySource + QTimer per binding —
+#    system_prop bindings de-duplicated by prop, sampled together off the GUI thread;
+#    cpu_load no longer blocks the GUI for a second (non-blocking psutil form)
+# Feature Update: v1.23.0
+# ✅ TimingWheel scheduler owns periodic work — system_prop sampling (one job per
+#    interval, aligned boundaries) and weather polling (jittered); scheduler stats in dump
+# Feature Update: v1.24.0
+# ✅ Last-value cache per channel — register_cb() replays the newest value immediately,
+#    so reloaded / newly added tiles paint populated; last_value(key) for tools
+# Feature Update: v1.25.0
+# ✅ Change suppression — binding "suppress" ("exact" / deadband number / "none") drops
+#    unchanged values before fan-out; system_prop bindings default to "exact";
+#    suppressed counts per channel in the dump
+# Feature Update: v1.26.0
+# ✅ Source registry (controller/sources) — bind_config() loads a source plugin per binding /
+#    tile type the layout uses; mqtt / system_prop / weather moved into plugins, so psutil
+#    and requests are imported only when a layout needs them
+# ✅ emit(key, value) — public publish for source plugins
+# Feature Update: v1.27.0
+# ✅ register_display(binding, callback) — binding "format" / "transform" (convert, smooth,
+#    classify) run on the TransformPool workers; tiles receive ready-to-show Display objects
+# Feature Update: v1.28.0
+# ✅ Priority lanes — MQTT ingest goes through a LaneBuffer when a layout sets binding
+#    "priority" (or coalescing is on): status topics delivered at once, telemetry / bulk
+#    coalesced and drained per frame within their own budgets (prefs "lane_budgets_ms")
+# Feature Update: v1.29.0
+# ✅ History — every numeric channel value kept in a NumPy ring buffer per channel
+#    (prefs "history_points", 0 = off; skipped without numpy); history(key) for tiles / tools
+# Feature Update: v1.30.0
+# ✅ History files — prefs "history_dir" keeps each channel's ring in a memory-mapped file
+#    (support/history_files.py), re-attached after a restart; msync batched every
+#    prefs "history_sync_s" (default 5 s) and on stop
+# Feature Update: v1.31.0
+# ✅ History DB — prefs "history_db" (path) archives every numeric value to SQLite on a
+#    writer thread ("history_db_commit_ms", "history_db_retention_days");
+#    self.history_db.history(key, start, end, max_points) for tiles / tools
+# Feature Update: v1.32.0
+# ✅ Stat channels — bindings with "stat" / "window" receive rolling min / max / mean /
+#    stddev / count of their channel (support/rolling.py), computed in the router; a 1 s
+#    scheduler job ages the windows only while a stat channel has sinks
+# Feature Update: v1.32.1
+# ✅ Change suppression on wildcard channels compares per topic (TopicChangeFilter)
 # ================================
 """
 
+import time
+import weakref
+from functools import partial
+
 from PyQt6.QtCore import QObject, QTimer
-import requests
 
-from support.mqtt_client import MqttLiveClient
-from support.system_properties import SystemPropertySource
+from support.ingest_buffer import CoalescingBuffer
+from support.history import TimeSeriesStore, history_available
+from support.history_files import MappedHistoryStore
+from support.history_db import HistoryDB
+from support.lanes import LaneBuffer
+from support.broker_pool import MqttBrokerPool, binding_channel_key, parse_mqtt_channel_key
+from support.channel_router import ChannelRouter
+from support.change_filter import make_filter, merge_suppress, parse_suppress
+from support.rolling import parse_stat_key
+from support.topic_trie import is_wildcard
+from support.rate_limiter import RateLimiter, BindingThrottle, parse_rate_limit
+from support.subscription import FrameBatch, Subscription
+from support.scheduler import TimingWheel
+from support.transform import TransformPipeline, TransformPool, Transform, compile_transform
+from controller.sources import load_source, used_types
 from support.myLOG2 import LOG3
 
 
 class DataDispatcher(QObject):
-    def __init__(self):
+    def __init__(self, prefs=None):
         super().__init__()
-        self.mqtt_client = MqttLiveClient()
-        self.callbacks = {}  # "channel_key": [callback1, callback2, ...]
-        self.system_sources = []
-        self.weather_timer = None
-
-    def register_cb(self, key: str, callback):
-        """Register a callback for a named data channel — appends for multi-sink."""
-        if key not in self.callbacks:
-            self.callbacks[key] = []
-        if callback not in self.callbacks[key]:
-            self.callbacks[key].append(callback)
-            LOG3(200 + 5, f"Appended callback for channel '{key}'")
-        else:
+        self.prefs = prefs or {}
+        self.mqtt_pool = MqttBrokerPool(self.prefs.get("mqtt_brokers"))
+        self.router = ChannelRouter()  # channel key → cid → sinks (plain object: hot path)
+        self.owned_subs = set()  # Subscriptions registered without an owner — held here
+        self.sources = {}  # type name: Source plugin, created the first time a layout uses it
+
+        # Periodic work — one timing wheel, one timer (prefs "scheduler_tick_ms")
+        self.scheduler = TimingWheel(self.prefs.get("scheduler_tick_ms", 100))
+
+        # Laned ingest — MQTT thread writes, frame timer drains (status lane bypasses it);
+        # with coalescing on, the LaneBuffer is created once the frame timer exists (below)
+        self.ingest_buffer = None
+        coalesce_hz = self.prefs.get("mqtt_coalesce_hz", 0)
+        self.coalescing = bool(coalesce_hz)
+
+        # Retained burst — collected by the MQTT threads, painted in one dispatcher update
+        self.retained_buffer = CoalescingBuffer()
+        self.mqtt_pool.set_retained_buffer(self.retained_buffer)
+        self.retained_drain_scheduled = False
+
+        # Rate caps — per topic in the MQTT thread, per binding on the GUI side
+        self.rate_limiter = RateLimiter()
+        self.mqtt_pool.set_rate_limiter(self.rate_limiter)
+        self.binding_throttles = weakref.WeakSet()  # alive as long as their Subscription
+
+        # History — bounded ring buffer per numeric channel (memory-mapped files with "history_dir")
+        self.history_sync = None
+        history_points = self.prefs.get("history_points", 3600)
+        history_dir = self.prefs.get("history_dir")
+        if history_points and history_available():
+            if history_dir:
+                self.router.history = MappedHistoryStore(history_dir, self.router.channel_keys, history_points)
+                self.history_sync = self.scheduler.schedule(
+                    "history sync", self.prefs.get("history_sync_s", 5), self.router.history.flush, budget_ms=50
+                )
+            else:
+                self.router.history = TimeSeriesStore(history_points)
+        elif history_points:
+            LOG3(200 + 16, "numpy not installed — channel history disabled")
+
+        # History DB — long retention in SQLite, written off the GUI thread
+        self.history_db = None
+        if self.prefs.get("history_db"):
+            self.history_db = self.router.archive = HistoryDB(
+                self.prefs["history_db"], self.router.channel_keys,
+                self.prefs.get("history_db_commit_ms", 500), self.prefs.get("history_db_retention_days"),
+            )
+
+        # Stat channels — windows aged between values while any stat channel is bound
+        self.stat_job = None
+
+        # Binding transforms — parse / convert / smooth / format / classify off the GUI thread
+        self.transforms = TransformPool(self.prefs.get("transform_workers", 2))
+
+        # Batched delivery — FrameBatches with values pending for the next frame tick
+        self.dirty_batches = []
+
+        # Frame tick — drains coalesced ingest, releases rate-limited values, flushes batches
+        self.started = False
+        self.frame_timer = QTimer()
+        self.frame_timer.setInterval(max(1, int(1000 / (coalesce_hz or self.prefs.get("frame_hz", 30)))))
+        self.frame_timer.timeout.connect(self.on_frame)
+        if self.coalescing:
+            self.configure_lanes({})
+
+    def channel_id(self, key: str) -> int:
+        """Intern a channel key — IDs are stable for the dispatcher's lifetime."""
+        return self.router.channel_id(key)
+
+    def register_cb(self, key: str, callback, owner=None, replay=True):
+        """
+        Register a callback for a named data channel — appends for multi-sink.
+
+        Returns a Subscription. With owner=None the dispatcher keeps the handle until
+        release(); otherwise the caller keeps it (BaseTile.subscribe) and the sink
+        disappears with it. A QObject owner also releases on destroyed.
+        With replay=True the channel's last value (if any) is delivered right away.
+        """
+        cid = self.router.channel_id(key)
+        sink, sub = self.router.find(cid, callback)
+        if sub is not None:
             LOG3(200 + 5, f"Callback already registered for channel '{key}'")
+            return sub
 
-    def _emit(self, key: str, value):
-        if key in self.callbacks:
-            for cb in self.callbacks[key]:
-                try:
-                    cb(value)
-                except Exception as e:
-                    LOG3(200 + 6, f"Callback error for '{key}': {e}")
+        sub = Subscription(self, key, callback, cid, sink)
+        self.router.add(sub, weakref.ref(sub))
+        if owner is None:
+            self.owned_subs.add(sub)
+        elif hasattr(owner, "destroyed"):
+            owner.destroyed.connect(lambda *_, ref=weakref.ref(sub): ref() and ref().release())
+        LOG3(200 + 5, f"Appended callback for channel '{key}'")
+        self._update_stat_job()
+        if replay:
+            self.router.replay(sub)
+        return sub
+
+    def last_value(self, key: str):
+        """(value, time.time()) of the newest value on a channel, or None."""
+        cid = self.router.channel_ids.get(key)
+        return None if cid is None else self.router.last(cid)
+
+    def history(self, key: str):
+        """
+        RingSeries of a channel's numeric values (last(n) / range(t0, t1) views), or None.
+        With history files this includes points kept from before a restart.
+        """
+        if self.router.history is None:
+            return None
+        return self.router.history.get(self.router.channel_id(key))
+
+    def register_binding(self, binding: dict, callback, owner=None):
+        """Register a tile callback for an mqtt binding, applying its per-binding options."""
+        key = binding_channel_key(binding)
+        rule = parse_rate_limit(binding.get("rate_limit"))
+        if rule:
+            throttle = BindingThrottle(key, callback, rule)
+            self._refresh_throttle(throttle)
+            self.binding_throttles.add(throttle)
+            callback = throttle
+            self._update_frame_timer()
+        return self.register_cb(key, callback, owner)
+
+    def register_display(self, binding: dict, callback, owner=None, classify=None):
+        """
+        Register a binding whose callback receives Display objects (text + style state)
+        computed on the transform pool. classify= gives the tile's default bands.
+        """
+        try:
+            transform = compile_transform(binding, classify)
+        except (ValueError, TypeError) as e:
+            LOG3(200 + 14, f"Ignoring transform on {binding.get('topic', binding)}: {e}")
+            transform = Transform(binding.get("format", "{}"))
+        pipeline = TransformPipeline(self.transforms, binding_channel_key(binding), transform, callback)
+        return self.register_binding(binding, pipeline, owner)
+
+    def register_batch(self, keys, on_batch, owner=None):
+        """
+        Deliver updates on several channels as one on_batch({channel_key: value}) per frame.
+
+        Returns one Subscription per key (release them all to detach).
+        """
+        batch = FrameBatch(on_batch, self._batch_pending)
+        return [self.register_cb(key, partial(batch.put, key), owner) for key in keys]
+
+    def _batch_pending(self, batch):
+        """First value for a batch this frame — queue it and make sure the tick runs."""
+        self.dirty_batches.append(batch)
+        if self.started and not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def release(self, sub):
+        """Detach a Subscription (normally via sub.release())."""
+        sub.active = False
+        self.owned_subs.discard(sub)
+        target = sub.callback
+        if isinstance(target, BindingThrottle):
+            self.binding_throttles.discard(target)
+            self._update_frame_timer()
+            target = target.callback
+        if isinstance(target, TransformPipeline):
+            target.release()  # results still in flight are dropped
+        self.router.remove(sub)
+        self._update_stat_job()
+
+    def _refresh_throttle(self, throttle):
+        """A binding throttle only runs when its cap is stricter than its topic's cap."""
+        broker, topic = parse_mqtt_channel_key(throttle.key)
+        topic_rule = self.rate_limiter.rule_for(broker, topic)
+        throttle.active = topic_rule is None or throttle.rule[0] < topic_rule[0]
+
+    def emit(self, key: str, value):
+        """Publish a value on a named channel (source plugins, debug dump)."""
+        self.router.emit_key(key, value)
+
+    def configure_lanes(self, rules):
+        """
+        Topic → lane rules {(broker, topic): lane}. Lanes stay off (one signal per message)
+        unless some topic is non-telemetry or coalescing is configured.
+        """
+        if rules or self.coalescing:
+            if self.ingest_buffer is None:
+                self.ingest_buffer = LaneBuffer(self.prefs.get("lane_budgets_ms"))
+                self.mqtt_pool.set_ingest_buffer(self.ingest_buffer)
+            self.ingest_buffer.configure(rules)
+            if rules:
+                LOG3(200 + 15, f"Ingest lanes: {len(rules)} prioritised topic(s)")
+        elif self.ingest_buffer is not None:
+            buffer, self.ingest_buffer = self.ingest_buffer, None
+            self.mqtt_pool.set_ingest_buffer(None)
+            buffer.drain(self.router.route_mqtt, budgeted=False)  # hand over what was queued
+        self._update_frame_timer()
 
     def start(self):
         LOG3(200 + 1, "Dispatcher starting")
-        self.mqtt_client.register_cb("message_received", self.on_mqtt_message)
-        self.mqtt_client.start()
+        self.mqtt_pool.register_cb("message_received", self.on_mqtt_message)
+        self.mqtt_pool.register_cb("retained_pending", self.on_retained_pending)
+        self.started = True
+        self._update_frame_timer()
+        if self.ingest_buffer:
+            LOG3(200 + 2, f"Laned MQTT ingest drained every {self.frame_timer.interval()} ms")
+        self.mqtt_pool.start()
+
+    def _update_frame_timer(self):
+        """Run the frame tick only while something needs it (stop() halts it for good)."""
+        if not self.started:
+            return
+        needed = bool(self.ingest_buffer or self.rate_limiter or self.binding_throttles or self.dirty_batches)
+        if needed and not self.frame_timer.isActive():
+            self.frame_timer.start()
+        elif not needed and self.frame_timer.isActive():
+            self.frame_timer.stop()
+
+    def _update_stat_job(self):
+        """Age stat windows once a second only while some stat channel has sinks."""
+        needed = bool(self.router.stat_groups)
+        if needed and self.stat_job is None:
+            self.stat_job = self.scheduler.schedule("stat windows", 1, self.expire_stats)
+        elif not needed and self.stat_job is not None:
+            self.stat_job.release()
+            self.stat_job = None
+
+    def expire_stats(self):
+        self.router.expire_stats(time.time())
 
     def bind_config(self, configs):
+        """Hand the layout to every source plugin it uses (and to those it stopped using)."""
         LOG3(200 + 10, f"Binding {len(configs)} tiles — setting up sources")
-        # Clear old sources
-        for source in self.system_sources:
-            source.stop()
-        self.system_sources.clear()
+        pending = sorted(used_types(configs))
+        while pending:
+            name = pending.pop()
+            if name in self.sources:
+                continue
+            cls = load_source(name)
+            if cls is not None:
+                self.sources[name] = cls(self)
+                pending.extend(cls.requires)
+                LOG3(200 + 12, f"Source '{name}' loaded")
 
-        # Stop weather timer if running
-        if self.weather_timer:
-            self.weather_timer.stop()
+        for source in self.sources.values():
+            source.configure(configs)
+        self.configure_suppression(configs)
 
+    def configure_suppression(self, configs):
+        """
+        One change filter per channel, the loosest rule among its bindings. Filters whose
+        rule is unchanged survive a reload (they keep their last value and counters).
+        """
+        per_channel = {}
         for config in configs:
-            # MQTT subscriptions
             for feed in config.get("bindings", {}).values():
-                if feed["type"] == "mqtt":
-                    self.mqtt_client.add_topic(feed["topic"])
-                    LOG3(200 + 30, f"Added MQTT topic subscription: {feed['topic']}")
-
-                # System properties
-                elif feed["type"] == "system_prop":
-                    prop = feed["prop"]
-                    getter = self.get_system_getter(prop)
-                    if getter:
-                        source = SystemPropertySource(getter, feed.get("interval", 5))
-                        key = f"system:{prop}"
-                        source.data_ready.connect(lambda v, k=key: self._emit(k, v))
-                        self.system_sources.append(source)
-                        source.start()
-						
-            # Weather tile — set up polling
-            if config.get("type") == "weather":
-                api_key = config.get("api_key", "")
-                location = config.get("location", "New York")
-                if api_key:
-                    self.setup_weather_polling(api_key, location)
-
-    def setup_weather_polling(self, api_key, location):
-        """Set up periodic weather API polling."""
-        if self.weather_timer:
-            self.weather_timer.stop()
-
-        self.weather_timer = QTimer()
-        self.weather_timer.timeout.connect(lambda: self.fetch_weather(api_key, location))
-        self.weather_timer.start(900000)  # 15 minutes
-        self.fetch_weather(api_key, location)  # Initial fetch
-
-    def fetch_weather(self, api_key, location):
-        url = f"http://api.weatherapi.com/v1/forecast.json?key={api_key}&q={location}&days=7&aqi=no&alerts=no"
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            self._emit("weather:data", data)
-            LOG3(200 + 40, "Weather data fetched and emitted")
-        except Exception as e:
-            LOG3(200 + 41, f"Weather API error: {e}")
-
-    def get_system_getter(self, prop):
-        import time
-        import psutil
-
-        def format_uptime():
-            uptime_seconds = time.monotonic()
-            days = int(uptime_seconds // 86400)
-            hours = int((uptime_seconds % 86400) // 3600)
-            minutes = int((uptime_seconds % 3600) // 60)
-            if days > 0:
-                return f"up {days} days, {hours:02d}:{minutes:02d}"
-            else:
-                return f"up {hours:02d}:{minutes:02d}"
-
-        getters = {
-            "mqtt_status": lambda: "Connected ✅" if self.mqtt_client.running else "Disconnected ❌",
-            "broker": lambda: "rpibroker.local",
-            "uptime": format_uptime,
-            "cpu_load": lambda: f"{psutil.cpu_percent(interval=1):.1f}%",
-            "memory": lambda: f"{psutil.virtual_memory().percent:.1f}% used"
-        }
-        return getters.get(prop)
-
-    def on_mqtt_message(self, topic, payload):
-        LOG3(200 + 50, f"Dispatcher received MQTT: {topic} -> {payload}")
-        key = f"mqtt:{topic}"
-        self._emit(key, payload)
+                source = self.sources.get(feed["type"])
+                key = source and source.channel_key(feed)
+                if not key:
+                    continue
+                try:
+                    rule = parse_suppress(feed.get("suppress", source.suppress_default))
+                except ValueError as e:
+                    LOG3(200 + 37, f"Ignoring suppress on {key}: {e}")
+                    rule = None
+                per_channel.setdefault(key, []).append(rule)
+
+        router = self.router
+        filters = {}
+        for key, rules in per_channel.items():
+            rule = merge_suppress(rules)
+            if rule is not None:
+                cid = router.channel_id(key)
+                current = router.filters[cid]
+                # Wildcard channels carry many topics — each is compared with its own last value
+                # (stat channels derived from one are a single series again)
+                mqtt_key = parse_mqtt_channel_key(key)
+                per_topic = bool(mqtt_key and is_wildcard(mqtt_key[1]) and parse_stat_key(key) is None)
+                filters[cid] = current if current is not None and current.rule == rule else make_filter(rule, per_topic)
+        router.set_filters(filters)
+        if filters:
+            LOG3(200 + 38, f"Change suppression active on {len(filters)} channel(s)")
+
+    def on_mqtt_message(self, msg):
+        LOG3(200 + 50, f"Dispatcher received MQTT: {msg.topic} -> {msg.text}")
+        self._route_mqtt(msg)
+
+    def _route_mqtt(self, msg):
+        """Deliver to the exact topic channel and to every matching wildcard channel."""
+        self.router.route_mqtt(msg)
+
+    def on_frame(self):
+        """Frame tick — coalesced ingest, values released by rate caps, then batched sinks."""
+        if self.ingest_buffer:
+            self.drain_ingest()
+        now = time.monotonic()
+        if self.rate_limiter:
+            route = self.router.route_mqtt
+            for msg in self.rate_limiter.release_due(now):
+                route(msg)
+        for throttle in list(self.binding_throttles):
+            throttle.flush(now)
+        if self.dirty_batches:
+            self.flush_batches()
+            self._update_frame_timer()  # idle again once nothing else needs the tick
+
+    def flush_batches(self):
+        batches, self.dirty_batches = self.dirty_batches, []
+        for batch in batches:
+            batch.flush()
+
+    def on_retained_pending(self):
+        """First retained message of a burst — drain everything that arrives within one frame."""
+        if not self.retained_drain_scheduled:
+            self.retained_drain_scheduled = True
+            QTimer.singleShot(self.frame_timer.interval(), self.drain_retained)
+
+    def drain_retained(self):
+        self.retained_drain_scheduled = False
+        batch = self.retained_buffer.drain()
+        route = self.router.route_mqtt
+        for msg in batch.values():
+            route(msg)
+        LOG3(200 + 51, f"Delivered {len(batch)} retained value(s) in one update")
+
+    def drain_ingest(self):
+        """Deliver the newest value per topic, each lane within its frame budget."""
+        self.ingest_buffer.drain(self.router.route_mqtt)
 
     def dump_registrations(self):
         """Dump current callback registrations to system out tile."""
+        router = self.router
+        live = router.live_channels()
         dump_lines = [
             "=== Dispatcher Registration Dump ===",
-            f"Total channels: {len(self.callbacks)}",
+            f"Total channels: {len(live)} ({len(router.channel_keys)} interned)",
             ""
         ]
 
-        if not self.callbacks:
+        if not live:
             dump_lines.append("No callbacks registered.")
         else:
-            for key, cbs in self.callbacks.items():
-                dump_lines.append(f"Channel: {key}")
-                dump_lines.append(f"  Callbacks: {len(cbs)}")
-                for i, cb in enumerate(cbs, 1):
-                    dump_lines.append(f"    [{i}] {cb}")
+            for cid in live:
+                subs = [s for s in (r() for r in router.routes[cid]) if s is not None and s.active]
+                dump_lines.append(f"Channel #{cid}: {router.channel_keys[cid]}")
+                dump_lines.append(f"  Callbacks: {len(subs)}")
+                for i, sub in enumerate(subs, 1):
+                    dump_lines.append(f"    [{i}] {sub.callback}")
                 dump_lines.append("")
 
+        dump_lines.append(f"Wildcard patterns in topic tries: {router.wildcard_count()}")
+        dump_lines.append(f"Field channels: {router.field_channel_count()}")
+        dump_lines.append(f"Stat channels: {router.stat_channel_count()} on {len(router.stat_groups)} source(s)")
+        dump_lines.append(f"Cached last values: {router.cached_count()} (replayed {router.replayed})")
+        if router.history is not None:
+            dump_lines.extend(router.history.stats_lines())
+        if self.history_db is not None:
+            dump_lines.extend(self.history_db.stats_lines())
+        for field_key, misses in router.field_misses.most_common(5):
+            dump_lines.append(f"  {field_key}: {misses} payload(s) without the field")
+        filtered = router.filter_stats()
+        if filtered:
+            suppressed = sum(f.suppressed for _, f in filtered)
+            dump_lines.append(f"Change suppression: {len(filtered)} channel(s), {suppressed} update(s) dropped")
+            for key, change_filter in filtered[:5]:
+                dump_lines.append(f"  {key}: {change_filter.stats()}")
+        dump_lines.append("")
+        dump_lines.extend(self.mqtt_pool.stats_lines())
+        dump_lines.append("")
+        dump_lines.append(f"Sources: {', '.join(sorted(self.sources)) or 'none'}")
+        for source in self.sources.values():
+            dump_lines.extend(source.stats_lines())
+        dump_lines.extend(self.scheduler.stats_lines())
+        dump_lines.extend(self.transforms.stats_lines())
+        dump_lines.append("")
+
+        if self.ingest_buffer:
+            dump_lines.append("MQTT ingest lanes:")
+            dump_lines.extend(self.ingest_buffer.stats_lines())
+            dump_lines.append("")
+
+        limit_lines = self.rate_limiter.stats_lines()
+        throttles = [t for t in self.binding_throttles if t.active]
+        if limit_lines or throttles:
+            dump_lines.append("Rate limits (per topic):")
+            dump_lines.extend(limit_lines)
+            if throttles:
+                dump_lines.append("Rate limits (per binding):")
+                for throttle in throttles:
+                    dump_lines.append(f"    {throttle.key}: {throttle.window.stats()}")
+            dump_lines.append("")
+
         dump_lines.append("=== End Dump ===")
         dump_text = "\n".join(dump_lines)
 
         # Emit to system out tile
-        self._emit("debug:system_out", dump_text)
+        self.emit("debug:system_out", dump_text)
 							 
     def stop(self):
         LOG3(200 + 70, "Dispatcher stopping")
-        if self.weather_timer:
-            self.weather_timer.stop()
-        for source in self.system_sources:
+        self.started = False
+        self.frame_timer.stop()
+        self.scheduler.stop()
+        self.transforms.stop()
+        for source in self.sources.values():
             source.stop()
-        self.system_sources.clear()
-        self.mqtt_client.stop()
\ No newline at end of file
+        self.mqtt_pool.stop()
+        if self.history_sync is not None:
+            self.history_sync.release()
+            self.router.history.close()
+        if self.history_db is not None:
+            self.history_db.close()
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+Created on Sun Oct 18 21:05:52 2026
+@author: kmac3
+# ================================
+# controller/sources/__init__.py
+# ================================
+# File version: v1.0.0
+# Sync'd to dashboard release: v3.10.0
+# Description: Source registry — binding / tile type → source plugin, imported on first use
+#
+# Features:
+# ✅ SOURCE_TYPES maps a type name to "module:Class" — nothing is imported until a layout uses it
+# ✅ register_source(name, target) — add a source type without touching the dispatcher
+# ✅ used_types(configs) — every binding type and tile type a layout references
+# ================================
+"""
+
+import importlib
+
+from support.myLOG2 import LOG3
+
+SOURCE_TYPES = {
+    "mqtt": "controller.sources.mqtt:MqttSource",
+    "system_prop": "controller.sources.system:SystemSource",
+    "weather": "controller.sources.weather:WeatherSource",
+}
+
+_loaded = {}  # type name: Source subclass
+
+
+def register_source(name, target):
+    """Map a binding / tile type to a Source subclass or a "module:Class" string."""
+    SOURCE_TYPES[name] = target
+    _loaded.pop(name, None)
+
+
+def load_source(name):
+    """Source class for a type name (imported on first call), or None if none is registered."""
+    cls = _loaded.get(name)
+    if cls is not None:
+        return cls
+    target = SOURCE_TYPES.get(name)
+    if target is None:
+        return None
+    if isinstance(target, str):
+        module_name, _, class_name = target.partition(":")
+        try:
+            cls = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError) as e:
+            LOG3(200 + 13, f"Source type '{name}' unavailable: {e}")
+            return None
+    else:
+        cls = target
+    _loaded[name] = cls
+    return cls
+
+
+def used_types(configs):
+    """Binding types and tile types referenced by a layout."""
+    names = set()
+    for config in configs:
+        names.add(config.get("type", "simple_text"))
+        names.update(feed["type"] for feed in config.get("bindings", {}).values())
+    return names
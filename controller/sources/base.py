@@ -0,0 +1,47 @@
+"""
+Created on Sun Oct 18 21:05:52 2026
+@author: kmac3
+# ================================
+# controller/sources/base.py
+# ================================
+# File version: v1.0.0
+# Sync'd to dashboard release: v3.10.0
+# Description: Source — base class for DataDispatcher source plugins
+#
+# Features:
+# ✅ configure(configs) on every bind_config — the whole layout, so a source can diff it
+# ✅ channel_key(feed) / suppress_default — how the dispatcher filters a binding's channel
+# ✅ requires — other source types loaded alongside (e.g. weather → mqtt local temps)
+# ✅ stats_lines() for the dump, stop() on shutdown
+# ================================
+"""
+
+
+class Source:
+    """One binding or tile type feeding the dispatcher. Created once, on first use."""
+    requires = ()
+    suppress_default = None
+
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+
+    def configure(self, configs):
+        """Called on every layout bind — also with layouts that no longer use this source."""
+
+    def channel_key(self, feed):
+        """Channel a binding of this type is delivered on (None if it has none)."""
+        return None
+
+    def stats_lines(self):
+        return []
+
+    def stop(self):
+        pass
+
+    @staticmethod
+    def feeds(configs, binding_type):
+        """Every binding of one type in a layout."""
+        for config in configs:
+            for feed in config.get("bindings", {}).values():
+                if feed["type"] == binding_type:
+                    yield feed
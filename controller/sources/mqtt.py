@@ -0,0 +1,144 @@
+"""
+Created on Sun Oct 18 21:05:52 2026
+@author: kmac3
+# ================================
+# controller/sources/mqtt.py
+# ================================
+# File version: v1.0.2
+# Sync'd to dashboard release: v3.10.0
+# Description: MqttSource — per-layout MQTT configuration (topics, decoders, rate caps)
+#
+# Features:
+# ✅ Moved out of DataDispatcher.bind_config (v1.13.0 – v1.18.0 behaviour unchanged)
+# ✅ Topic refcounts diffed against the previous layout — only the delta hits the broker
+# ✅ "decode" specs compiled once per topic; "rate_limit" topic caps + binding throttles
+# ✅ The broker pool and delivery path stay in the dispatcher core
+# Feature Update: v1.0.1
+# ✅ Binding "priority" (status / telemetry / bulk) → per-topic ingest lane
+# Feature Update: v1.0.2
+# ✅ Binding "stat" / "window" checked — an invalid one is logged (the binding falls back
+#    to the raw channel)
+# ================================
+"""
+
+import struct
+from collections import Counter
+
+from controller.sources.base import Source
+from support.broker_pool import DEFAULT_BROKER, binding_channel_key
+from support.lanes import TELEMETRY, parse_priority
+from support.payload import compile_decoder
+from support.rate_limiter import parse_rate_limit
+from support.rolling import parse_stat
+from support.myLOG2 import LOG3
+
+
+class MqttSource(Source):
+    def __init__(self, dispatcher):
+        super().__init__(dispatcher)
+        self.bound_topics = Counter()  # (broker, topic): bindings referencing it in the current layout
+
+    def channel_key(self, feed):
+        return binding_channel_key(feed)
+
+    def configure(self, configs):
+        self.sync_topics(configs)
+        self.configure_decoders(configs)
+        self.configure_rate_limits(configs)
+        self.configure_priorities(configs)
+        self.check_stats(configs)
+
+    def sync_topics(self, configs):
+        """Refcount every MQTT topic in the layout and push only the change to the broker."""
+        wanted = Counter()
+        qos = {}
+        for config in configs:
+            for feed in config.get("bindings", {}).values():
+                if feed["type"] == "mqtt":
+                    key = (feed.get("broker", DEFAULT_BROKER), feed["topic"])
+                    wanted[key] += 1
+                    if "qos" in feed:
+                        qos[key] = max(qos.get(key) or 0, min(1, int(feed["qos"])))
+                    else:
+                        qos.setdefault(key, None)
+            # Weather tile listens to local temperature topics as well
+            for field in ("indoor_topic", "outdoor_topic"):
+                if config.get(field):
+                    wanted[(DEFAULT_BROKER, config[field])] += 1
+
+        acquire = wanted - self.bound_topics
+        release = self.bound_topics - wanted
+        self.bound_topics = wanted
+        subscribed, unsubscribed = self.dispatcher.mqtt_pool.update_subscriptions(
+            acquire.elements(), release.elements(), qos
+        )
+        LOG3(200 + 30, f"MQTT topics: {len(wanted)} bound, +{len(subscribed)} / -{len(unsubscribed)}")
+
+    def configure_decoders(self, configs):
+        """Compile every binding "decode" spec once; one decoder per topic."""
+        specs = {}
+        for feed in self.feeds(configs, "mqtt"):
+            if feed.get("decode") is not None:
+                key = (feed.get("broker", DEFAULT_BROKER), feed["topic"])
+                if key in specs and specs[key] != feed["decode"]:
+                    LOG3(200 + 34, f"Conflicting decode specs on {feed['topic']} — keeping the first")
+                    continue
+                specs[key] = feed["decode"]
+
+        decoders = {}
+        for key, spec in specs.items():
+            try:
+                decoders[key] = compile_decoder(spec)
+            except (ValueError, struct.error) as e:
+                LOG3(200 + 35, f"Ignoring decode on {key[1]}: {e}")
+        self.dispatcher.mqtt_pool.set_decoders(decoders)
+        if decoders:
+            LOG3(200 + 33, f"Binary decoders active on {len(decoders)} topic(s)")
+
+    def configure_rate_limits(self, configs):
+        """
+        Topic cap = loosest cap among the topic's bindings (none if any binding is
+        uncapped); bindings stricter than that get a GUI-side throttle instead.
+        """
+        per_topic = {}
+        for feed in self.feeds(configs, "mqtt"):
+            key = (feed.get("broker", DEFAULT_BROKER), feed["topic"])
+            try:
+                rule = parse_rate_limit(feed.get("rate_limit"))
+            except ValueError as e:
+                LOG3(200 + 31, f"Ignoring rate_limit on {feed['topic']}: {e}")
+                rule = None
+            per_topic.setdefault(key, []).append(rule)
+
+        rules = {}
+        for key, topic_rules in per_topic.items():
+            if all(topic_rules):
+                rules[key] = max(topic_rules, key=lambda r: r[0])
+        dispatcher = self.dispatcher
+        dispatcher.rate_limiter.configure(rules)
+        for throttle in dispatcher.binding_throttles:
+            dispatcher._refresh_throttle(throttle)
+        dispatcher._update_frame_timer()
+        if rules:
+            LOG3(200 + 32, f"Rate limits active on {len(rules)} topic(s)")
+
+    def configure_priorities(self, configs):
+        """Topic lane = highest priority among its bindings; all-telemetry layouts need no lanes."""
+        lanes = {}
+        for feed in self.feeds(configs, "mqtt"):
+            key = (feed.get("broker", DEFAULT_BROKER), feed["topic"])
+            try:
+                lane = parse_priority(feed.get("priority"))
+            except ValueError as e:
+                LOG3(200 + 39, f"Ignoring priority on {feed['topic']}: {e}")
+                lane = TELEMETRY
+            lanes[key] = min(lane, lanes.get(key, lane))
+        self.dispatcher.configure_lanes({key: lane for key, lane in lanes.items() if lane != TELEMETRY})
+
+    def check_stats(self, configs):
+        """Stat channels need no setup — the router builds them on subscribe; report bad specs."""
+        for feed in self.feeds(configs, "mqtt"):
+            try:
+                parse_stat(feed)
+            except ValueError as e:
+                LOG3(200 + 42, f"Ignoring stat on {feed['topic']}: {e}")
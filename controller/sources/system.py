@@ -0,0 +1,132 @@
+"""
+Created on Sun Oct 18 21:05:52 2026
+@author: kmac3
+# ================================
+# controller/sources/system.py
+# ================================
+# File version: v1.0.1
+# Sync'd to dashboard release: v3.10.0
+# Description: SystemSource — system_prop bindings, sampled on the SystemSampler thread
+#
+# Features:
+# ✅ Moved out of DataDispatcher (v1.22.0 / v1.23.0 behaviour unchanged)
+# ✅ Props de-duplicated, fastest interval wins; one scheduler job per distinct interval
+# ✅ psutil imported only when a layout binds a system_prop
+# ✅ Channels system:<prop>, change suppression "exact" by default
+# Feature Update: v1.0.1
+# ✅ cpu_load baseline primed once per source, and cpu_load left out of the first-values
+#    pass — a bind / reload no longer shows a near-zero-interval 0.0% / 100.0%
+# ================================
+"""
+
+import time
+from functools import partial
+
+from controller.sources.base import Source
+from support.system_sampler import SystemSampler
+from support.myLOG2 import LOG3
+
+SINCE_LAST_CALL = ("cpu_load",)  # readings over the time since the previous call — no first-values pass
+ONE_SHOT_DELAY = 1.0  # s — interval a one-shot since-last-call prop is measured over
+
+
+class SystemSource(Source):
+    suppress_default = "exact"  # broker names, status text — republished unchanged forever
+
+    def __init__(self, dispatcher):
+        super().__init__(dispatcher)
+        self.sampler = SystemSampler()  # one thread for every system_prop binding
+        self.sampler.SIG_samples.connect(self.on_samples)
+        self.channels = {}  # prop: cid of system:<prop>
+        self.jobs = []
+        import psutil
+
+        psutil.cpu_percent(interval=None)  # cpu_load baseline — primed here only, a re-prime restarts it
+
+    def channel_key(self, feed):
+        return f"system:{feed['prop']}"
+
+    def configure(self, configs):
+        """
+        Sample each prop at the fastest interval any binding asks for — one scheduler
+        job per distinct interval, so props sharing an interval share a sampler pass.
+        """
+        intervals = {}
+        for feed in self.feeds(configs, "system_prop"):
+            prop = feed["prop"]
+            interval = feed.get("interval", 5)
+            current = intervals.get(prop)
+            # Fastest polling interval wins; one-shot (0) only if every binding asks for it
+            if current is None or (interval > 0 and (current == 0 or interval < current)):
+                intervals[prop] = interval
+
+        for job in self.jobs:
+            job.release()
+        self.jobs = []
+
+        getters = {}
+        by_interval = {}
+        for prop, interval in intervals.items():
+            getter = self.get_getter(prop)
+            if getter:
+                getters[prop] = getter
+                by_interval.setdefault(interval, []).append(prop)
+                self.channels[prop] = self.dispatcher.channel_id(f"system:{prop}")
+            else:
+                LOG3(200 + 36, f"Unknown system property '{prop}'")
+        self.sampler.configure(getters)
+        first = [prop for prop in getters if prop not in SINCE_LAST_CALL]
+        if first:
+            self.sampler.sample(first)  # first values right away
+        scheduler = self.dispatcher.scheduler
+        for interval, props in sorted(by_interval.items()):
+            if interval > 0:
+                self.jobs.append(scheduler.schedule(
+                    f"system {interval}s", interval, partial(self.sampler.sample, props), budget_ms=2
+                ))
+            elif deferred := [prop for prop in props if prop in SINCE_LAST_CALL]:
+                self.jobs.append(scheduler.call_later(
+                    "system one-shot", ONE_SHOT_DELAY, partial(self.sampler.sample, deferred), budget_ms=2
+                ))
+
+    def on_samples(self, values):
+        """One sampler pass — {prop: value} — delivered on the GUI thread."""
+        emit = self.dispatcher.router.emit
+        for prop, value in values.items():
+            cid = self.channels.get(prop)
+            if cid is not None:
+                emit(cid, value)
+
+    def get_getter(self, prop):
+        """Non-blocking getter for a system property (runs on the sampler thread)."""
+        import psutil
+
+        def format_uptime():
+            uptime_seconds = time.monotonic()
+            days = int(uptime_seconds // 86400)
+            hours = int((uptime_seconds % 86400) // 3600)
+            minutes = int((uptime_seconds % 3600) // 60)
+            if days > 0:
+                return f"up {days} days, {hours:02d}:{minutes:02d}"
+            else:
+                return f"up {hours:02d}:{minutes:02d}"
+
+        def cpu_load():
+            # Percent since the previous call — never sleeps (interval=1 froze the GUI)
+            return f"{psutil.cpu_percent(interval=None):.1f}%"
+
+        mqtt_pool = self.dispatcher.mqtt_pool
+        getters = {
+            "mqtt_status": mqtt_pool.status_text,
+            "broker": mqtt_pool.hosts_text,
+            "uptime": format_uptime,
+            "cpu_load": cpu_load,
+            "memory": lambda: f"{psutil.virtual_memory().percent:.1f}% used"
+        }
+        return getters.get(prop)
+
+    def stats_lines(self):
+        return self.sampler.stats_lines()
+
+    def stop(self):
+        self.sampler.stop()
@@ -0,0 +1,68 @@
+"""
+Created on Sun Oct 18 21:05:52 2026
+@author: kmac3
+# ================================
+# controller/sources/weather.py
+# ================================
+# File version: v1.0.0
+# Sync'd to dashboard release: v3.10.0
+# Description: WeatherSource — WeatherAPI.com polling for weather tiles (weather:data)
+#
+# Features:
+# ✅ Moved out of DataDispatcher (v1.9.4 / v1.23.0 behaviour unchanged)
+# ✅ 15-min poll on the shared scheduler, jittered, first fetch on bind
+# ✅ requests imported only when a layout has a weather tile
+# ✅ Requires the mqtt source — weather tiles subscribe local indoor / outdoor temps
+# ================================
+"""
+
+from functools import partial
+
+import requests
+
+from controller.sources.base import Source
+from support.myLOG2 import LOG3
+
+
+class WeatherSource(Source):
+    requires = ("mqtt",)
+
+    def __init__(self, dispatcher):
+        super().__init__(dispatcher)
+        self.job = None
+
+    def configure(self, configs):
+        if self.job:
+            self.job.release()
+            self.job = None
+        for config in configs:
+            if config.get("type") == "weather":
+                api_key = config.get("api_key", "")
+                location = config.get("location", "New York")
+                if api_key:
+                    self.setup_polling(api_key, location)
+
+    def setup_polling(self, api_key, location):
+        """Set up periodic weather API polling (15 min, jittered, first fetch now)."""
+        if self.job:
+            self.job.release()
+
+        self.job = self.dispatcher.scheduler.schedule(
+            "weather", 900, partial(self.fetch, api_key, location), jitter=30, run_now=True
+        )
+
+    def fetch(self, api_key, location):
+        url = f"http://api.weatherapi.com/v1/forecast.json?key={api_key}&q={location}&days=7&aqi=no&alerts=no"
+        try:
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            self.dispatcher.emit("weather:data", data)
+            LOG3(200 + 40, "Weather data fetched and emitted")
+        except Exception as e:
+            LOG3(200 + 41, f"Weather API error: {e}")
+
+    def stop(self):
+        if self.job:
+            self.job.release()
+            self.job = None
@@ -5,8 +5,8 @@ Created on Thu Jan  4 16:04:05 2026
 # ================================
 # main.py
 # ================================
-# File version: v1.7.6
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.7.7
+# Sync'd to dashboard release: v3.10.0
 # Description: Application entry point — bootstraps the dashboard
 #
 # Features:
@@ -19,6 +19,8 @@ Created on Thu Jan  4 16:04:05 2026
 #
 # Feature Update: v1.7.6
 # ✅ Added "Dump Object Hierarchy" menu item under Debug
+# Feature Update: v1.7.7
+# ✅ Layout reloads go through controller.apply_config() so MQTT subscriptions follow the layout
 # ================================
 """
 
@@ -166,7 +168,7 @@ class MainWindow(QMainWindow):
                     os.remove(CONFIG_FILE)
                     self.controller.stop_file_watcher()
                     QMessageBox.information(self, "Reset", "layout.json deleted — defaults loaded")
-                    self.view.load_config(load_config())
+                    self.controller.apply_config(load_config())
                 else:
                     QMessageBox.information(self, "Reset", "No layout.json found — already using defaults")
             except Exception as e:
@@ -179,7 +181,7 @@ class MainWindow(QMainWindow):
             current = load_config()
             current.append(new_config)
             save_config(current)
-            self.view.load_config(current)
+            self.controller.apply_config(current)
             QMessageBox.information(self, "Added", f"Tile '{new_config['title']}' added and saved")
 
     def show_about(self):
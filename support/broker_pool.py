@@ -0,0 +1,179 @@
+"""
+Created on Sun Oct 18 13:20:44 2026
+@author: kmac3
+# ================================
+# support/broker_pool.py
+# ================================
+# File version: v1.0.5
+# Sync'd to dashboard release: v3.10.0
+# Description: MqttBrokerPool — one MqttLiveClient (and network thread) per named broker
+#
+# Features:
+# ✅ Brokers declared in preferences.json under "mqtt_brokers" ({name: {host, port, ...}})
+# ✅ Bindings pick a broker with "broker": "<name>" — omitted means "default"
+# ✅ Broker-qualified channel keys: mqtt:<topic> (default) / mqtt@<name>:<topic>
+# ✅ Fans register_cb / ingest buffer / start / stop out to every client
+# ✅ Per-broker throughput and reconnect statistics
+#
+# Feature Update: v1.0.1
+# ✅ set_rate_limiter() shares one RateLimiter across all broker threads
+# Feature Update: v1.0.2
+# ✅ Broker entries accept "qos", "session_expiry" and "client_id" (MQTT5 persistent sessions)
+# ✅ Shared retained-message buffer; per-topic QoS passed through update_subscriptions()
+# Feature Update: v1.0.3
+# ✅ Field channels — bindings with "path" register <mqtt key>|<path>
+# Feature Update: v1.0.4
+# ✅ set_decoders() — per-broker binary payload decoders handed to each client's parser
+# Feature Update: v1.0.5
+# ✅ Stat channels — bindings with "stat" / "window" register <key>~<stat>@<window>
+# ================================
+"""
+
+from support.mqtt_client import MqttLiveClient
+from support.rolling import parse_stat_key, stat_suffix
+from support.myLOG2 import LOG3
+
+DEFAULT_BROKER = "default"
+DEFAULT_BROKERS = {DEFAULT_BROKER: {"host": "rpibroker.local", "port": 1883}}
+
+
+def mqtt_channel_key(topic: str, broker: str = DEFAULT_BROKER) -> str:
+    """Dispatcher channel key for a topic on a broker."""
+    if broker == DEFAULT_BROKER:
+        return f"mqtt:{topic}"
+    return f"mqtt@{broker}:{topic}"
+
+
+def parse_mqtt_channel_key(key: str):
+    """Inverse of mqtt_channel_key() — returns (broker, topic) or None (field / stat suffix ignored)."""
+    stat = parse_stat_key(key)
+    if stat is not None:
+        key = stat[0]
+    key = key.partition("|")[0]
+    if key.startswith("mqtt:"):
+        return DEFAULT_BROKER, key[5:]
+    if key.startswith("mqtt@"):
+        broker, sep, topic = key[5:].partition(":")
+        if sep:
+            return broker, topic
+    return None
+
+
+def field_path_text(path) -> str:
+    return ".".join(str(p) for p in path) if isinstance(path, (list, tuple)) else str(path)
+
+
+def binding_channel_key(binding: dict) -> str:
+    """Channel key a tile should register for an mqtt binding."""
+    key = mqtt_channel_key(binding["topic"], binding.get("broker", DEFAULT_BROKER))
+    if binding.get("path") is not None:
+        key = f"{key}|{field_path_text(binding['path'])}"
+    return key + stat_suffix(binding)
+
+
+class MqttBrokerPool:
+    """Owns one MqttLiveClient per configured broker."""
+
+    def __init__(self, brokers=None):
+        brokers = brokers or DEFAULT_BROKERS
+        self.clients = {}
+        for name, spec in brokers.items():
+            self.clients[name] = MqttLiveClient(
+                name, spec.get("host", "localhost"), int(spec.get("port", 1883)),
+                qos=int(spec.get("qos", 0)),
+                session_expiry=int(spec.get("session_expiry", 0)),
+                client_id=spec.get("client_id", ""),
+            )
+        LOG3(100 + 40, f"Broker pool: {', '.join(f'{n}={c.broker}:{c.port}' for n, c in self.clients.items())}")
+
+    def get(self, name: str):
+        client = self.clients.get(name)
+        if client is None:
+            LOG3(100 + 41, f"Unknown MQTT broker '{name}' — binding ignored")
+        return client
+
+    @property
+    def running(self):
+        return any(c.running for c in self.clients.values())
+
+    @property
+    def connected(self):
+        return all(c.connected for c in self.clients.values())
+
+    def status_text(self):
+        up = sum(1 for c in self.clients.values() if c.connected)
+        if len(self.clients) == 1:
+            return "Connected ✅" if up else "Disconnected ❌"
+        mark = "✅" if up == len(self.clients) else "❌"
+        return f"{up}/{len(self.clients)} connected {mark}"
+
+    def hosts_text(self):
+        return ", ".join(c.broker for c in self.clients.values())
+
+    def register_cb(self, signal_name: str, callback):
+        return all(c.register_cb(signal_name, callback) for c in self.clients.values())
+
+    def set_ingest_buffer(self, buffer):
+        for client in self.clients.values():
+            client.set_ingest_buffer(buffer)
+
+    def set_retained_buffer(self, buffer):
+        for client in self.clients.values():
+            client.set_retained_buffer(buffer)
+
+    def set_rate_limiter(self, limiter):
+        for client in self.clients.values():
+            client.set_rate_limiter(limiter)
+
+    def set_decoders(self, decoders):
+        """Install binary decoders — {(broker, topic_or_pattern): callable(raw) -> value}."""
+        per_broker = {name: {} for name in self.clients}
+        for (broker, topic), decoder in decoders.items():
+            if broker in per_broker:
+                per_broker[broker][topic] = decoder
+            else:
+                self.get(broker)
+        for name, client in self.clients.items():
+            client.parser.set_decoders(per_broker[name])
+
+    def update_subscriptions(self, acquire, release, qos=None):
+        """
+        Apply a refcount delta of (broker, topic) pairs, batched per broker.
+
+        :param qos: optional {(broker, topic): qos or None}
+        :return: (subscribed, unsubscribed) lists of (broker, topic)
+        """
+        per_broker = {}
+        for broker, topic in acquire:
+            per_broker.setdefault(broker, ([], [], {}))[0].append(topic)
+        for broker, topic in release:
+            per_broker.setdefault(broker, ([], [], {}))[1].append(topic)
+        for (broker, topic), level in (qos or {}).items():
+            per_broker.setdefault(broker, ([], [], {}))[2][topic] = level
+
+        subscribed, unsubscribed = [], []
+        for broker, (acq, rel, levels) in per_broker.items():
+            client = self.get(broker)
+            if client is None:
+                continue
+            subs, unsubs = client.update_subscriptions(acq, rel, levels)
+            subscribed.extend((broker, t) for t in subs)
+            unsubscribed.extend((broker, t) for t in unsubs)
+        return subscribed, unsubscribed
+
+    def start(self):
+        for client in self.clients.values():
+            client.start()
+
+    def stop(self):
+        for client in self.clients.values():
+            client.stop()
+
+    def stats_lines(self):
+        lines = []
+        for client in self.clients.values():
+            lines.extend(client.stats_lines())
+            parser = client.parser
+            lines.append(f"  Payloads parsed: {parser.parsed} (cache hits: {parser.cache_hits}, "
+                         f"binary: {parser.binary}, decode errors: {parser.errors})")
+        return lines
@@ -0,0 +1,111 @@
+"""
+Created on Sun Oct 18 20:31:14 2026
+@author: kmac3
+# ================================
+# support/change_filter.py
+# ================================
+# File version: v1.0.1
+# Sync'd to dashboard release: v3.10.0
+# Description: Change suppression — drop channel values that did not change before fan-out
+#
+# Features:
+# ✅ parse_suppress() — binding "suppress": "exact" / "none" / deadband number / {"deadband": x}
+# ✅ merge_suppress() — one rule per channel: the loosest any of its bindings asks for
+# ✅ ChangeFilter — exact compare (payload value, not the record) or numeric deadband
+#    against the last value let through; non-numeric values fall back to exact
+# ✅ passed / suppressed counters for the dispatcher dump
+# Feature Update: v1.0.1
+# ✅ TopicChangeFilter — wildcard channels compare each matching (broker, topic) with its
+#    own last value (temp/kitchen=70 no longer suppresses temp/garage=70)
+# ================================
+"""
+
+from support.payload import MqttMessage, as_number
+
+EXACT = ("exact", 0.0)
+
+
+def parse_suppress(spec):
+    """Normalise a binding's "suppress" into ("exact", 0.0) / ("deadband", band), or None."""
+    if spec is None or spec is False or spec == "none":
+        return None
+    if spec is True or spec == "exact":
+        return EXACT
+    if isinstance(spec, dict):
+        spec = spec.get("deadband", 0)
+    if isinstance(spec, (int, float)):
+        band = float(spec)
+        if band < 0:
+            raise ValueError(f"Negative deadband {band}")
+        return EXACT if band == 0 else ("deadband", band)
+    raise ValueError(f"Unknown suppress spec {spec!r} (expected 'exact', 'none' or a deadband)")
+
+
+def merge_suppress(rules):
+    """Bindings sharing a channel — none if any opts out, else exact, else the smallest deadband."""
+    if not rules or None in rules:
+        return None
+    if EXACT in rules:
+        return EXACT
+    return min(rules, key=lambda r: r[1])
+
+
+class ChangeFilter:
+    """Called with each value for one channel; returns False when it should be dropped."""
+    __slots__ = ("rule", "band", "last", "passed", "suppressed")
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.band = rule[1]
+        self.last = self  # sentinel: nothing seen yet
+        self.passed = 0
+        self.suppressed = 0
+
+    def __call__(self, value):
+        if isinstance(value, MqttMessage):
+            value = value.value
+        last = self.last
+        if last is not self:
+            if self.band:
+                number = as_number(value)
+                previous = as_number(last)
+                if number is not None and previous is not None:
+                    changed = abs(number - previous) >= self.band
+                else:
+                    changed = value != last
+            else:
+                changed = value != last
+            if not changed:
+                self.suppressed += 1
+                return False
+        self.last = value
+        self.passed += 1
+        return True
+
+    def stats(self):
+        mode = "exact" if not self.band else f"deadband {self.band:g}"
+        return f"{mode}: {self.passed} passed, {self.suppressed} suppressed"
+
+
+class TopicChangeFilter(ChangeFilter):
+    """ChangeFilter for a wildcard channel — one last value per (broker, topic)."""
+    __slots__ = ("lasts",)
+
+    def __init__(self, rule):
+        super().__init__(rule)
+        self.lasts = {}  # (broker, topic): last value let through
+
+    def __call__(self, msg):
+        key = (msg.broker, msg.topic)
+        self.last = self.lasts.get(key, self)
+        if not ChangeFilter.__call__(self, msg):
+            return False
+        self.lasts[key] = self.last
+        return True
+
+    def stats(self):
+        return f"{ChangeFilter.stats(self)} across {len(self.lasts)} topic(s)"
+
+
+def make_filter(rule, per_topic=False):
+    return TopicChangeFilter(rule) if per_topic else ChangeFilter(rule)
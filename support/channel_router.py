@@ -0,0 +1,370 @@
+"""
+Created on Sun Oct 18 18:25:47 2026
+@author: kmac3
+# ================================
+# support/channel_router.py
+# ================================
+# File version: v1.0.9
+# Sync'd to dashboard release: v3.10.0
+# Description: ChannelRouter — DataDispatcher's routing table (plain object, GUI thread only)
+#
+# Features:
+# ✅ Channel keys interned to integer IDs (cid) — stable for the router's lifetime
+# ✅ routes[cid] — flat tuple of Subscription weakrefs, rebuilt only when sinks change
+# ✅ MQTT lookup broker → topic → cid (no key strings per message); wildcard tries hold cids
+# ✅ Field channels precomputed per cid as (extractor, field cid) pairs
+# ✅ Sinks keyed by callback hash — O(1) duplicate check; dead weakrefs pruned on emit
+# ✅ Kept out of the QObject: attribute access on a sip wrapper costs ~5x a plain object
+# Feature Update: v1.0.1
+# ✅ Last-value cache — newest value + time per cid (list + array('d')), kept even while a
+#    channel has no sinks; replay() hands it to late-joining sinks
+# Feature Update: v1.0.2
+# ✅ filters[cid] — optional ChangeFilter run before caching and fan-out (unchanged values
+#    never reach a tile); a suppressed record also skips its field channels
+# Feature Update: v1.0.3
+# ✅ Optional history (TimeSeriesStore) — every delivered numeric value appended per cid
+# Feature Update: v1.0.4
+# ✅ Optional archive (HistoryDB) — the same values queued for the SQLite writer thread
+# Feature Update: v1.0.5
+# ✅ Stat channels (<key>~<stat>@<window>) — a StatGroup per source channel, fed from
+#    _store() (_record() from v1.0.9); changed stats emitted as ordinary channels, windows seeded from history
+#    when attached; expire_stats() ages them between values
+# Feature Update: v1.0.6
+# ✅ Every newly attached stat channel gets a replayable value — also when it shares a
+#    window that already existed (max@1h, then min@1h)
+# Feature Update: v1.0.7
+# ✅ A stat whose window emptied is emitted as EMPTY ("—"; an MqttMessage with value None
+#    on mqtt sources) instead of keeping its last value on screen
+# Feature Update: v1.0.8
+# ✅ History / archive record every value before the change filter — suppression only
+#    thins fan-out and the last-value cache, never the recorded series
+# Feature Update: v1.0.9
+# ✅ Stat windows fed from _record() too — a suppressed repeat is still a sample for
+#    count / min / max / mean / stddev
+# ================================
+"""
+
+import time
+from array import array
+from collections import Counter
+
+from support.broker_pool import parse_mqtt_channel_key
+from support.payload import MqttMessage, compile_field_path
+from support.rolling import EMPTY, StatGroup, parse_stat_key
+from support.topic_trie import TopicTrie, is_wildcard
+from support.myLOG2 import LOG3
+
+_NO_VALUE = object()
+
+
+def _stat_value(value, record):
+    """Stat channel value shaped like its source's values (None = empty window → EMPTY)."""
+    if isinstance(record, MqttMessage):
+        if value is None:
+            return MqttMessage(record.topic, EMPTY, None, record.ts, record.broker)
+        return record.derive(value)
+    return EMPTY if value is None else value
+
+
+class ChannelRouter:
+    def __init__(self):
+        self.channel_ids = {}  # "channel_key": cid
+        self.channel_keys = []  # cid: "channel_key"
+        self.sinks = []  # cid: {sink slot: weakref to Subscription} (registration order)
+        self.routes = []  # cid: tuple of weakrefs — what emit() walks
+        self.field_routes = []  # cid: tuple of (extractor, field cid) cut from its payload
+        self.field_info = {}  # field cid: (base cid, extractor)
+        self.mqtt_ids = {}  # broker: {topic: cid} for exact topics
+        self.wildcards = {}  # broker: TopicTrie of pattern → wildcard cid
+        self.field_misses = Counter()  # "field channel key": payloads without that field
+        self.last_values = []  # cid: newest value emitted (or _NO_VALUE)
+        self.last_times = array("d")  # cid: time.time() of that value
+        self.replayed = 0
+        self.filters = []  # cid: ChangeFilter or None
+        self.history = None  # TimeSeriesStore when enabled
+        self.archive = None  # HistoryDB when enabled
+        self.stat_info = {}  # stat cid: (source cid, window spec, stat)
+        self.stat_groups = {}  # source cid: StatGroup of its stat channels that have sinks
+
+    def channel_id(self, key: str) -> int:
+        """Intern a channel key."""
+        cid = self.channel_ids.get(key)
+        if cid is not None:
+            return cid
+        cid = len(self.channel_keys)
+        self.channel_ids[key] = cid
+        self.channel_keys.append(key)
+        self.sinks.append({})
+        self.routes.append(())
+        self.field_routes.append(())
+        self.last_values.append(_NO_VALUE)
+        self.last_times.append(0.0)
+        self.filters.append(None)
+
+        stat = parse_stat_key(key)
+        if stat is not None:
+            source_key, name, window = stat
+            self.stat_info[cid] = (self.channel_id(source_key), window, name)
+            LOG3(200 + 17, f"Stat channel '{key}' — {name} over {window}")
+            return cid
+
+        mqtt_key = parse_mqtt_channel_key(key)
+        base_key, _, path = key.partition("|")
+        if mqtt_key and path:
+            self.field_info[cid] = (self.channel_id(base_key), compile_field_path(path))
+            LOG3(200 + 8, f"Field channel '{key}' — path '{path}' compiled")
+        elif mqtt_key and not is_wildcard(mqtt_key[1]):
+            self.mqtt_ids.setdefault(mqtt_key[0], {})[mqtt_key[1]] = cid
+        return cid
+
+    def find(self, cid, callback):
+        """Return (sink slot, live Subscription already holding callback or None)."""
+        try:
+            sink = hash(callback)
+        except TypeError:
+            sink = id(callback)
+        ref = self.sinks[cid].get(sink)
+        if ref is not None:
+            sub = ref()
+            if sub is not None and sub.active:
+                if sub.callback == callback:
+                    return sink, sub
+                sink = (sink, id(callback))  # distinct callback with an equal hash
+        return sink, None
+
+    def add(self, sub, ref):
+        self.sinks[sub.channel][sub.sink] = ref
+        self._rebuild(sub.channel)
+
+    def remove(self, sub):
+        sinks = self.sinks[sub.channel]
+        ref = sinks.get(sub.sink)
+        if ref is not None and ref() in (sub, None):
+            del sinks[sub.sink]
+            self._rebuild(sub.channel)
+
+    def prune(self, cid):
+        """Drop sinks whose Subscription was collected or released."""
+        sinks = self.sinks[cid]
+        live = {k: r for k, r in sinks.items() if (s := r()) is not None and s.active}
+        LOG3(200 + 9, f"Pruned {len(sinks) - len(live)} dead sink(s) from '{self.channel_keys[cid]}'")
+        self.sinks[cid] = live
+        self._rebuild(cid)
+
+    def _rebuild(self, cid):
+        """
+        Sinks on cid changed — rebuild its tuple, its entry in the base channel's
+        field routes, and its wildcard trie membership.
+        """
+        self.routes[cid] = tuple(self.sinks[cid].values())
+        if cid in self.stat_info:
+            self._link_stat(cid)
+            return
+        info = self.field_info.get(cid)
+        if info is not None:
+            base, extractor = info
+            entries = tuple(e for e in self.field_routes[base] if e[1] != cid)
+            if self.routes[cid] or cid in self.stat_groups:
+                entries += ((extractor, cid),)
+            else:
+                self.field_misses.pop(self.channel_keys[cid], None)
+            self.field_routes[base] = entries
+            cid = base
+
+        mqtt_key = parse_mqtt_channel_key(self.channel_keys[cid])
+        if mqtt_key and is_wildcard(mqtt_key[1]):
+            broker, pattern = mqtt_key
+            trie = self.wildcards.setdefault(broker, TopicTrie())
+            if self.routes[cid] or self.field_routes[cid] or cid in self.stat_groups:
+                trie.add(pattern, cid)
+            elif trie.remove(pattern, cid):
+                LOG3(200 + 7, f"Wildcard channel '{self.channel_keys[cid]}' left the topic trie")
+
+    def _link_stat(self, cid):
+        """A stat channel gained its first sink or lost its last — (de)attach it to its source."""
+        source, window, name = self.stat_info[cid]
+        group = self.stat_groups.get(source)
+        if self.routes[cid]:
+            if group is None:
+                group = self.stat_groups[source] = StatGroup()
+            created = group.add(window, name, cid)
+            if created is not None:
+                self._seed_window(source, created)
+            self._cache_stats(source, group)
+        elif group is not None:
+            group.remove(cid)
+            if not group:
+                del self.stat_groups[source]
+        self._rebuild(source)  # the source may now need (or no longer need) its field / wildcard route
+
+    def _seed_window(self, source, window):
+        """Fill a new window from the source's history."""
+        series = self.history.get(source) if self.history is not None else None
+        if series is not None:
+            ts, values = series.range(window.since(time.time()))
+            for t, x in zip(ts.tolist(), values.tolist()):
+                window.push(t, x)
+
+    def _cache_stats(self, source, group):
+        """Store not-yet-reported stats as last values, so replay() hands them to the new sink."""
+        now = time.time()
+        record = self.last_values[source]
+        if not isinstance(record, MqttMessage):
+            mqtt_key = parse_mqtt_channel_key(self.channel_keys[source])
+            if mqtt_key:  # nothing received yet (values seeded from history) — same record shape
+                record = MqttMessage(mqtt_key[1], "", None, now, mqtt_key[0])
+        for stat_cid, value in group.changes():
+            self.last_values[stat_cid] = _stat_value(value, record)
+            self.last_times[stat_cid] = now
+
+    def _emit_stats(self, changes, record):
+        for stat_cid, value in changes:
+            self.emit(stat_cid, _stat_value(value, record))
+
+    def expire_stats(self, now):
+        """Age every stat window (samples leave, midnight passes) and emit what changed."""
+        for source, group in list(self.stat_groups.items()):
+            self._emit_stats(group.expire(now), self.last_values[source])
+
+    def stat_channel_count(self):
+        return sum(len(group) for group in self.stat_groups.values())
+
+    def emit_key(self, key: str, value):
+        """Emit on a named (non-MQTT) channel — interned on first use so its value is cached."""
+        cid = self.channel_ids.get(key)
+        if cid is None:
+            cid = self.channel_id(key)
+        self.emit(cid, value)
+
+    def set_filters(self, filters):
+        """Replace every channel's change filter — {cid: ChangeFilter}."""
+        self.filters = [filters.get(cid) for cid in range(len(self.channel_keys))]
+
+    def emit(self, cid: int, value):
+        now = time.time()
+        if self.history is not None or self.archive is not None or self.stat_groups:
+            self._record(cid, now, value)
+        changed = self.filters[cid]
+        if changed is not None and not changed(value):
+            return
+        self._deliver(cid, value, now)
+
+    def _deliver(self, cid, value, now):
+        self._store(cid, value, now)
+        dead = False
+        for ref in self.routes[cid]:
+            sub = ref()
+            if sub is None:
+                dead = True
+                continue
+            try:
+                sub.callback(value)
+            except Exception as e:
+                LOG3(200 + 6, f"Callback error for '{self.channel_keys[cid]}': {e}")
+        if dead:
+            self.prune(cid)
+
+    def _record(self, cid, now, value):
+        """History / archive / stat windows — every value, suppressed or not (a repeat is still a sample)."""
+        if self.history is not None:
+            self.history.append(cid, now, value)
+        if self.archive is not None:
+            self.archive.append(cid, now, value)
+        if self.stat_groups:
+            group = self.stat_groups.get(cid)
+            if group is not None:
+                self._emit_stats(group.push(now, value), value)
+
+    def _store(self, cid, value, now):
+        """Last-value cache for a value that passed the change filter."""
+        self.last_values[cid] = value
+        self.last_times[cid] = now
+
+    def route_mqtt(self, msg):
+        """Deliver to the exact topic channel and to every matching wildcard channel."""
+        ids = self.mqtt_ids.get(msg.broker)
+        if ids:
+            cid = ids.get(msg.topic)
+            if cid is not None:
+                self.emit_mqtt(cid, msg)
+        trie = self.wildcards.get(msg.broker)
+        if trie:
+            for cid in trie.match(msg.topic):
+                self.emit_mqtt(cid, msg)
+
+    def emit_mqtt(self, cid, msg):
+        """
+        Emit the whole record, then each field channel cut from the same parsed value.
+        A suppressed record still records its (and its fields') samples, nothing else.
+        """
+        now = time.time()
+        recording = self.history is not None or self.archive is not None or bool(self.stat_groups)
+        if recording:
+            self._record(cid, now, msg)
+        changed = self.filters[cid]
+        passed = changed is None or changed(msg)
+        if passed:
+            if self.routes[cid]:
+                self._deliver(cid, msg, now)
+            else:
+                self._store(cid, msg, now)  # no sinks right now (e.g. mid-reload) — keep for replay
+        elif not recording:
+            return
+        for extractor, field_cid in self.field_routes[cid]:
+            try:
+                value = extractor(msg.value)
+            except (KeyError, IndexError, TypeError):
+                if passed:
+                    self.field_misses[self.channel_keys[field_cid]] += 1
+                continue
+            if passed:
+                self.emit(field_cid, msg.derive(value))
+            else:
+                self._record(field_cid, now, msg.derive(value))
+
+    def last(self, cid):
+        """(value, time) of the newest value on cid, or None. Field channels fall back to
+        cutting the field from the base channel's cached record."""
+        value = self.last_values[cid]
+        if value is not _NO_VALUE:
+            return value, self.last_times[cid]
+        info = self.field_info.get(cid)
+        if info is not None:
+            base, extractor = info
+            record = self.last_values[base]
+            if isinstance(record, MqttMessage):
+                try:
+                    return record.derive(extractor(record.value)), self.last_times[base]
+                except (KeyError, IndexError, TypeError):
+                    pass
+        return None
+
+    def replay(self, sub):
+        """Give a newly registered sink the channel's cached value, if any."""
+        cached = self.last(sub.channel)
+        if cached is None:
+            return False
+        try:
+            sub.callback(cached[0])
+        except Exception as e:
+            LOG3(200 + 6, f"Replay error for '{sub.key}': {e}")
+        self.replayed += 1
+        return True
+
+    def filter_stats(self):
+        """[(channel key, ChangeFilter)] for channels with suppression, most suppressed first."""
+        active = [(self.channel_keys[cid], f) for cid, f in enumerate(self.filters) if f is not None]
+        return sorted(active, key=lambda item: -item[1].suppressed)
+
+    def cached_count(self):
+        return sum(1 for value in self.last_values if value is not _NO_VALUE)
+
+    def live_channels(self):
+        """cids with at least one sink, in interning order."""
+        return [cid for cid, route in enumerate(self.routes) if route]
+
+    def field_channel_count(self):
+        return sum(len(f) for f in self.field_routes)
+
+    def wildcard_count(self):
+        return sum(len(trie) for trie in self.wildcards.values())
@@ -0,0 +1,130 @@
+"""
+Created on Sun Oct 18 23:12:05 2026
+@author: kmac3
+# ================================
+# support/history.py
+# ================================
+# File version: v1.1.0
+# Sync'd to dashboard release: v3.10.0
+# Description: TimeSeriesStore — per-channel NumPy ring buffers of numeric values
+#
+# Features:
+# ✅ One RingSeries per channel that carries numbers — preallocated float64 timestamps +
+#    values, fixed capacity (bounded memory), allocated on the first numeric value
+# ✅ Double-write ring: every point is stored at i and i + capacity, so any last-N window
+#    is one contiguous slice — last(n) / range(t0, t1) / window() return read-only views
+#    (no copy); a view stays valid until that channel has appended capacity more points
+# ✅ range() is a searchsorted on the time-ordered window — O(log n)
+# ✅ numpy is optional — without it the store is simply not created
+# Feature Update: v1.1.0
+# ✅ RingSeries can wrap caller-supplied arrays (support/history_files.py maps them from disk);
+#    TimeSeriesStore.new_series() / get() are the hooks a file-backed store overrides
+# ================================
+"""
+
+try:
+    import numpy as np
+except ImportError:  # history is optional
+    np = None
+
+from support.payload import as_number
+
+
+def history_available():
+    return np is not None
+
+
+class RingSeries:
+    """Fixed-size time series for one channel (GUI thread only)."""
+    __slots__ = ("capacity", "ts", "values", "count", "_head", "_ts_w", "_values_w")
+
+    def __init__(self, capacity, ts=None, values=None, head=0, count=0):
+        self.capacity = capacity
+        self.ts = np.zeros(2 * capacity) if ts is None else ts
+        self.values = np.zeros(2 * capacity) if values is None else values
+        self.count = count
+        self._head = head  # slot the next point is written to (0 .. capacity-1)
+        # Scalar writes through memoryviews of the same buffers — ~2x faster than ndarray setitem
+        self._ts_w = memoryview(self.ts)
+        self._values_w = memoryview(self.values)
+
+    def append(self, t, value):
+        i = self._head
+        j = i + self.capacity
+        self._ts_w[i] = self._ts_w[j] = t
+        self._values_w[i] = self._values_w[j] = value
+        self._head = i + 1 if i + 1 < self.capacity else 0
+        if self.count < self.capacity:
+            self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def _slice(self, n):
+        # newest point is at _head - 1 + capacity; the n before it are contiguous
+        end = self._head + self.capacity
+        return slice(end - n, end)
+
+    def _view(self, s):
+        ts, values = self.ts[s], self.values[s]
+        ts.flags.writeable = False
+        values.flags.writeable = False
+        return ts, values
+
+    def window(self):
+        """(timestamps, values) of every stored point, oldest first — views, no copy."""
+        return self._view(self._slice(self.count))
+
+    def last(self, n):
+        """The newest n points (fewer if not yet stored) — views, no copy."""
+        return self._view(self._slice(min(max(0, int(n)), self.count)))
+
+    def range(self, t0, t1=None):
+        """Points with t0 <= t < t1 (t1=None: up to now) — views, no copy."""
+        s = self._slice(self.count)
+        ts = self.ts[s]
+        lo = int(np.searchsorted(ts, t0, "left"))
+        hi = len(ts) if t1 is None else int(np.searchsorted(ts, t1, "left"))
+        return self._view(slice(s.start + lo, s.start + max(lo, hi)))
+
+    def latest(self):
+        """(t, value) of the newest point, or None."""
+        if not self.count:
+            return None
+        i = self._head - 1 + self.capacity
+        return float(self.ts[i]), float(self.values[i])
+
+    def nbytes(self):
+        return self.ts.nbytes + self.values.nbytes
+
+
+class TimeSeriesStore:
+    """RingSeries per channel ID, fed by ChannelRouter on every delivered value."""
+
+    def __init__(self, capacity=3600):
+        self.capacity = max(1, int(capacity))
+        self.series = {}  # cid: RingSeries
+        self.appended = 0
+
+    def append(self, cid, t, value):
+        number = as_number(value)
+        if number is None:
+            return
+        series = self.series.get(cid)
+        if series is None:
+            series = self.series[cid] = self.new_series(cid)
+        series.append(t, number)
+        self.appended += 1
+
+    def new_series(self, cid):
+        return RingSeries(self.capacity)
+
+    def get(self, cid):
+        return self.series.get(cid)
+
+    def nbytes(self):
+        return sum(series.nbytes() for series in self.series.values())
+
+    def stats_lines(self):
+        return [f"History: {len(self.series)} series × {self.capacity} points, "
+                f"{self.nbytes() / 1e6:.1f} MB, {self.appended} points appended"]
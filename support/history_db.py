@@ -0,0 +1,279 @@
+"""
+Created on Mon Oct 19 02:10:37 2026
+@author: kmac3
+# ================================
+# support/history_db.py
+# ================================
+# File version: v1.0.1
+# Sync'd to dashboard release: v3.10.0
+# Description: HistoryDB — long-retention channel history in SQLite (WAL)
+#
+# Features:
+# ✅ append() only queues (cid, t, value) — a writer thread commits in batches every
+#    commit_ms (default 500) in one transaction; GUI-side cost is one queue put
+# ✅ WAL journal + synchronous=NORMAL — readers never block the writer and vice versa
+# ✅ samples(channel, ts, value) with a covering (channel, ts, value) index — a channel's
+#    time range is one index range scan, no table lookups; channel keys stored once
+# ✅ history(key, start, end, max_points) — raw points, or per-bucket averages when the range
+#    holds more than max_points; safe from any thread (one read connection per thread)
+# ✅ Optional retention (days) — the writer deletes older samples once an hour
+# ✅ CLI: python -m support.history_db <db> channels | query <key> [--start=-1h] [--end=...]
+#    [--max-points N]
+# Feature Update: v1.0.1
+# ✅ samples is a rowid table with a non-unique covering index and plain INSERTs — two
+#    samples of a channel at the same timestamp are both kept (REPLACE lost one)
+# ✅ HistoryDB(readonly=True) — opens nothing for writing and never creates the file; the
+#    CLI uses it and fails on a missing database
+# ================================
+"""
+
+import argparse
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+from support.payload import as_number
+from support.myLOG2 import LOG3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS samples (channel INTEGER NOT NULL, ts REAL NOT NULL, value REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS samples_channel_ts ON samples (channel, ts, value);
+"""
+PRUNE_INTERVAL = 3600.0  # s between retention passes
+_STOP = object()
+
+
+def connect(path, readonly=False):
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; a crash loses at most the last commit
+        _upgrade(conn)
+        conn.executescript(SCHEMA)
+    return conn
+
+
+def _upgrade(conn):
+    """v1.0.0 files keyed samples on (channel, ts) — copy them into the current table."""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'samples'").fetchone()
+    if row is None or "WITHOUT ROWID" not in row[0]:
+        return
+    conn.execute("BEGIN")  # DDL included — sqlite3 only opens transactions for DML itself
+    with conn:
+        conn.execute("ALTER TABLE samples RENAME TO samples_v1")
+        for statement in filter(str.strip, SCHEMA.split(";")):
+            conn.execute(statement)
+        conn.execute("INSERT INTO samples SELECT channel, ts, value FROM samples_v1")
+        conn.execute("DROP TABLE samples_v1")
+    LOG3(100 + 87, "History DB: samples table upgraded (same-timestamp samples are now kept)")
+
+
+class HistoryDB:
+    """SQLite channel history — fed by ChannelRouter (GUI thread), written by its own thread."""
+
+    def __init__(self, path, channel_keys, commit_ms=500, retention_days=None, readonly=False):
+        self.path = path
+        self.readonly = readonly  # query only — append() is not available
+        self.channel_keys = channel_keys  # ChannelRouter.channel_keys — cid → key
+        self.commit_interval = commit_ms / 1000.0
+        self.retention = retention_days * 86400.0 if retention_days else None
+        self.queue = queue.SimpleQueue()
+        self.wake = threading.Event()  # set by close() to cut the batching wait short
+        self.local = threading.local()  # per-thread read connection
+        self.thread = None
+        # Writer counters (written by the writer thread, read for the dump)
+        self.queued = 0
+        self.written = 0
+        self.commits = 0
+        self.dropped = 0
+        self.largest_batch = 0
+        self.commit_ms = 0.0
+        self.max_commit_ms = 0.0
+        if readonly:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"No history database at {path}")
+        else:
+            connect(path).close()  # schema exists before the first reader
+
+    # ---- write side -------------------------------------------------------
+
+    def append(self, cid, t, value):
+        number = as_number(value)
+        if number is None:
+            return
+        if self.thread is None:
+            if self.readonly:
+                raise RuntimeError(f"History database {self.path} is open read-only")
+            self.thread = threading.Thread(target=self._run, name="history-db", daemon=True)
+            self.thread.start()
+        self.queue.put((cid, t, number))
+        self.queued += 1
+
+    def close(self):
+        """Commit what is queued and stop the writer."""
+        if self.thread is not None:
+            self.queue.put(_STOP)
+            self.wake.set()
+            self.thread.join(timeout=10)
+            self.thread = None
+
+    def _run(self):
+        conn = connect(self.path)
+        ids = {}  # cid: channels.id
+        last_prune = 0.0
+        get, get_nowait = self.queue.get, self.queue.get_nowait
+        running = True
+        while running:
+            first = get()
+            self.wake.wait(self.commit_interval)  # let a batch build up
+            batch = [first]
+            try:
+                while True:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                pass
+            if _STOP in batch:
+                running = False
+                batch = [item for item in batch if item is not _STOP]
+            if batch:
+                self._commit(conn, ids, batch)
+            if self.retention and time.time() - last_prune > PRUNE_INTERVAL:
+                last_prune = time.time()
+                self._prune(conn)
+        conn.close()
+
+    def _commit(self, conn, ids, batch):
+        start = time.perf_counter()
+        try:
+            with conn:
+                for cid in {item[0] for item in batch} - ids.keys():
+                    key = self.channel_keys[cid]
+                    conn.execute("INSERT OR IGNORE INTO channels (key) VALUES (?)", (key,))
+                    ids[cid] = conn.execute("SELECT id FROM channels WHERE key = ?", (key,)).fetchone()[0]
+                conn.executemany("INSERT INTO samples VALUES (?, ?, ?)",
+                                 [(ids[cid], t, value) for cid, t, value in batch])
+        except sqlite3.Error as e:
+            self.dropped += len(batch)
+            LOG3(100 + 85, f"History DB commit failed ({len(batch)} samples dropped): {e}")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        self.written += len(batch)
+        self.commits += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.commit_ms += elapsed
+        self.max_commit_ms = max(self.max_commit_ms, elapsed)
+
+    def _prune(self, conn):
+        try:
+            with conn:
+                removed = conn.execute("DELETE FROM samples WHERE ts < ?", (time.time() - self.retention,)).rowcount
+        except sqlite3.Error as e:
+            LOG3(100 + 85, f"History DB retention pass failed: {e}")
+            return
+        if removed:
+            LOG3(100 + 86, f"History DB: {removed} samples past retention removed")
+
+    # ---- read side --------------------------------------------------------
+
+    def _reader(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = connect(self.path, readonly=True)
+        return conn
+
+    def channels(self):
+        """[(key, samples, first ts, last ts)] for every stored channel."""
+        return self._reader().execute(
+            "SELECT c.key, COUNT(s.ts), MIN(s.ts), MAX(s.ts) FROM channels c "
+            "LEFT JOIN samples s ON s.channel = c.id GROUP BY c.id ORDER BY c.key"
+        ).fetchall()
+
+    def history(self, key, start, end=None, max_points=None):
+        """
+        (timestamps, values) of key with start <= t < end (end=None: up to now), oldest
+        first. With max_points, a range holding more points than that is returned as
+        equal-width time buckets (mean t, mean value) instead — at most max_points, empty
+        buckets omitted.
+        """
+        conn = self._reader()
+        end = float("inf") if end is None else end
+        row = conn.execute("SELECT id FROM channels WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return [], []
+        channel = row[0]
+        if max_points:
+            count, first, last = conn.execute(
+                "SELECT COUNT(*), MIN(ts), MAX(ts) FROM samples WHERE channel = ? AND ts >= ? AND ts < ?",
+                (channel, start, end)).fetchone()
+        if max_points and count > max_points:
+            width = (last - first) / max_points * (1 + 1e-9) or 1.0  # last point stays in bucket max_points - 1
+            rows = conn.execute(
+                "SELECT AVG(ts), AVG(value) FROM samples WHERE channel = ? AND ts >= ? AND ts < ? "
+                "GROUP BY CAST((ts - ?) / ? AS INTEGER) ORDER BY 1",
+                (channel, start, end, first, width)).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT ts, value FROM samples WHERE channel = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (channel, start, end)).fetchall()
+        return [r[0] for r in rows], [r[1] for r in rows]
+
+    def stats_lines(self):
+        avg = self.commit_ms / self.commits if self.commits else 0.0
+        return [f"History DB: {self.path} — {self.written}/{self.queued} samples written in {self.commits} "
+                f"commits (largest {self.largest_batch}, avg {avg:.1f} ms, max {self.max_commit_ms:.1f} ms), "
+                f"{self.dropped} dropped"]
+
+
+def parse_when(text, now=None):
+    """CLI times: "now", relative "-90s" / "-15m" / "-2h" / "-7d", epoch seconds, or ISO 8601."""
+    now = time.time() if now is None else now
+    if text == "now":
+        return now
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if text.startswith("-") and text[-1] in units:
+        return now - float(text[1:-1]) * units[text[-1]]
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m support.history_db", description="Query channel history")
+    parser.add_argument("db")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("channels", help="list stored channels")
+    query = commands.add_parser("query", help="print one channel's samples as CSV")
+    query.add_argument("key")
+    query.add_argument("--start", default="-1h", help="now, -90s / -15m / -2h / -7d, epoch or ISO (--start=-2h)")
+    query.add_argument("--end", default="now")
+    query.add_argument("--max-points", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        db = HistoryDB(args.db, [], readonly=True)
+    except FileNotFoundError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if args.command == "channels":
+        for key, count, first, last in db.channels():
+            span = f"{datetime.fromtimestamp(first):%Y-%m-%d %H:%M:%S} → {datetime.fromtimestamp(last):%Y-%m-%d %H:%M:%S}" \
+                if count else "—"
+            print(f"{key}\t{count}\t{span}")
+        return 0
+    ts, values = db.history(args.key, parse_when(args.start), parse_when(args.end), args.max_points)
+    print("time,value")
+    for t, value in zip(ts, values):
+        print(f"{datetime.fromtimestamp(t).isoformat(timespec='milliseconds')},{value:g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Created on Mon Oct 19 01:02:44 2026
+@author: kmac3
+# ================================
+# support/history_files.py
+# ================================
+# File version: v1.0.0
+# Sync'd to dashboard release: v3.10.0
+# Description: MappedHistoryStore — channel history in memory-mapped files (survives restarts)
+#
+# Features:
+# ✅ One file per channel: 256-byte header + fixed 16-byte records (float64 t, float64 value)
+#    laid out as the RingSeries double-write ring — the mapped arrays ARE the series, so
+#    last(n) / range() views read straight from the page cache
+# ✅ Head / count kept in the header on every append — a restart re-attaches the file as-is
+#    (no parse, no copy); history(key) finds it before the first new value arrives
+# ✅ Durability batched: flush() msyncs only series written since the last sync — the
+#    dispatcher runs it on the scheduler (prefs "history_sync_s") and on stop
+# ✅ File sized for the configured capacity; a file from a run with another "history_points"
+#    is migrated (newest points kept), an unreadable one is set aside as *.bad
+# ================================
+"""
+
+import hashlib
+import os
+import re
+import time
+
+try:
+    import numpy as np
+except ImportError:  # history is optional
+    np = None
+
+from support.history import RingSeries, TimeSeriesStore
+from support.myLOG2 import LOG3
+
+MAGIC = b"DASHHIST"
+VERSION = 1
+HEADER_SIZE = 256
+# Header: magic[8] | version u4 | record size u4 | capacity u8 | head u8 | count u8 | key (utf-8, NUL padded)
+META = slice(16, 40)  # capacity, head, count as three little-endian u8
+KEY = slice(40, HEADER_SIZE)
+RECORD = np.dtype([("t", "<f8"), ("v", "<f8")]) if np is not None else None
+
+
+def history_filename(key):
+    """Readable, filesystem-safe name for a channel key (hash keeps similar keys apart)."""
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("_")[:80]
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+    return f"{slug}-{digest}.hist"
+
+
+def _key_bytes(key):
+    return key.encode("utf-8")[:KEY.stop - KEY.start]
+
+
+class MappedSeries(RingSeries):
+    """RingSeries over a memory-mapped history file (GUI thread only)."""
+    __slots__ = ("path", "key", "mapped", "dirty", "_meta_w")
+
+    def __init__(self, path, key, mapped):
+        capacity, head, count = (int(n) for n in mapped[META].view("<u8"))
+        records = mapped[HEADER_SIZE:].view(RECORD)
+        super().__init__(capacity, records["t"], records["v"], head, count)
+        self.path = path
+        self.key = key
+        self.mapped = mapped
+        self.dirty = False
+        self._meta_w = memoryview(mapped[META].view("<u8"))
+
+    @classmethod
+    def create(cls, path, key, capacity):
+        mapped = np.memmap(path, dtype=np.uint8, mode="w+", shape=(HEADER_SIZE + 2 * capacity * RECORD.itemsize,))
+        mapped[:8] = np.frombuffer(MAGIC, dtype=np.uint8)
+        mapped[8:16].view("<u4")[:] = (VERSION, RECORD.itemsize)
+        mapped[META].view("<u8")[:] = (capacity, 0, 0)
+        raw = _key_bytes(key)
+        mapped[KEY.start:KEY.start + len(raw)] = np.frombuffer(raw, dtype=np.uint8)
+        series = cls(path, key, mapped)
+        series.dirty = True
+        return series
+
+    @classmethod
+    def open(cls, path, key, capacity):
+        """Re-attach an existing file; raises ValueError if it is not a history file for key."""
+        mapped = np.memmap(path, dtype=np.uint8, mode="r+")
+        if len(mapped) < HEADER_SIZE or bytes(mapped[:8]) != MAGIC:
+            raise ValueError("not a history file")
+        version, record_size = (int(n) for n in mapped[8:16].view("<u4"))
+        stored, head, count = (int(n) for n in mapped[META].view("<u8"))
+        if version != VERSION or record_size != RECORD.itemsize:
+            raise ValueError(f"unsupported format v{version} / {record_size}-byte records")
+        if len(mapped) != HEADER_SIZE + 2 * stored * record_size or head >= stored or count > stored:
+            raise ValueError("truncated or inconsistent header")
+        if bytes(mapped[KEY]).rstrip(b"\0") != _key_bytes(key):
+            raise ValueError("file belongs to another channel")
+        series = cls(path, key, mapped)
+        if stored == capacity:
+            return series
+        # Another "history_points" — keep the newest points, drop the old mapping, rewrite
+        ts, values = (a.copy() for a in series.last(capacity))
+        del series, mapped
+        series = cls.create(path, key, capacity)
+        for t, value in zip(ts.tolist(), values.tolist()):
+            series.append(t, value)
+        return series
+
+    def append(self, t, value):
+        RingSeries.append(self, t, value)
+        meta = self._meta_w
+        meta[1] = self._head
+        meta[2] = self.count
+        self.dirty = True
+
+    def flush(self):
+        """msync this file if it was written since the last flush."""
+        if self.dirty:
+            self.mapped.flush()
+            self.dirty = False
+            return True
+        return False
+
+
+class MappedHistoryStore(TimeSeriesStore):
+    """TimeSeriesStore whose series are files in directory, keyed by channel key."""
+
+    def __init__(self, directory, channel_keys, capacity=3600):
+        super().__init__(capacity)
+        self.directory = directory
+        self.channel_keys = channel_keys  # ChannelRouter.channel_keys — cid → key, grows with it
+        self.absent = set()  # cids with no file from an earlier run
+        self.attached = 0  # series re-opened from an earlier run
+        self.syncs = 0
+        self.synced_files = 0
+        self.sync_ms = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def path_of(self, cid):
+        return os.path.join(self.directory, history_filename(self.channel_keys[cid]))
+
+    def new_series(self, cid):
+        return self._attach(cid) or MappedSeries.create(self.path_of(cid), self.channel_keys[cid], self.capacity)
+
+    def get(self, cid):
+        """Series for cid — a file left by an earlier run is re-attached on first ask."""
+        series = self.series.get(cid)
+        if series is None and cid not in self.absent:
+            series = self._attach(cid)
+            if series is None:
+                self.absent.add(cid)
+            else:
+                self.series[cid] = series
+        return series
+
+    def _attach(self, cid):
+        path = self.path_of(cid)
+        if not os.path.exists(path):
+            return None
+        key = self.channel_keys[cid]
+        try:
+            series = MappedSeries.open(path, key, self.capacity)
+        except (OSError, ValueError) as e:
+            LOG3(100 + 81, f"History file for '{key}' unusable ({e}) — starting a new one")
+            series = None
+        if series is None:  # renamed outside the handler — its traceback still holds the mapping
+            os.replace(path, path + ".bad")
+            return None
+        self.attached += 1
+        LOG3(100 + 80, f"History re-attached: '{key}' ({len(series)} points)")
+        return series
+
+    def flush(self):
+        """Sync every series written since the last flush (scheduler job)."""
+        start = time.perf_counter()
+        synced = sum(series.flush() for series in self.series.values())
+        if synced:
+            self.syncs += 1
+            self.synced_files += synced
+            self.sync_ms += (time.perf_counter() - start) * 1000
+
+    def close(self):
+        self.flush()
+        self.series.clear()
+        self.absent.clear()
+
+    def stats_lines(self):
+        avg = self.sync_ms / self.syncs if self.syncs else 0.0
+        return super().stats_lines() + [
+            f"History files: {self.directory} — {self.attached} re-attached, {self.syncs} syncs "
+            f"({self.synced_files} files, avg {avg:.1f} ms)"
+        ]
@@ -0,0 +1,108 @@
+"""
+Created on Sun Oct 18 10:12:40 2026
+@author: kmac3
+# ================================
+# support/ingest_buffer.py
+# ================================
+# File version: v1.0.4
+# Sync'd to dashboard release: v3.10.0
+# Description: CoalescingBuffer — per-topic last-value-wins handoff between
+#              the MQTT network thread and the GUI thread
+#
+# Features:
+# ✅ put() from any thread — newer values overwrite unread older ones
+# ✅ drain() from the GUI thread — swaps the pending dict out in O(1)
+# ✅ Counters: received, coalesced (overwritten before drain), drained, drains
+# ✅ Per-topic coalesced counts for the registration dump
+#
+# Feature Update: v1.0.1
+# ✅ Keys may be (broker, topic) tuples — shown as "broker topic" in the dump
+# Feature Update: v1.0.2
+# ✅ put() reports whether it was the first value since the last drain (wake-up hint)
+# Feature Update: v1.0.3
+# ✅ Base of the telemetry / bulk lanes in support/lanes.py (LaneBuffer is the ingest buffer)
+# Feature Update: v1.0.4
+# ✅ supersede() — replace a value only while one is pending (live records overtaking a
+#    retained burst that has not been drained yet)
+# ================================
+"""
+
+import threading
+
+
+class CoalescingBuffer:
+    """
+    Last-value-wins buffer keyed by topic.
+
+    The MQTT thread calls put() for every message; the GUI thread calls
+    drain() once per frame and receives only the newest value per topic.
+    Values overwritten before a drain are counted as coalesced.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.received = 0
+        self.coalesced = 0
+        self.drained = 0
+        self.drains = 0
+        self.coalesced_by_topic = {}
+
+    def put(self, topic, value):
+        """
+        Store the latest value for a topic (called from the MQTT thread).
+
+        :return: True when the buffer was empty before this put
+        """
+        with self._lock:
+            first = not self._pending
+            self.received += 1
+            if topic in self._pending:
+                self.coalesced += 1
+                self.coalesced_by_topic[topic] = self.coalesced_by_topic.get(topic, 0) + 1
+            self._pending[topic] = value
+        return first
+
+    def supersede(self, topic, value):
+        """
+        Replace the pending value for a topic, if there is one (called from the MQTT thread).
+
+        :return: True when the value now waits in this buffer, False when nothing was pending
+        """
+        if topic not in self._pending:  # lock-free fast path — the common case
+            return False
+        with self._lock:
+            if topic not in self._pending:
+                return False
+            self.received += 1
+            self.coalesced += 1
+            self.coalesced_by_topic[topic] = self.coalesced_by_topic.get(topic, 0) + 1
+            self._pending[topic] = value
+        return True
+
+    def drain(self):
+        """Return {topic: value} accumulated since the last drain (GUI thread)."""
+        with self._lock:
+            if not self._pending:
+                return {}
+            batch = self._pending
+            self._pending = {}
+            self.drained += len(batch)
+            self.drains += 1
+        return batch
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def stats_lines(self):
+        """Human-readable counters for dump_registrations()."""
+        lines = [
+            f"  Received: {self.received}",
+            f"  Delivered: {self.drained} in {self.drains} frames",
+            f"  Coalesced: {self.coalesced}",
+        ]
+        for topic, count in sorted(self.coalesced_by_topic.items(), key=lambda kv: -kv[1])[:10]:
+            label = " ".join(topic) if isinstance(topic, tuple) else topic
+            lines.append(f"    {label}: {count}")
+        return lines
@@ -0,0 +1,144 @@
+"""
+Created on Sun Oct 18 22:34:18 2026
+@author: kmac3
+# ================================
+# support/lanes.py
+# ================================
+# File version: v1.0.0
+# Sync'd to dashboard release: v3.10.0
+# Description: LaneBuffer — prioritised MQTT ingest (status / telemetry / bulk)
+#
+# Features:
+# ✅ Topics mapped to a lane by binding "priority" (exact topics + wildcard patterns);
+#    unlisted topics ride the telemetry lane
+# ✅ status lane — never buffered: put() returns False and the MQTT thread signals it at once
+# ✅ telemetry / bulk lanes — per-topic last-value buffers (CoalescingBuffer) drained on
+#    the frame tick, each within its own ms budget; what does not fit waits for the next
+#    frame (and keeps coalescing) instead of stalling the GUI
+# ✅ Per-lane received / delivered / coalesced / deferred counters for the dump
+# ================================
+"""
+
+import time
+
+from support.ingest_buffer import CoalescingBuffer
+from support.topic_trie import TopicTrie, is_wildcard
+
+LANES = ("status", "telemetry", "bulk")
+STATUS, TELEMETRY, BULK = range(3)
+DEFAULT_BUDGETS_MS = {"telemetry": 8.0, "bulk": 2.0}
+
+
+def parse_priority(name):
+    """Lane index for a binding "priority" (None → telemetry)."""
+    if name is None:
+        return TELEMETRY
+    if name not in LANES:
+        raise ValueError(f"Unknown priority '{name}' (expected one of {LANES})")
+    return LANES.index(name)
+
+
+class _Lane(CoalescingBuffer):
+    """Coalescing buffer that can take back what a frame had no budget for."""
+
+    def __init__(self, budget_ms):
+        super().__init__()
+        self.budget = budget_ms / 1000.0
+        self.deferred = 0
+        self.over_budget = 0  # frames that ran out of budget on this lane
+
+    def requeue(self, leftover):
+        """Put undelivered (older) values back in front; newer values already queued win."""
+        with self._lock:
+            self.drained -= len(leftover)
+            self.deferred += len(leftover)
+            self.over_budget += 1
+            for key, value in self._pending.items():
+                if key in leftover:
+                    self.coalesced += 1
+                leftover[key] = value
+            self._pending = leftover
+
+
+class LaneBuffer:
+    """Ingest buffer shared by the broker threads (see MqttLiveClient.set_ingest_buffer)."""
+
+    def __init__(self, budgets_ms=None):
+        budgets = dict(DEFAULT_BUDGETS_MS, **(budgets_ms or {}))
+        self.lanes = {TELEMETRY: _Lane(budgets["telemetry"]), BULK: _Lane(budgets["bulk"])}
+        self.urgent = 0  # status-lane messages handed straight to the GUI
+        self._rules = ({}, {}, {})  # exact {(broker, topic): lane}, {broker: TopicTrie}, resolved cache
+
+    def configure(self, rules):
+        """Replace the topic → lane table — {(broker, topic or pattern): lane index}."""
+        exact, tries = {}, {}
+        for (broker, topic), lane in rules.items():
+            if is_wildcard(topic):
+                tries.setdefault(broker, TopicTrie()).add(topic, lane)
+            else:
+                exact[(broker, topic)] = lane
+        self._rules = (exact, tries, {})  # swapped in one assignment — MQTT threads read it
+
+    def lane_of(self, key):
+        exact, tries, resolved = self._rules
+        lane = resolved.get(key)
+        if lane is None:
+            trie = tries.get(key[0])
+            candidates = list(trie.match(key[1])) if trie else []
+            if key in exact:
+                candidates.append(exact[key])
+            lane = min(candidates, default=TELEMETRY)  # highest priority among matching rules
+            resolved[key] = lane
+        return lane
+
+    def put(self, key, record):
+        """
+        Called from the MQTT thread. Returns False for status-lane messages — the caller
+        delivers those immediately — and True when the record waits for the frame tick.
+        """
+        lane = self.lane_of(key)
+        if lane == STATUS:
+            self.urgent += 1
+            return False
+        self.lanes[lane].put(key, record)
+        return True
+
+    def drain(self, route, budgeted=True):
+        """Frame tick (GUI thread) — route each lane's values within that lane's budget."""
+        clock = time.perf_counter
+        for lane in self.lanes.values():
+            batch = lane.drain()
+            if not batch:
+                continue
+            if not budgeted:
+                for msg in batch.values():
+                    route(msg)
+                continue
+            deadline = clock() + lane.budget
+            items = iter(batch.items())
+            for _, msg in items:
+                route(msg)
+                if clock() > deadline:
+                    leftover = dict(items)
+                    if leftover:
+                        lane.requeue(leftover)
+                    break
+
+    def pending_count(self):
+        return sum(lane.pending_count() for lane in self.lanes.values())
+
+    @property
+    def coalesced(self):
+        return sum(lane.coalesced for lane in self.lanes.values())
+
+    @property
+    def drains(self):
+        return max(lane.drains for lane in self.lanes.values())
+
+    def stats_lines(self):
+        lines = [f"  status: {self.urgent} delivered immediately"]
+        for index, lane in self.lanes.items():
+            lines.append(f"  {LANES[index]} (budget {lane.budget * 1000:g} ms): {lane.received} received, "
+                         f"{lane.drained} delivered, {lane.coalesced} coalesced, {lane.deferred} deferred "
+                         f"({lane.over_budget} frames over budget)")
+        return lines
@@ -0,0 +1,315 @@
+"""
+Created on Sun Oct 18 14:05:31 2026
+@author: kmac3
+# ================================
+# support/local_broker.py
+# ================================
+# File version: v1.0.0
+# Sync'd to dashboard release: v3.10.0
+# Description: LocalBroker — minimal in-process MQTT broker stand-in for offline runs and benchmarks
+#
+# Features:
+# ✅ Plain TCP on localhost, MQTT 3.1.1 and 5.0 clients (paho, mosquitto_pub, LoadGenerator)
+# ✅ CONNECT / PUBLISH (QoS 0 and 1) / SUBSCRIBE / UNSUBSCRIBE / PINGREQ / DISCONNECT
+# ✅ '+' / '#' routing through TopicTrie, retained messages replayed on subscribe
+# ✅ Outbound delivery is QoS 0 (granted QoS is always 0 — a stand-in, not a real broker)
+# ✅ Counters for received / delivered messages
+# ✅ Standalone: python -m support.local_broker [port]
+# ================================
+"""
+
+import socket
+import struct
+import sys
+import threading
+import time
+
+from support.topic_trie import TopicTrie
+
+CONNECT, CONNACK, PUBLISH, PUBACK = 1, 2, 3, 4
+SUBSCRIBE, SUBACK, UNSUBSCRIBE, UNSUBACK = 8, 9, 10, 11
+PINGREQ, PINGRESP, DISCONNECT = 12, 13, 14
+
+
+# ================================
+# Packet encoding helpers (shared with tools/mqtt_load_gen.py)
+# ================================
+def encode_varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def encode_str(s: str) -> bytes:
+    data = s.encode()
+    return struct.pack("!H", len(data)) + data
+
+
+def packet(ptype: int, flags: int, body: bytes) -> bytes:
+    return bytes([(ptype << 4) | flags]) + encode_varint(len(body)) + body
+
+
+def encode_connect(client_id: str, keepalive: int = 60, level: int = 4) -> bytes:
+    body = encode_str("MQTT") + bytes([level, 0x02]) + struct.pack("!H", keepalive)
+    if level == 5:
+        body += b"\x00"
+    return packet(CONNECT, 0, body + encode_str(client_id))
+
+
+def encode_publish(topic: str, payload: bytes, retain=False, level: int = 4) -> bytes:
+    body = encode_str(topic)
+    if level == 5:
+        body += b"\x00"
+    return packet(PUBLISH, 0x01 if retain else 0x00, body + payload)
+
+
+def _read_varint(buf, pos):
+    mult, value = 1, 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value += (byte & 0x7F) * mult
+        if not byte & 0x80:
+            return value, pos
+        mult <<= 7
+
+
+def _read_str(buf, pos):
+    (length,) = struct.unpack_from("!H", buf, pos)
+    pos += 2
+    return bytes(buf[pos:pos + length]).decode(), pos + length
+
+
+def _skip_props(buf, pos):
+    length, pos = _read_varint(buf, pos)
+    return pos + length
+
+
+class _Session:
+    """One connected client."""
+
+    def __init__(self, broker, sock, addr):
+        self.broker = broker
+        self.sock = sock
+        self.addr = addr
+        self.level = 4
+        self.client_id = ""
+        self.patterns = set()
+        self.send_lock = threading.Lock()
+        self.alive = True
+
+    def send(self, data: bytes):
+        try:
+            with self.send_lock:
+                self.sock.sendall(data)
+        except OSError:
+            self.alive = False
+
+    def publish(self, topic, payload, retain=False):
+        self.send(encode_publish(topic, payload, retain, self.level))
+
+    def serve(self):
+        buf = bytearray()
+        try:
+            while self.alive:
+                chunk = self.sock.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+                pos = 0
+                while True:
+                    if len(buf) - pos < 2:
+                        break
+                    try:
+                        length, body_start = _read_varint(buf, pos + 1)
+                    except IndexError:
+                        break
+                    end = body_start + length
+                    if end > len(buf):
+                        break
+                    header = buf[pos]
+                    self.handle(header >> 4, header & 0x0F, bytes(buf[body_start:end]))
+                    pos = end
+                if pos:
+                    del buf[:pos]
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.alive = False
+            self.broker._drop(self)
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+
+    def handle(self, ptype, flags, body):
+        v5 = self.level == 5
+        if ptype == PUBLISH:
+            qos = (flags >> 1) & 0x03
+            topic, pos = _read_str(body, 0)
+            packet_id = None
+            if qos:
+                (packet_id,) = struct.unpack_from("!H", body, pos)
+                pos += 2
+            if v5:
+                pos = _skip_props(body, pos)
+            self.broker.route(topic, body[pos:], bool(flags & 0x01))
+            if qos == 1:
+                self.send(packet(PUBACK, 0, struct.pack("!H", packet_id)))
+        elif ptype == CONNECT:
+            _, pos = _read_str(body, 0)
+            self.level = body[pos]
+            pos += 4  # level, flags, keepalive
+            if self.level == 5:
+                pos = _skip_props(body, pos)
+            self.client_id, _ = _read_str(body, pos)
+            ack = b"\x00\x00\x00" if self.level == 5 else b"\x00\x00"
+            self.send(packet(CONNACK, 0, ack))
+        elif ptype == SUBSCRIBE:
+            (packet_id,) = struct.unpack_from("!H", body, 0)
+            pos = _skip_props(body, 2) if v5 else 2
+            codes = bytearray()
+            patterns = []
+            while pos < len(body):
+                pattern, pos = _read_str(body, pos)
+                pos += 1  # options / requested QoS
+                patterns.append(pattern)
+                codes.append(0x00)
+            ack = struct.pack("!H", packet_id) + (b"\x00" if v5 else b"") + bytes(codes)
+            self.send(packet(SUBACK, 0, ack))
+            for pattern in patterns:
+                self.broker.subscribe(self, pattern)
+        elif ptype == UNSUBSCRIBE:
+            (packet_id,) = struct.unpack_from("!H", body, 0)
+            pos = _skip_props(body, 2) if v5 else 2
+            count = 0
+            while pos < len(body):
+                pattern, pos = _read_str(body, pos)
+                self.broker.unsubscribe(self, pattern)
+                count += 1
+            ack = struct.pack("!H", packet_id)
+            if v5:
+                ack += b"\x00" + bytes(count)
+            self.send(packet(UNSUBACK, 0, ack))
+        elif ptype == PINGREQ:
+            self.send(packet(PINGRESP, 0, b""))
+        elif ptype == DISCONNECT:
+            self.alive = False
+
+
+class LocalBroker:
+    """
+    Threaded localhost MQTT broker stand-in.
+
+    One accept thread plus one reader thread per client. Publishing fans out
+    synchronously on the publisher's reader thread.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self._server = None
+        self._sessions = set()
+        self._trie = TopicTrie()
+        self._retained = {}
+        self._lock = threading.Lock()
+        self.running = False
+        self.received = 0
+        self.delivered = 0
+
+    def start(self):
+        """Bind and start accepting — returns the bound port (useful with port=0)."""
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen(64)
+        self.port = self._server.getsockname()[1]
+        self.running = True
+        threading.Thread(target=self._accept_loop, name="local-broker", daemon=True).start()
+        return self.port
+
+    def stop(self):
+        self.running = False
+        if self._server:
+            try:
+                self._server.close()
+            except OSError:
+                pass
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.alive = False
+            try:
+                session.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                sock, addr = self._server.accept()
+            except OSError:
+                break
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            session = _Session(self, sock, addr)
+            with self._lock:
+                self._sessions.add(session)
+            threading.Thread(target=session.serve, name=f"broker-{addr[1]}", daemon=True).start()
+
+    def _drop(self, session):
+        with self._lock:
+            self._sessions.discard(session)
+            for pattern in session.patterns:
+                self._trie.remove(pattern, session)
+            session.patterns.clear()
+
+    def subscribe(self, session, pattern):
+        with self._lock:
+            session.patterns.add(pattern)
+            self._trie.add(pattern, session)
+            probe = TopicTrie()
+            probe.add(pattern, True)
+            retained = [(t, p) for t, p in self._retained.items() if probe.match(t)]
+        for topic, payload in retained:
+            session.publish(topic, payload, retain=True)
+            self.delivered += 1
+
+    def unsubscribe(self, session, pattern):
+        with self._lock:
+            session.patterns.discard(pattern)
+            self._trie.remove(pattern, session)
+
+    def route(self, topic, payload: bytes, retain=False):
+        """Deliver a publish to every matching subscriber (also usable in-process)."""
+        self.received += 1
+        with self._lock:
+            if retain:
+                if payload:
+                    self._retained[topic] = payload
+                else:
+                    self._retained.pop(topic, None)
+            targets = set(self._trie.match(topic))
+        for session in targets:
+            session.publish(topic, payload)
+        self.delivered += len(targets)
+
+    def client_count(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+if __name__ == "__main__":
+    broker = LocalBroker("0.0.0.0", int(sys.argv[1]) if len(sys.argv) > 1 else 1883)
+    print(f"Local MQTT broker stand-in listening on port {broker.start()} — Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"clients={broker.client_count()} received={broker.received} delivered={broker.delivered}")
+    except KeyboardInterrupt:
+        broker.stop()
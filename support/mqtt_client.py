@@ -5,8 +5,8 @@ Created on Thu Jan  1 16:04:05 2026
 # ================================
 # support/mqtt_client.py
 # ================================
-# File version: v1.0.1
-# Sync'd to dashboard release: v3.5.0-alpha
+# File version: v1.7.1
+# Sync'd to dashboard release: v3.10.0
 # Description: MqttLiveClient — robust, reconnecting MQTT client with signal-table pattern
 #
 # Features:
@@ -17,31 +17,88 @@ Created on Thu Jan  1 16:04:05 2026
 # ✅ Supports register_cb("message_received", callback)
 # ✅ Graceful stop and disconnect
 # ✅ Comprehensive LOG3 logging for connection and message events
+#
+# Feature Update: v1.1.0
+# ✅ Optional coalescing ingest — set_ingest_buffer() routes messages into a
+#    last-value-wins CoalescingBuffer instead of one queued signal per message
+# Feature Update: v1.2.0
+# ✅ Payloads decoded once in the MQTT thread (PayloadParser) — SIG_message_received
+#    now carries a typed MqttMessage record (topic, text, value, ts)
+# Feature Update: v1.3.0
+# ✅ Per-topic refcounts — update_subscriptions() sends one batched SUBSCRIBE /
+#    UNSUBSCRIBE on the live connection for topics whose count crosses zero
+# Feature Update: v1.4.0
+# ✅ Broker name / host / port are constructor arguments (one client per pool entry)
+# ✅ Throughput and reconnect statistics for the registration dump
+# Feature Update: v1.5.0
+# ✅ Optional RateLimiter applied in the MQTT thread before the GUI handoff
+# Feature Update: v1.6.0
+# ✅ MQTT5 persistent sessions (stable client_id, clean_start=False, session expiry)
+# ✅ Per-topic subscription QoS (0 / 1), re-SUBSCRIBE when a topic's QoS changes
+# ✅ Retained messages collected in a separate buffer; SIG_retained_pending fires once
+#    per burst so the dispatcher can paint them in a single update
+# Feature Update: v1.7.0
+# ✅ Ingest buffer may refuse a record (LaneBuffer status lane) — it is signalled at once
+# Feature Update: v1.7.1
+# ✅ A live record for a topic whose retained value is still pending replaces it in the
+#    retained buffer — the older retained value can no longer overwrite it a frame later
 # ================================
 """
 
+import socket
 import time
 import threading
 import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
+from paho.mqtt.subscribeoptions import SubscribeOptions
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from support.myLOG2 import LOG3
+from support.payload import PayloadParser
 
 
 class MqttLiveClient(QObject):
-    SIG_message_received = pyqtSignal(str, str)
+    SIG_message_received = pyqtSignal(object)  # MqttMessage
+    SIG_retained_pending = pyqtSignal()        # first retained message since the last drain
 
-    def __init__(self):
+    def __init__(self, name="default", host="rpibroker.local", port=1883,
+                 qos=0, session_expiry=0, client_id=""):
         super().__init__()
-        self.broker = "rpibroker.local"
-        self.port = 1883
+        self.name = name
+        self.broker = host
+        self.port = port
+        self.default_qos = qos
+        self.session_expiry = session_expiry  # seconds; > 0 keeps the session across reconnects
+        if not client_id and session_expiry:
+            client_id = f"dashboard-{socket.gethostname()}-{name}"
+        self.client_id = client_id
         self.client = None
         self.running = False
-        self.topics = set()
+        self.connected = False
+        self.topics = set()       # topics with refcount > 0
+        self.topic_refs = {}      # topic: number of bindings using it
+        self.topic_qos = {}       # topic: subscription QoS (default_qos when absent)
+        self.topic_lock = threading.Lock()
+        self.ingest_buffer = None  # CoalescingBuffer when coalescing mode is on
+        self.rate_limiter = None   # RateLimiter shared by the broker pool
+        self.retained_buffer = None  # CoalescingBuffer for the retained burst after SUBSCRIBE
+        self.parser = PayloadParser(name)  # used only from the MQTT thread
+
+        # Statistics — written by the MQTT thread, read by dump_registrations()
+        self.messages = 0
+        self.bytes = 0
+        self.connects = 0
+        self.failed_attempts = 0
+        self.retained = 0
+        self.session_resumed = False
+        self.started_at = None
+        self._rate_mark = (0.0, 0)  # (time, messages) at last stats_lines()
 
         self.signal_table = {
-            "message_received": self.SIG_message_received
+            "message_received": self.SIG_message_received,
+            "retained_pending": self.SIG_retained_pending
         }
 
     def register_cb(self, signal_name: str, callback):
@@ -51,19 +108,99 @@ class MqttLiveClient(QObject):
         LOG3(100 + 1, f"Warning: Unknown MQTT client signal '{signal_name}'")
         return False
 
+    def set_ingest_buffer(self, buffer):
+        """Route messages into an ingest buffer (None = emit per message); put() False = emit now."""
+        self.ingest_buffer = buffer
+
+    def set_retained_buffer(self, buffer):
+        """Collect retained messages separately so the startup burst lands as one batch."""
+        self.retained_buffer = buffer
+
+    def set_rate_limiter(self, limiter):
+        """Apply per-topic rate caps before messages leave the MQTT thread."""
+        self.rate_limiter = limiter
+
     def add_topic(self, topic: str):
-        """Add a topic to subscribe to on next connection."""
-        self.topics.add(topic)
+        """Take one reference on a topic (subscribes live if it is new)."""
+        self.update_subscriptions([topic], [])
+
+    def remove_topic(self, topic: str):
+        """Drop one reference on a topic (unsubscribes live at zero)."""
+        self.update_subscriptions([], [topic])
+
+    def update_subscriptions(self, acquire, release, qos=None):
+        """
+        Apply a refcount delta and sync the broker in at most two packets.
+
+        :param acquire: topics gaining a reference (repeats allowed)
+        :param release: topics losing a reference (repeats allowed)
+        :param qos: optional {topic: qos or None for the broker default}; changed topics are re-subscribed
+        :return: (subscribed, unsubscribed) topic lists
+        """
+        subscribed, unsubscribed = [], []
+        with self.topic_lock:
+            requalified = []
+            for topic, level in (qos or {}).items():
+                if level is None:
+                    level = self.default_qos
+                if self.topic_qos.get(topic, self.default_qos) != level:
+                    self.topic_qos[topic] = level
+                    if topic in self.topic_refs:
+                        requalified.append(topic)
+            for topic in acquire:
+                count = self.topic_refs.get(topic, 0)
+                self.topic_refs[topic] = count + 1
+                if count == 0:
+                    subscribed.append(topic)
+            for topic in release:
+                count = self.topic_refs.get(topic, 0)
+                if count <= 1:
+                    if self.topic_refs.pop(topic, None) is not None:
+                        unsubscribed.append(topic)
+                else:
+                    self.topic_refs[topic] = count - 1
+            # A topic released and re-acquired in the same delta needs no packets
+            both = set(subscribed) & set(unsubscribed)
+            subscribed = [t for t in subscribed if t not in both and t in self.topic_refs]
+            unsubscribed = [t for t in unsubscribed if t not in both]
+            for topic in unsubscribed:
+                self.topic_qos.pop(topic, None)
+            self.topics = set(self.topic_refs)
+            packet = self._subscription_list(
+                subscribed + [t for t in requalified if t in self.topic_refs and t not in subscribed]
+            )
+
+        client = self.client
+        if client is not None and self.connected:
+            if packet:
+                client.subscribe(packet)
+                LOG3(100 + 12, f"Subscribed live to {len(packet)} topic(s): {[t for t, _ in packet]}")
+            if unsubscribed:
+                client.unsubscribe(unsubscribed)
+                LOG3(100 + 13, f"Unsubscribed live from {len(unsubscribed)} topic(s): {unsubscribed}")
+        for topic in unsubscribed:
+            self.parser.forget(topic)
+        return subscribed, unsubscribed
+
+    def _subscription_list(self, topics):
+        """(topic, SubscribeOptions) pairs — retained values are always sent on SUBSCRIBE."""
+        return [
+            (topic, SubscribeOptions(qos=self.topic_qos.get(topic, self.default_qos), retainHandling=0))
+            for topic in topics
+        ]
 
     def start(self):
         if self.running:
             return
         self.running = True
-        LOG3(100 + 2, "Starting MQTT client thread")
-        threading.Thread(target=self._run, daemon=True).start()
+        self.started_at = time.monotonic()
+        self._rate_mark = (self.started_at, 0)
+        LOG3(100 + 2, f"Starting MQTT client thread for '{self.name}' ({self.broker}:{self.port})")
+        threading.Thread(target=self._run, name=f"mqtt-{self.name}", daemon=True).start()
 
     def stop(self):
         self.running = False
+        self.connected = False
         if self.client:
             self.client.loop_stop()
             self.client.disconnect()
@@ -72,33 +209,90 @@ class MqttLiveClient(QObject):
     def _run(self):
         def on_connect(client, userdata, flags, rc, properties=None):
             if rc == 0:
-                LOG3(100 + 10, f"MQTT Connected to {self.broker}")
-                for topic in self.topics:
-                    client.subscribe(topic)
-                    LOG3(100 + 12, f"Subscribed to {topic}")
+                self.session_resumed = bool(getattr(flags, "session_present", None) or
+                                            (isinstance(flags, dict) and flags.get("session present")))
+                LOG3(100 + 10, f"MQTT Connected to {self.broker}"
+                               f"{' (session resumed)' if self.session_resumed else ''}")
+                self.connects += 1
+                with self.topic_lock:
+                    self.connected = True
+                    packet = self._subscription_list(sorted(self.topics))
+                if packet:
+                    client.subscribe(packet)
+                    LOG3(100 + 12, f"Subscribed to {len(packet)} topic(s): {[t for t, _ in packet]}")
             else:
                 LOG3(100 + 11, f"MQTT connection failed: rc={rc}")
 
+        def on_disconnect(client, userdata, rc, properties=None):
+            self.connected = False
+            LOG3(100 + 14, f"MQTT disconnected: rc={rc}")
+
         def on_message(client, userdata, msg):
+            self.messages += 1
+            self.bytes += len(msg.payload)
             try:
-                payload = msg.payload.decode().strip()
-                if payload:
-                    LOG3(100 + 20, f"MQTT message: {msg.topic} -> {payload}")
-                    self.SIG_message_received.emit(msg.topic, payload)
+                record = self.parser.decode(msg.topic, msg.payload)
+                if record is not None and msg.retain and self.retained_buffer is not None:
+                    self.retained += 1
+                    if self.retained_buffer.put((self.name, msg.topic), record):
+                        self.SIG_retained_pending.emit()
+                    return
+                if (record is not None and self.retained_buffer is not None
+                        and self.retained_buffer.supersede((self.name, msg.topic), record)):
+                    return  # delivered with the retained burst, in place of the older retained value
+                limiter = self.rate_limiter
+                if record is not None and limiter is not None:
+                    record = limiter.offer((self.name, msg.topic), record)
+                if record is not None:
+                    buffer = self.ingest_buffer
+                    if buffer is None or not buffer.put((self.name, msg.topic), record):
+                        LOG3(100 + 20, f"MQTT message: {msg.topic} -> {record.text}")
+                        self.SIG_message_received.emit(record)
             except Exception as e:
                 LOG3(100 + 21, f"MQTT message error: {e}")
 
-        self.client = mqtt.Client(protocol=mqtt.MQTTv5)
+        self.client = mqtt.Client(client_id=self.client_id, protocol=mqtt.MQTTv5)
         self.client.on_connect = on_connect
         self.client.on_message = on_message
+        self.client.on_disconnect = on_disconnect
 
         retry_delay = 2
         while self.running:
             try:
-                self.client.connect(self.broker, self.port)
+                if self.session_expiry:
+                    props = Properties(PacketTypes.CONNECT)
+                    props.SessionExpiryInterval = int(self.session_expiry)
+                    self.client.connect(self.broker, self.port, clean_start=False, properties=props)
+                else:
+                    self.client.connect(self.broker, self.port)
                 self.client.loop_forever()
                 break
             except Exception as e:
+                self.failed_attempts += 1
                 LOG3(100 + 30, f"Connection attempt failed: {e}")
                 time.sleep(retry_delay)
-                retry_delay = min(retry_delay * 2, 30)
\ No newline at end of file
+                retry_delay = min(retry_delay * 2, 30)
+
+    @property
+    def reconnects(self):
+        return max(0, self.connects - 1)
+
+    def stats_lines(self):
+        """Throughput and reconnect counters for dump_registrations()."""
+        now = time.monotonic()
+        mark_time, mark_msgs = self._rate_mark
+        recent = (self.messages - mark_msgs) / (now - mark_time) if now > mark_time else 0.0
+        self._rate_mark = (now, self.messages)
+        uptime = now - self.started_at if self.started_at else 0.0
+        average = self.messages / uptime if uptime > 0 else 0.0
+        state = "connected" if self.connected else "disconnected"
+        return [
+            f"Broker '{self.name}' — {self.broker}:{self.port} ({state})",
+            f"  Topics: {len(self.topics)}",
+            f"  Messages: {self.messages} ({self.bytes} bytes)",
+            f"  Rate: {recent:.1f} msg/s since last dump, {average:.1f} msg/s average",
+            f"  Reconnects: {self.reconnects}, failed attempts: {self.failed_attempts}",
+            f"  Session: {'persistent ' + str(self.session_expiry) + ' s' if self.session_expiry else 'clean'}"
+            f"{', resumed' if self.session_resumed else ''}; default QoS {self.default_qos}",
+            f"  Retained messages received: {self.retained}",
+        ]
@@ -37,6 +37,8 @@ def fname2():            # callers function name
     return f"{c_bold_on}{inspect.stack()[2][3]:<28s}{c_bold_off}"
 
 def LOG3(n:int,f:str):
+    if not logging.getLogger().isEnabledFor(logging.INFO):
+        return      # skip the stack walk when INFO is disabled (benchmarks)
     s = f"{cize(n)} "
     s = f"{s}: " + f
     
@@ -0,0 +1,227 @@
+"""
+Created on Sun Oct 18 11:02:17 2026
+@author: kmac3
+# ================================
+# support/payload.py
+# ================================
+# File version: v1.0.3
+# Sync'd to dashboard release: v3.10.0
+# Description: MqttMessage record and typed payload decoding for the ingest path
+#
+# Features:
+# ✅ MqttMessage — compact (__slots__) record: topic, text, typed value, receive time
+# ✅ parse_payload() — bytes → int / float / bool / JSON / str, decoded once
+# ✅ PayloadParser — per-topic parse cache, identical republished payloads are not re-parsed
+# ✅ as_number() — shared numeric view used by tiles (bools are not numbers)
+#
+# Feature Update: v1.0.1
+# ✅ MqttMessage carries the broker name it arrived from
+# Feature Update: v1.0.2
+# ✅ compile_field_path() — "t" / "outdoor.temp" / "readings.0" compiled once per binding
+# ✅ MqttMessage.derive() — field record sharing topic / broker / receive time
+# Feature Update: v1.0.3
+# ✅ compile_decoder() — binding "decode": {"struct": "<hhf", "fields": [...]} / "msgpack" / "cbor"
+# ✅ PayloadParser.set_decoders() — binary topics decoded with a precompiled decoder
+# ================================
+"""
+
+import json
+import struct
+import time
+
+from support.topic_trie import TopicTrie, is_wildcard
+
+
+class MqttMessage:
+    """One decoded MQTT message, shared read-only by every sink on the channel."""
+    __slots__ = ("topic", "text", "value", "ts", "broker")
+
+    def __init__(self, topic, text, value, ts, broker="default"):
+        self.topic = topic
+        self.text = text      # stripped payload text (for display fallbacks)
+        self.value = value    # typed value: int, float, bool, dict/list or str
+        self.ts = ts          # receive time (time.time())
+        self.broker = broker  # broker pool name
+
+    def __repr__(self):
+        return f"MqttMessage({self.topic!r}, {self.value!r})"
+
+    def derive(self, value):
+        """Record for a value extracted from this message (e.g. one JSON field)."""
+        text = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+        return MqttMessage(self.topic, text, value, self.ts, self.broker)
+
+
+_BOOL_WORDS = {"true": True, "false": False, "on": True, "off": False}
+
+
+def parse_payload(text: str):
+    """Decode stripped payload text into the most specific Python type."""
+    first = text[0]
+    if first in "{[":
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+    if first.isdigit() or first in "+-.":
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return float(text)
+        except ValueError:
+            return text
+    lowered = text.lower()
+    if lowered in _BOOL_WORDS:
+        return _BOOL_WORDS[lowered]
+    if lowered in ("nan", "inf", "-inf", "infinity"):
+        return float(lowered)
+    return text
+
+
+def compile_decoder(spec):
+    """
+    Compile a binding "decode" spec into a callable: raw bytes -> value.
+
+    {"struct": "<hhf", "fields": ["t", "h", "p"]} → dict of named fields
+    {"struct": "<fff"}                            → list (paths "0", "1", ...)
+    "msgpack" / "cbor"                            → decoded object (optional packages)
+    Raises ValueError for unknown specs or missing packages.
+    """
+    if isinstance(spec, str):
+        spec = {"format": spec}
+    if "struct" in spec:
+        packer = struct.Struct(spec["struct"])
+        fields = spec.get("fields")
+        unpack = packer.unpack
+        if fields:
+            fields = tuple(fields)
+            if len(fields) != len(unpack(bytes(packer.size))):
+                raise ValueError(f"struct '{spec['struct']}' does not have {len(fields)} fields")
+            return lambda raw: dict(zip(fields, unpack(raw)))
+        return lambda raw: list(unpack(raw))
+
+    fmt = spec.get("format")
+    if fmt == "msgpack":
+        try:
+            import msgpack
+        except ImportError:
+            raise ValueError("decode 'msgpack' needs the msgpack package (pip install msgpack)")
+        return lambda raw: msgpack.unpackb(raw, raw=False)
+    if fmt == "cbor":
+        try:
+            import cbor2
+        except ImportError:
+            raise ValueError("decode 'cbor' needs the cbor2 package (pip install cbor2)")
+        return cbor2.loads
+    raise ValueError(f"Unknown payload decode spec: {spec!r}")
+
+
+class PayloadParser:
+    """
+    Decodes raw MQTT payloads into MqttMessage records in the network thread.
+
+    Keeps the last (raw bytes, value) per topic so sensors that republish the
+    same reading skip decoding entirely. Only touched from the MQTT thread,
+    except set_decoders() which swaps the decoder table in one assignment.
+    """
+
+    def __init__(self, broker="default"):
+        self.broker = broker
+        self._last = {}  # topic: (raw_bytes, text, value)
+        self._decoders = None  # ({topic: decoder}, TopicTrie of pattern → decoder, {topic: resolved})
+        self.parsed = 0
+        self.cache_hits = 0
+        self.binary = 0
+        self.errors = 0
+
+    def set_decoders(self, decoders):
+        """Replace binary decoders — {topic_or_pattern: callable(raw) -> value}."""
+        exact = {}
+        patterns = TopicTrie()
+        for topic, decoder in decoders.items():
+            if is_wildcard(topic):
+                patterns.add(topic, decoder)
+            else:
+                exact[topic] = decoder
+        self._decoders = (exact, patterns, {}) if decoders else None
+        self._last = {}
+
+    def _decoder_for(self, topic):
+        exact, patterns, resolved = self._decoders
+        try:
+            return resolved[topic]
+        except KeyError:
+            decoder = exact.get(topic)
+            if decoder is None and len(patterns):
+                matches = patterns.match(topic)
+                decoder = matches[0] if matches else None
+            resolved[topic] = decoder
+            return decoder
+
+    def decode(self, topic, raw: bytes):
+        """Return an MqttMessage, or None for empty / undecodable payloads."""
+        last = self._last.get(topic)
+        if last is not None and last[0] == raw:
+            self.cache_hits += 1
+            return MqttMessage(topic, last[1], last[2], time.time(), self.broker)
+        if not raw:
+            return None
+
+        decoder = self._decoder_for(topic) if self._decoders else None
+        if decoder is not None:
+            try:
+                value = decoder(raw)
+            except Exception:
+                self.errors += 1
+                return None
+            self.binary += 1
+            text = f"<{len(raw)} bytes>"
+            self._last[topic] = (raw, text, value)
+            return MqttMessage(topic, text, value, time.time(), self.broker)
+
+        text = raw.decode().strip()
+        if not text:
+            return None
+        value = parse_payload(text)
+        self.parsed += 1
+        self._last[topic] = (raw, text, value)
+        return MqttMessage(topic, text, value, time.time(), self.broker)
+
+    def forget(self, topic):
+        self._last.pop(topic, None)
+
+
+def compile_field_path(path):
+    """
+    Compile a binding "path" into an extractor: value -> field.
+
+    Dotted strings ("outdoor.temp", "readings.0") or lists (["outdoor", "temp"]);
+    integer steps index into lists. Raises KeyError / IndexError / TypeError on miss.
+    """
+    parts = path if isinstance(path, (list, tuple)) else str(path).split(".")
+    steps = tuple(
+        int(p) if isinstance(p, str) and p.lstrip("-").isdigit() else p
+        for p in parts
+    )
+    if len(steps) == 1:
+        (only,) = steps
+        return lambda value: value[only]
+
+    def extract(value):
+        for step in steps:
+            value = value[step]
+        return value
+    return extract
+
+
+def as_number(value):
+    """Float view of a channel value, or None when it is not numeric."""
+    if isinstance(value, MqttMessage):
+        value = value.value
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
@@ -5,14 +5,19 @@ Created on Thu Jan  3 16:04:05 2026
 # ================================
 # support/preferences.py
 # ================================
-# File version: v1.0.0
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.0.2
+# Sync'd to dashboard release: v3.10.0
 # Description: Simple persistent preferences storage (JSON file)
 #
 # Features:
 # ✅ Loads and saves user preferences (e.g., auto_reload_no_prompt)
 # ✅ Defaults to safe values if file missing or invalid
 # ✅ Minimal, self-contained
+#
+# Feature Update: v1.0.1
+# ✅ mqtt_coalesce_hz — GUI drain rate for coalescing MQTT ingest (0 = off)
+# Feature Update: v1.0.2
+# ✅ mqtt_brokers — named broker pool ({name: {host, port}}), "default" used by unqualified bindings
 # ================================
 """
 
@@ -23,7 +28,11 @@ from pathlib import Path
 PREF_FILE = "preferences.json"
 
 DEFAULT_PREFS = {
-    "auto_reload_no_prompt": False
+    "auto_reload_no_prompt": False,
+    "mqtt_coalesce_hz": 0,  # 0 = deliver every message; 20–60 = drain per frame
+    "mqtt_brokers": {
+        "default": {"host": "rpibroker.local", "port": 1883}
+    }
 }
 
 def load_prefs():
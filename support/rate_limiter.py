@@ -0,0 +1,207 @@
+"""
+Created on Sun Oct 18 15:10:09 2026
+@author: kmac3
+# ================================
+# support/rate_limiter.py
+# ================================
+# File version: v1.0.0
+# Sync'd to dashboard release: v3.10.0
+# Description: Rate caps and backpressure policies for the MQTT ingest path
+#
+# Features:
+# ✅ parse_rate_limit() — binding "rate_limit": {"max_hz", "policy", "burst"} (or a bare number)
+# ✅ Policies: keep_latest / drop_oldest (bounded FIFO of "burst") / average (mean per window)
+# ✅ RateLimiter — per-topic caps applied in the MQTT thread, wildcard rules via TopicTrie
+# ✅ BindingThrottle — per-binding cap on the GUI side for bindings stricter than their topic
+# ✅ Held values released on the dispatcher frame tick; dropped / merged counters for the dump
+# ================================
+"""
+
+import threading
+import time
+from collections import deque
+
+from support.payload import MqttMessage, as_number
+from support.topic_trie import TopicTrie, is_wildcard
+
+POLICIES = ("keep_latest", "drop_oldest", "average")
+
+
+def parse_rate_limit(spec):
+    """Normalise a binding's "rate_limit" into (max_hz, policy, burst), or None."""
+    if spec is None:
+        return None
+    if isinstance(spec, (int, float)):
+        spec = {"max_hz": spec}
+    max_hz = float(spec.get("max_hz", 0))
+    if max_hz <= 0:
+        return None
+    policy = spec.get("policy", "keep_latest")
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown rate_limit policy '{policy}' (expected one of {POLICIES})")
+    return max_hz, policy, max(1, int(spec.get("burst", 1)))
+
+
+class _Window:
+    """Rate state for one topic or binding."""
+    __slots__ = ("rule", "interval", "policy", "pending", "total", "count",
+                 "last_emit", "passed", "dropped", "merged")
+
+    def __init__(self, max_hz, policy, burst):
+        self.rule = (max_hz, policy, burst)
+        self.interval = 1.0 / max_hz
+        self.policy = policy
+        self.pending = deque(maxlen=burst if policy == "drop_oldest" else 1)
+        self.total = 0.0
+        self.count = 0
+        self.last_emit = float("-inf")
+        self.passed = 0
+        self.dropped = 0   # values discarded (overwritten / pushed out)
+        self.merged = 0    # values folded into an average
+
+    def offer(self, msg, now):
+        """Return msg if it may pass now, else hold it per policy and return None."""
+        if not self.pending and now - self.last_emit >= self.interval:
+            self.last_emit = now
+            self.passed += 1
+            return msg
+        if self.policy == "average":
+            number = as_number(msg)
+            if number is not None:
+                if self.pending:
+                    self.merged += 1
+                self.total += number
+                self.count += 1
+                self.pending.append(msg)
+                return None
+            self.total = 0.0   # non-numeric value replaces the running average
+            self.count = 0
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(msg)
+        return None
+
+    def release(self, now):
+        """Return the next held value if the window has elapsed, else None."""
+        if not self.pending or now - self.last_emit < self.interval:
+            return None
+        self.last_emit = now
+        self.passed += 1
+        msg = self.pending.popleft()
+        if self.policy == "average" and self.count > 1:
+            mean = self.total / self.count
+            if isinstance(msg, MqttMessage):
+                msg = MqttMessage(msg.topic, f"{mean:g}", mean, msg.ts, msg.broker)
+            else:
+                msg = mean
+        self.total = 0.0
+        self.count = 0
+        return msg
+
+    def stats(self):
+        return f"{self.passed} passed, {self.dropped} dropped, {self.merged} averaged, {len(self.pending)} held"
+
+
+class RateLimiter:
+    """
+    Per-topic caps keyed by (broker, topic). offer() runs in the MQTT threads,
+    release_due() on the GUI frame tick; both share one lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rules = {}        # (broker, topic_or_pattern): (max_hz, policy, burst)
+        self._wildcards = {}    # broker: TopicTrie of pattern → rule key
+        self._windows = {}      # (broker, topic): _Window, or None when unlimited
+
+    def __bool__(self):
+        return bool(self._rules)
+
+    def configure(self, rules):
+        """Replace all rules — {(broker, topic_or_pattern): (max_hz, policy, burst)}."""
+        with self._lock:
+            self._rules = dict(rules)
+            self._wildcards = {}
+            for (broker, topic) in self._rules:
+                if is_wildcard(topic):
+                    self._wildcards.setdefault(broker, TopicTrie()).add(topic, (broker, topic))
+            # Keep state of unchanged rules so counters survive a reload
+            old = self._windows
+            self._windows = {}
+            for key, window in old.items():
+                rule = self._lookup(key)
+                if window is not None and window.rule == rule:
+                    self._windows[key] = window
+
+    def rule_for(self, broker, topic):
+        with self._lock:
+            return self._rules.get((broker, topic))
+
+    def _lookup(self, key):
+        rule = self._rules.get(key)
+        if rule is None:
+            trie = self._wildcards.get(key[0])
+            if trie:
+                matches = trie.match(key[1])
+                if matches:
+                    rule = max((self._rules[m] for m in matches), key=lambda r: r[0])
+        return rule
+
+    def offer(self, key, msg, now=None):
+        if not self._rules:
+            return msg
+        with self._lock:
+            try:
+                window = self._windows[key]
+            except KeyError:
+                rule = self._lookup(key)
+                window = self._windows[key] = _Window(*rule) if rule else None
+            if window is None:
+                return msg
+            return window.offer(msg, time.monotonic() if now is None else now)
+
+    def release_due(self, now=None):
+        """Held values whose window has elapsed — called from the GUI frame tick."""
+        now = time.monotonic() if now is None else now
+        released = []
+        with self._lock:
+            for window in self._windows.values():
+                if window is not None and window.pending:
+                    msg = window.release(now)
+                    if msg is not None:
+                        released.append(msg)
+        return released
+
+    def stats_lines(self):
+        with self._lock:
+            items = [(k, w) for k, w in self._windows.items() if w is not None]
+        lines = []
+        for (broker, topic), window in sorted(items, key=lambda kv: -kv[1].dropped)[:20]:
+            label = topic if broker == "default" else f"{broker} {topic}"
+            lines.append(f"    {label}: {window.stats()}")
+        return lines
+
+
+class BindingThrottle:
+    """GUI-side cap for one binding's callback (used when it is stricter than its topic)."""
+
+    def __init__(self, key, callback, rule):
+        self.key = key
+        self.callback = callback
+        self.rule = rule
+        self.window = _Window(*rule)
+        self.active = True
+
+    def __call__(self, value):
+        if not self.active:
+            self.callback(value)
+            return
+        value = self.window.offer(value, time.monotonic())
+        if value is not None:
+            self.callback(value)
+
+    def flush(self, now):
+        if self.window.pending:
+            value = self.window.release(now)
+            if value is not None:
+                self.callback(value)
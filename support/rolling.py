@@ -0,0 +1,254 @@
+"""
+Created on Mon Oct 19 03:04:19 2026
+@author: kmac3
+# ================================
+# support/rolling.py
+# ================================
+# File version: v1.0.1
+# Sync'd to dashboard release: v3.10.0
+# Description: Stat channels — rolling-window and since-midnight statistics of a channel
+#
+# Features:
+# ✅ Stat channel key = source key + "~<stat>@<window>" — "mqtt:outdoor/temp~max@today",
+#    "mqtt:env|t~mean@5m", "system:cpu~stddev@1h"; bindings add "stat" / "window" instead
+# ✅ Stats: min, max, mean, stddev (population), count
+# ✅ Rolling windows ("90s", "1m", "5m", "1h", "1d") — O(1) amortised per sample: monotonic
+#    deques for min / max, running sums for mean / stddev (re-summed from the window once
+#    per window length of evictions, so float drift cannot build up)
+# ✅ "today" — since local midnight, running min / max / Welford mean; resets at midnight
+# ✅ StatGroup — every stat channel of one source channel; windows shared between stats,
+#    only stats whose value changed are reported
+# Feature Update: v1.0.1
+# ✅ Empty windows are reported too — count drops to 0, the other stats become EMPTY ("—")
+#    when a quiet source's samples age out or "today" resets at midnight
+# ================================
+"""
+
+import math
+import re
+from collections import deque
+from datetime import datetime, timedelta
+
+from support.payload import as_number
+
+STATS = ("min", "max", "mean", "stddev", "count")
+EMPTY = "—"  # shown for a stat whose window holds no samples
+TODAY = "today"
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_SPEC = re.compile(r"^(?P<stat>[a-z]+)@(?P<window>today|\d+(?:\.\d+)?[smhd])$")
+
+
+def parse_window(window):
+    """Window spec → seconds, or TODAY."""
+    if window == TODAY:
+        return TODAY
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhd])", str(window))
+    if not match or float(match.group(1)) <= 0:
+        raise ValueError(f"Bad stat window '{window}' (expected e.g. '90s', '5m', '1h' or 'today')")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def parse_stat(binding):
+    """(stat, window spec) for a binding's "stat" / "window" options, or None without "stat"."""
+    stat = binding.get("stat")
+    if stat is None:
+        return None
+    window = str(binding.get("window", "1m"))
+    if stat not in STATS:
+        raise ValueError(f"Unknown stat '{stat}' (expected one of {STATS})")
+    parse_window(window)
+    return stat, window
+
+
+def stat_suffix(binding):
+    """Channel key suffix for a binding's stat ("" without one — or with an invalid one,
+    which MqttSource reports when the layout is bound)."""
+    try:
+        stat = parse_stat(binding)
+    except ValueError:
+        return ""
+    return f"~{stat[0]}@{stat[1]}" if stat else ""
+
+
+def parse_stat_key(key):
+    """(source key, stat, window spec) for a stat channel key, else None."""
+    base, sep, spec = key.rpartition("~")
+    match = sep and _SPEC.match(spec)
+    if not match or match.group("stat") not in STATS:
+        return None
+    return base, match.group("stat"), match.group("window")
+
+
+class RollingWindow:
+    """Samples of the last `seconds` — min / max / mean / stddev / count in O(1) amortised."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.samples = deque()  # (t, x), oldest first
+        self.highs = deque()  # (t, x), x strictly decreasing — front is the max
+        self.lows = deque()  # (t, x), x strictly increasing — front is the min
+        self.ref = 0.0  # sums are of x - ref (keeps the variance term well conditioned)
+        self.s1 = self.s2 = 0.0
+        self.evicted = 0
+
+    def since(self, now):
+        return now - self.seconds
+
+    def push(self, t, x):
+        highs, lows = self.highs, self.lows
+        while highs and highs[-1][1] <= x:
+            highs.pop()
+        highs.append((t, x))
+        while lows and lows[-1][1] >= x:
+            lows.pop()
+        lows.append((t, x))
+        if not self.samples:
+            self.ref, self.s1, self.s2 = x, 0.0, 0.0
+        self.samples.append((t, x))
+        d = x - self.ref
+        self.s1 += d
+        self.s2 += d * d
+        self.expire(t)
+
+    def expire(self, now):
+        cutoff = now - self.seconds
+        samples = self.samples
+        if not samples or samples[0][0] > cutoff:
+            return
+        ref = self.ref
+        while samples and samples[0][0] <= cutoff:
+            d = samples.popleft()[1] - ref
+            self.s1 -= d
+            self.s2 -= d * d
+            self.evicted += 1
+        while self.highs and self.highs[0][0] <= cutoff:
+            self.highs.popleft()
+        while self.lows and self.lows[0][0] <= cutoff:
+            self.lows.popleft()
+        if self.evicted >= len(samples):  # amortised O(1): one re-sum per window length of evictions
+            self._resum()
+
+    def _resum(self):
+        self.evicted = 0
+        self.ref = self.samples[0][1] if self.samples else 0.0
+        self.s1 = sum(x - self.ref for _, x in self.samples)
+        self.s2 = sum((x - self.ref) ** 2 for _, x in self.samples)
+
+    def value(self, stat):
+        """Current stat — count is 0 and every other stat None while the window is empty."""
+        n = len(self.samples)
+        if not n:
+            return 0 if stat == "count" else None
+        if stat == "min":
+            return self.lows[0][1]
+        if stat == "max":
+            return self.highs[0][1]
+        if stat == "count":
+            return n
+        mean = self.s1 / n
+        if stat == "mean":
+            return self.ref + mean
+        return math.sqrt(max(0.0, self.s2 / n - mean * mean))
+
+
+class DailyWindow:
+    """Samples since local midnight — running min / max / count and Welford mean / stddev."""
+
+    def __init__(self):
+        self.reset_at = 0.0
+        self.n = 0
+
+    def since(self, now):
+        return datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+    def _reset(self, t):
+        midnight = datetime.fromtimestamp(t).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.reset_at = (midnight + timedelta(days=1)).timestamp()
+        self.n = 0
+        self.low = self.high = self.mean = self.m2 = 0.0
+
+    def push(self, t, x):
+        if t >= self.reset_at:
+            self._reset(t)
+        if not self.n:
+            self.low = self.high = x
+        elif x < self.low:
+            self.low = x
+        elif x > self.high:
+            self.high = x
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def expire(self, now):
+        if now >= self.reset_at and self.n:
+            self._reset(now)
+
+    def value(self, stat):
+        if not self.n:
+            return 0 if stat == "count" else None
+        if stat == "min":
+            return self.low
+        if stat == "max":
+            return self.high
+        if stat == "count":
+            return self.n
+        if stat == "mean":
+            return self.mean
+        return math.sqrt(self.m2 / self.n)
+
+
+class StatGroup:
+    """Stat channels derived from one source channel (GUI thread only)."""
+
+    def __init__(self):
+        self.windows = {}  # window spec: RollingWindow / DailyWindow
+        self.outputs = []  # [window spec, stat, stat cid, last reported value]
+
+    def __len__(self):
+        return len(self.outputs)
+
+    def add(self, window, stat, cid):
+        """Attach a stat channel; returns the window if it is new (empty — the caller may seed it)."""
+        if any(out[2] == cid for out in self.outputs):
+            return None
+        created = None
+        if window not in self.windows:
+            seconds = parse_window(window)
+            created = self.windows[window] = DailyWindow() if seconds == TODAY else RollingWindow(seconds)
+        self.outputs.append([window, stat, cid, None])
+        return created
+
+    def remove(self, cid):
+        self.outputs = [out for out in self.outputs if out[2] != cid]
+        used = {out[0] for out in self.outputs}
+        self.windows = {spec: w for spec, w in self.windows.items() if spec in used}
+
+    def push(self, t, value):
+        """New source value — [(stat cid, value)] for every stat that changed."""
+        x = as_number(value)
+        if x is None:
+            return ()
+        for window in self.windows.values():
+            window.push(t, x)
+        return self.changes()
+
+    def expire(self, now):
+        """Age the windows without a new value (samples leave, midnight passes)."""
+        for window in self.windows.values():
+            window.expire(now)
+        return self.changes()
+
+    def changes(self):
+        """
+        [(stat cid, value)] for stats whose value differs from the last one reported —
+        value None when the window has emptied since (never for a stat not yet reported).
+        """
+        changes = []
+        for out in self.outputs:
+            value = self.windows[out[0]].value(out[1])
+            if value != out[3]:
+                out[3] = value
+                changes.append((out[2], value))
+        return changes
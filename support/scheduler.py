@@ -0,0 +1,198 @@
+"""
+Created on Sun Oct 18 19:48:05 2026
+@author: kmac3
+# ================================
+# support/scheduler.py
+# ================================
+# File version: v1.0.0
+# Sync'd to dashboard release: v3.10.0
+# Description: TimingWheel — one GUI-thread timer for every periodic and delayed job
+#
+# Features:
+# ✅ Hashed timing wheel (default 100 ms ticks × 512 slots); jobs beyond one revolution wait in place
+# ✅ Single-shot QTimer armed only for the next occupied tick — idle ticks cost no wakeup
+# ✅ Periodic jobs aligned to multiples of their period, so 1 s / 5 s / 15 min jobs share wakeups
+# ✅ Optional jitter (seconds, re-rolled each run) to spread jobs that should not coincide
+# ✅ Optional per-job budget (ms) — overruns counted and logged
+# ✅ Missed runs after a stall are skipped, not replayed
+# ✅ stats_lines() — wakeups/second and per-job runs / overruns / worst case
+# ================================
+"""
+
+import math
+import random
+import time
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+from support.myLOG2 import LOG3
+
+
+class ScheduledJob:
+    """Handle for one scheduled callback — release() (or cancel()) stops it."""
+    __slots__ = ("name", "callback", "period", "jitter", "budget_ms", "base", "due", "active",
+                 "runs", "overruns", "max_ms", "_wheel")
+
+    def __init__(self, wheel, name, callback, period, jitter, budget_ms):
+        self.name = name
+        self.callback = callback
+        self.period = period        # ticks between runs (0 = one-shot)
+        self.jitter = jitter        # max extra ticks per run
+        self.budget_ms = budget_ms
+        self.base = 0               # aligned tick before jitter
+        self.due = 0                # tick the job is filed under
+        self.active = True
+        self.runs = 0
+        self.overruns = 0
+        self.max_ms = 0.0
+        self._wheel = wheel
+
+    def release(self):
+        if self.active:
+            self._wheel.cancel(self)
+
+    cancel = release
+
+    def __repr__(self):
+        return f"ScheduledJob({self.name!r}, every {self.period} ticks)"
+
+
+class TimingWheel(QObject):
+    def __init__(self, tick_ms=100, slots=512):
+        super().__init__()
+        self.tick = tick_ms / 1000.0
+        self.slots = [[] for _ in range(slots)]
+        self.origin = time.monotonic()
+        self.current = 0            # last tick processed
+        self.jobs = set()
+        self.wakeups = 0
+        self.rng = random.Random()
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)  # coarse timers may fire early → extra wakeup
+        self.timer.timeout.connect(self._on_timer)
+
+    def _now_tick(self):
+        return int((time.monotonic() - self.origin) / self.tick + 1e-3)
+
+    def _ticks(self, seconds):
+        return max(1, math.ceil(seconds / self.tick - 1e-9))
+
+    def schedule(self, name, interval, callback, jitter=0.0, budget_ms=None, run_now=False):
+        """
+        Run callback every interval seconds, first at the next multiple of interval
+        (shared boundary). run_now=True also calls it immediately.
+        """
+        job = ScheduledJob(self, name, callback, self._ticks(interval),
+                           int(jitter / self.tick) if jitter else 0, budget_ms)
+        self.jobs.add(job)
+        if run_now:
+            self._run(job)
+        if job.active:
+            self._file(job, self._next_boundary(job.period, self._now_tick()))
+            self._arm()
+        return job
+
+    def call_later(self, name, delay, callback, budget_ms=None):
+        """Run callback once, delay seconds from now (rounded up to a tick)."""
+        job = ScheduledJob(self, name, callback, 0, 0, budget_ms)
+        self.jobs.add(job)
+        self._file(job, self._now_tick() + self._ticks(delay))
+        self._arm()
+        return job
+
+    def cancel(self, job):
+        job.active = False
+        self.jobs.discard(job)
+        slot = self.slots[job.due % len(self.slots)]
+        if job in slot:
+            slot.remove(job)
+        self._arm()
+
+    def stop(self):
+        self.timer.stop()
+
+    @staticmethod
+    def _next_boundary(period, now):
+        """First multiple of period after now — shared by every job with that period."""
+        return (now // period + 1) * period
+
+    def _file(self, job, base):
+        job.base = base
+        job.due = max(base + (self.rng.randint(0, job.jitter) if job.jitter else 0), self.current + 1)
+        self.slots[job.due % len(self.slots)].append(job)
+
+    def _next_due(self):
+        n = len(self.slots)
+        for i in range(1, n + 1):
+            t = self.current + i
+            for job in self.slots[t % n]:
+                if job.due == t:
+                    return t
+        return min((job.due for job in self.jobs), default=None)
+
+    def _arm(self):
+        """Point the single timer at the next occupied tick (or stop it)."""
+        due = self._next_due()
+        if due is None:
+            self.timer.stop()
+            return
+        delay = self.origin + due * self.tick - time.monotonic()
+        self.timer.start(max(0, math.ceil(delay * 1000)))
+
+    def _on_timer(self):
+        self.wakeups += 1
+        now = self._now_tick()
+        n = len(self.slots)
+        ready = []
+        for i in range(1, min(now - self.current, n) + 1):
+            slot = self.slots[(self.current + i) % n]
+            if slot:
+                keep = [job for job in slot if job.due > now]
+                if len(keep) != len(slot):
+                    ready.extend(job for job in slot if job.due <= now)
+                    slot[:] = keep
+        self.current = max(self.current, now)
+
+        ready.sort(key=lambda job: job.due)
+        for job in ready:
+            if not job.active:
+                continue
+            self._run(job)
+            if job.active and job.period:
+                base = job.base + job.period
+                if base <= now:  # stalled past one or more runs — skip to the next boundary
+                    base = self._next_boundary(job.period, now)
+                self._file(job, base)
+            elif job.active:
+                job.active = False
+                self.jobs.discard(job)
+        self._arm()
+
+    def _run(self, job):
+        t0 = time.perf_counter()
+        try:
+            job.callback()
+        except Exception as e:
+            LOG3(100 + 61, f"Scheduled job '{job.name}' failed: {e}")
+        elapsed = (time.perf_counter() - t0) * 1000
+        job.runs += 1
+        job.max_ms = max(job.max_ms, elapsed)
+        if job.budget_ms is not None and elapsed > job.budget_ms:
+            job.overruns += 1
+            if job.overruns == 1 or job.overruns % 10 == 0:
+                LOG3(100 + 62, f"Job '{job.name}' took {elapsed:.1f} ms (budget {job.budget_ms} ms, "
+                               f"{job.overruns} overruns)")
+
+    def wakeups_per_second(self):
+        elapsed = time.monotonic() - self.origin
+        return self.wakeups / elapsed if elapsed > 0 else 0.0
+
+    def stats_lines(self):
+        lines = [f"Scheduler: {len(self.jobs)} job(s), tick {self.tick * 1000:.0f} ms, "
+                 f"{self.wakeups} wakeups ({self.wakeups_per_second():.2f}/s)"]
+        for job in sorted(self.jobs, key=lambda j: j.name):
+            every = f"every {job.period * self.tick:g}s" if job.period else "once"
+            budget = f", {job.overruns} over {job.budget_ms} ms" if job.budget_ms is not None else ""
+            lines.append(f"  {job.name}: {every}, {job.runs} runs, worst {job.max_ms:.1f} ms{budget}")
+        return lines
@@ -0,0 +1,79 @@
+"""
+Created on Sun Oct 18 17:40:12 2026
+@author: kmac3
+# ================================
+# support/subscription.py
+# ================================
+# File version: v1.0.2
+# Sync'd to dashboard release: v3.10.0
+# Description: Subscription — handle returned by DataDispatcher.register_cb()
+#
+# Features:
+# ✅ release() detaches the callback (idempotent); the dispatcher drops empty channels
+# ✅ Owned handles: the dispatcher keeps only a weakref, the owner (a tile) keeps the
+#    handle — when the owner goes away the sink is pruned on the next emit
+# ✅ Unowned handles are held by the dispatcher until released
+# Feature Update: v1.0.1
+# ✅ Carries its channel ID and sink slot so release() is a direct table update
+# Feature Update: v1.0.2
+# ✅ FrameBatch — collects a tile's channel updates and hands them over once per frame
+# ================================
+"""
+
+from support.myLOG2 import LOG3
+
+
+class Subscription:
+    """One callback on one dispatcher channel."""
+    __slots__ = ("key", "channel", "sink", "callback", "active", "_dispatcher", "__weakref__")
+
+    def __init__(self, dispatcher, key, callback, channel=None, sink=None):
+        self.key = key
+        self.channel = channel  # dispatcher channel ID
+        self.sink = sink        # slot in the channel's sink table
+        self.callback = callback
+        self.active = True
+        self._dispatcher = dispatcher
+
+    def release(self):
+        """Detach from the dispatcher — safe to call more than once."""
+        if self.active:
+            self.active = False
+            self._dispatcher.release(self)
+
+    def __repr__(self):
+        state = "active" if self.active else "released"
+        return f"Subscription({self.key!r}, {self.callback!r}, {state})"
+
+
+class FrameBatch:
+    """
+    Pending {channel_key: value} for one batch consumer (see DataDispatcher.register_batch).
+    The first put() in a frame tells the dispatcher; flush() runs on the frame tick.
+    """
+    __slots__ = ("on_batch", "pending", "_notify")
+
+    def __init__(self, on_batch, notify):
+        self.on_batch = on_batch
+        self.pending = {}
+        self._notify = notify
+
+    def put(self, key, value):
+        if not self.pending:
+            self._notify(self)
+        self.pending[key] = value  # newest value per channel wins within a frame
+
+    def flush(self):
+        values, self.pending = self.pending, {}
+        if values:
+            try:
+                self.on_batch(values)
+            except Exception as e:
+                LOG3(200 + 6, f"Batch callback error ({', '.join(values)}): {e}")
+
+
+def release_all(subscriptions):
+    """Release every handle in a list and empty it."""
+    for sub in subscriptions:
+        sub.release()
+    subscriptions.clear()
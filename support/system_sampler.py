@@ -0,0 +1,100 @@
+"""
+Created on Sun Oct 18 19:02:36 2026
+@author: kmac3
+# ================================
+# support/system_sampler.py
+# ================================
+# File version: v1.0.1
+# Sync'd to dashboard release: v3.10.0
+# Description: SystemSampler — one background thread for every system_prop binding
+#
+# Features:
+# ✅ Replaces one SystemPropertySource + QTimer per binding
+# ✅ Jobs de-duplicated by prop (fastest requested interval wins); interval 0 = sample once
+# ✅ Getters must not block — cpu_load uses psutil's since-last-call form (primed once)
+# ✅ Results posted to the GUI thread as one SIG_samples({prop: value}) per pass
+# Feature Update: v1.0.1
+# ✅ Scheduling moved to the dispatcher's TimingWheel — sample(props) requests a pass;
+#    requests arriving before the thread wakes are merged into that pass
+# ================================
+"""
+
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from support.myLOG2 import LOG3
+
+
+class SystemSampler(QObject):
+    SIG_samples = pyqtSignal(object)  # {prop: formatted value}
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._getters = {}  # prop: getter
+        self._pending = set()  # props requested since the last pass
+        self._thread = None
+        self.running = False
+        self.requests = 0
+        self.passes = 0
+        self.samples = 0
+        self.errors = 0
+
+    def configure(self, getters):
+        """Replace the sampled set — {prop: getter}."""
+        with self._lock:
+            self._getters = dict(getters)
+            self._pending &= set(self._getters)
+        if getters and not self.running:
+            self.start()
+        LOG3(100 + 50, f"System sampler: {len(getters)} prop(s) — {', '.join(getters)}")
+
+    def sample(self, props):
+        """Request one sample of props — called by the scheduler; never blocks."""
+        with self._lock:
+            self._pending.update(p for p in props if p in self._getters)
+        self.requests += 1
+        self._wake.set()
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="system-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        while self.running:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                due = [(p, self._getters[p]) for p in self._pending]
+                self._pending = set()
+            if not due:
+                continue
+            values = {}
+            for prop, getter in due:
+                try:
+                    values[prop] = getter()
+                except Exception as e:
+                    self.errors += 1
+                    LOG3(100 + 51, f"System property '{prop}' failed: {e}")
+            self.passes += 1
+            self.samples += len(values)
+            if values:
+                self.SIG_samples.emit(values)
+
+    def stats_lines(self):
+        with self._lock:
+            props = ", ".join(self._getters)
+        return [
+            f"System sampler: {props or 'idle'}",
+            f"  Requests: {self.requests}, passes: {self.passes}, samples: {self.samples}, errors: {self.errors}",
+        ]
@@ -0,0 +1,131 @@
+"""
+Created on Sun Oct 18 11:48:05 2026
+@author: kmac3
+# ================================
+# support/topic_trie.py
+# ================================
+# File version: v1.0.0
+# Sync'd to dashboard release: v3.10.0
+# Description: TopicTrie — MQTT subscription matcher for '+' and '#' wildcards
+#
+# Features:
+# ✅ Patterns stored level-by-level, so match cost follows topic depth, not pattern count
+# ✅ MQTT semantics: '+' matches one level, trailing '#' matches the parent and all below
+# ✅ '$'-prefixed topics ($SYS/...) are never matched by a leading wildcard
+# ✅ add() / remove() keep the trie compact (empty branches are pruned)
+# ================================
+"""
+
+
+class _Node:
+    __slots__ = ("children", "plus", "items", "hash_items")
+
+    def __init__(self):
+        self.children = {}     # literal level: _Node
+        self.plus = None       # '+' branch
+        self.items = []        # patterns ending exactly here
+        self.hash_items = []   # patterns ending in '#' below this node
+
+    def is_empty(self):
+        return not (self.children or self.plus or self.items or self.hash_items)
+
+
+def is_wildcard(topic: str) -> bool:
+    """True when a subscription pattern contains '+' or '#'."""
+    return "+" in topic or "#" in topic
+
+
+def validate_pattern(pattern: str):
+    """Raise ValueError for patterns the broker would reject."""
+    levels = pattern.split("/")
+    for i, level in enumerate(levels):
+        if level == "#":
+            if i != len(levels) - 1:
+                raise ValueError(f"'#' must be the last level: {pattern}")
+        elif level != "+" and ("+" in level or "#" in level):
+            raise ValueError(f"Wildcards must occupy a whole level: {pattern}")
+    return levels
+
+
+class TopicTrie:
+    """Maps subscription patterns to items and matches concrete topics against them."""
+
+    def __init__(self):
+        self._root = _Node()
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, pattern: str, item):
+        """Associate item with pattern (duplicates of the same pair are ignored)."""
+        node = self._root
+        levels = validate_pattern(pattern)
+        for level in levels:
+            if level == "#":
+                if item not in node.hash_items:
+                    node.hash_items.append(item)
+                    self._count += 1
+                return
+            if level == "+":
+                if node.plus is None:
+                    node.plus = _Node()
+                node = node.plus
+            else:
+                child = node.children.get(level)
+                if child is None:
+                    child = node.children[level] = _Node()
+                node = child
+        if item not in node.items:
+            node.items.append(item)
+            self._count += 1
+
+    def remove(self, pattern: str, item) -> bool:
+        """Drop item from pattern; returns False if it was not present."""
+        levels = validate_pattern(pattern)
+        path = []
+        node = self._root
+        for level in levels:
+            if level == "#":
+                break
+            path.append((node, level))
+            node = node.plus if level == "+" else node.children.get(level)
+            if node is None:
+                return False
+
+        bucket = node.hash_items if levels[-1] == "#" else node.items
+        if item not in bucket:
+            return False
+        bucket.remove(item)
+        self._count -= 1
+
+        # Prune empty branches bottom-up
+        for parent, level in reversed(path):
+            if not node.is_empty():
+                break
+            if level == "+":
+                parent.plus = None
+            else:
+                del parent.children[level]
+            node = parent
+        return True
+
+    def match(self, topic: str):
+        """Return every item whose pattern matches the concrete topic."""
+        levels = topic.split("/")
+        depth = len(levels)
+        result = []
+        stack = [(self._root, 0)]
+        while stack:
+            node, i = stack.pop()
+            if node.hash_items and not (i == 0 and topic.startswith("$")):
+                result.extend(node.hash_items)
+            if i == depth:
+                result.extend(node.items)
+                continue
+            child = node.children.get(levels[i])
+            if child is not None:
+                stack.append((child, i + 1))
+            if node.plus is not None and not (i == 0 and topic.startswith("$")):
+                stack.append((node.plus, i + 1))
+        return result
@@ -0,0 +1,287 @@
+"""
+Created on Sun Oct 18 21:52:40 2026
+@author: kmac3
+# ================================
+# support/transform.py
+# ================================
+# File version: v1.0.2
+# Sync'd to dashboard release: v3.10.0
+# Description: Binding transforms — parse → convert → smooth → format → classify, off the GUI thread
+#
+# Features:
+# ✅ compile_transform(binding) — declarative "transform" spec compiled once per binding
+#    convert: "f_to_c" / "c_to_f" / "k_to_c" / {"scale", "offset"}
+#    smooth:  {"ema": alpha} / {"mean": n}      (state kept per binding)
+#    format:  "{:.1f}°F ({:.1f}°C)" — the binding's "format" (value, value F→C) as before
+#    classify: [[50, "cold"], [80, "normal"], [null, "hot"]] — upper bounds → style state
+# ✅ Display — ready-to-show text + style state (+ number and source record)
+# ✅ TransformPipeline — GUI-side sink; values queue per binding and run in order on the
+#    pool (one job in flight per binding, so smoothing sees every sample)
+# ✅ TransformPool — ThreadPoolExecutor workers; results posted back as one queued signal
+#    and delivered only if newer than the binding's last delivered sequence number
+# Feature Update: v1.0.1
+# ✅ A "format" that does not fit the value (e.g. "{:d}" on a float) falls back to the
+#    payload text instead of dropping the Display
+# Feature Update: v1.0.2
+# ✅ Bindings with no "format" / convert / smooth (plain text, default "{}") are handled
+#    inline on the GUI thread — no pool hop, nothing to go stale
+# ================================
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from support.payload import MqttMessage, as_number
+from support.myLOG2 import LOG3
+
+CONVERSIONS = {
+    "f_to_c": (5 / 9, -32 * 5 / 9),
+    "c_to_f": (9 / 5, 32.0),
+    "k_to_c": (1.0, -273.15),
+}
+
+
+def _compile_convert(spec):
+    if spec is None:
+        return None
+    if isinstance(spec, str):
+        if spec not in CONVERSIONS:
+            raise ValueError(f"Unknown conversion '{spec}' (expected one of {tuple(CONVERSIONS)})")
+        scale, offset = CONVERSIONS[spec]
+    else:
+        scale, offset = float(spec.get("scale", 1.0)), float(spec.get("offset", 0.0))
+    return lambda x: x * scale + offset
+
+
+class _Ema:
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, alpha):
+        if not 0 < alpha <= 1:
+            raise ValueError(f"ema alpha {alpha} outside (0, 1]")
+        self.alpha = alpha
+        self.value = None
+
+    def __call__(self, x):
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        return self.value
+
+
+class _Mean:
+    __slots__ = ("window", "total")
+
+    def __init__(self, n):
+        self.window = deque(maxlen=max(1, int(n)))
+        self.total = 0.0
+
+    def __call__(self, x):
+        if len(self.window) == self.window.maxlen:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        return self.total / len(self.window)
+
+
+def _compile_smooth(spec):
+    if spec is None:
+        return None
+    if "ema" in spec:
+        return _Ema(float(spec["ema"]))
+    if "mean" in spec:
+        return _Mean(spec["mean"])
+    raise ValueError(f"Unknown smooth spec {spec!r} (expected {{'ema': a}} or {{'mean': n}})")
+
+
+def _compile_classify(spec):
+    """[[upper bound, state], ...] → tuple sorted by bound; a null bound is the catch-all."""
+    if not spec:
+        return ()
+    bands = [(float("inf") if bound is None else float(bound), state) for bound, state in spec]
+    return tuple(sorted(bands, key=lambda band: band[0]))
+
+
+class Display:
+    """What a tile shows for one value — built on a worker, applied on the GUI thread."""
+    __slots__ = ("text", "state", "value", "msg")
+
+    def __init__(self, text, state=None, value=None, msg=None):
+        self.text = text
+        self.state = state  # classify result (None for non-numeric values)
+        self.value = value  # number after convert / smooth, or None
+        self.msg = msg      # source record (MqttMessage for mqtt bindings)
+
+    def __repr__(self):
+        return f"Display({self.text!r}, {self.state!r})"
+
+
+class Transform:
+    """One binding's compiled pipeline — value in, Display out. Not thread-safe (one job per binding)."""
+
+    def __init__(self, fmt="{}", convert=None, smooth=None, classify=()):
+        self.fmt = fmt
+        self.convert = convert
+        self.smooth = smooth
+        self.classify = classify
+
+    @property
+    def inline(self):
+        """Nothing worth a worker — default format, no convert / smooth (classify is a few compares)."""
+        return self.fmt == "{}" and self.convert is None and self.smooth is None
+
+    def __call__(self, value):
+        msg = value if isinstance(value, MqttMessage) else None
+        number = as_number(value)
+        if number is None:
+            text = msg.text if msg is not None else str(value)
+            try:
+                number = float(text)  # parse: numeric text that arrived unparsed
+            except (TypeError, ValueError):
+                return Display(text, None, None, msg)
+        if self.convert:
+            number = self.convert(number)
+        if self.smooth:
+            number = self.smooth(number)
+        state = None
+        for bound, band_state in self.classify:
+            if number < bound:
+                state = band_state
+                break
+        try:
+            text = self.fmt.format(number, (number - 32) * 5 / 9)
+        except (ValueError, IndexError, KeyError):
+            text = msg.text if msg is not None else str(value)  # format does not fit — show it as received
+        return Display(text, state, number, msg)
+
+
+def compile_transform(binding, classify=None):
+    """
+    Transform for a binding — its "format" plus the optional "transform" spec.
+    classify= supplies the tile's default bands when the spec has none.
+    """
+    spec = binding.get("transform") or {}
+    return Transform(
+        spec.get("format", binding.get("format", "{}")),
+        _compile_convert(spec.get("convert")),
+        _compile_smooth(spec.get("smooth")),
+        _compile_classify(spec.get("classify", classify)),
+    )
+
+
+class TransformPipeline:
+    """
+    Channel sink for one binding. Called on the GUI thread with each value; the work
+    runs on the pool and callback(Display) is called back on the GUI thread — or straight
+    away when the transform is inline.
+    """
+
+    def __init__(self, pool, key, transform, callback):
+        self.pool = pool
+        self.key = key
+        self.transform = transform
+        self.callback = callback
+        self.inline = transform.inline
+        self.active = True
+        self.seq = 0          # last value queued (GUI thread)
+        self.delivered = 0    # last result handed to callback (GUI thread)
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._busy = False
+
+    def __call__(self, value):
+        self.seq += 1
+        if self.inline:
+            self.pool.inline += 1
+            try:
+                display = self.transform(value)
+            except Exception as e:
+                self.pool.errors += 1
+                LOG3(100 + 71, f"Transform error on '{self.key}': {e}")
+                return
+            self.deliver(self.seq, display)
+            return
+        with self._lock:
+            self._pending.append((self.seq, value))
+            if self._busy:
+                return  # the running job picks it up
+            self._busy = True
+        self.pool.submit(self)
+
+    def run(self):
+        """Worker — drain queued values in order, post the newest result."""
+        while True:
+            with self._lock:
+                if not self._pending or not self.active:
+                    self._pending.clear()
+                    self._busy = False
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+            result = None
+            for seq, value in batch:
+                try:
+                    result = (seq, self.transform(value))
+                except Exception as e:
+                    self.pool.errors += 1
+                    LOG3(100 + 71, f"Transform error on '{self.key}': {e}")
+            self.pool.runs += 1
+            self.pool.values += len(batch)
+            if result is not None:
+                self.pool.SIG_result.emit((self, result[0], result[1]))
+
+    def deliver(self, seq, display):
+        """GUI thread — hand over a result unless released or superseded."""
+        if not self.active or seq <= self.delivered:
+            self.pool.stale += 1
+            return
+        self.delivered = seq
+        try:
+            self.callback(display)
+        except Exception as e:
+            LOG3(100 + 72, f"Display callback error on '{self.key}': {e}")
+
+    def release(self):
+        self.active = False
+
+
+class TransformPool(QObject):
+    SIG_result = pyqtSignal(object)  # (pipeline, seq, Display) — queued to the GUI thread
+
+    def __init__(self, workers=2):
+        super().__init__()
+        self.workers = max(1, int(workers))
+        self.executor = None  # created on first submit
+        self.submitted = 0
+        self.inline = 0  # values transformed on the GUI thread (inline pipelines)
+        self.runs = 0
+        self.values = 0
+        self.errors = 0
+        self.stale = 0
+        self.SIG_result.connect(self._on_result)
+
+    def submit(self, pipeline):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="transform")
+            LOG3(100 + 70, f"Transform pool started — {self.workers} worker(s)")
+        self.submitted += 1
+        self.executor.submit(pipeline.run)
+
+    def _on_result(self, result):
+        pipeline, seq, display = result
+        pipeline.deliver(seq, display)
+
+    def stop(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def stats_lines(self):
+        if not (self.submitted or self.inline):
+            return []
+        return [
+            f"Transform pool: {self.workers} worker(s)",
+            f"  Jobs: {self.submitted}, runs: {self.runs}, values: {self.values}, inline: {self.inline}, "
+            f"errors: {self.errors}, stale results dropped: {self.stale}",
+        ]
@@ -0,0 +1,9 @@
+"""
+pytest setup — the suite imports the dashboard packages (support/, controller/) from the
+repo root, the same way tools/ does.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,97 @@
+"""Change suppression — suppress spec parsing, ChangeFilter, TopicChangeFilter."""
+
+import pytest
+
+from support.change_filter import (EXACT, ChangeFilter, TopicChangeFilter, make_filter, merge_suppress,
+                                   parse_suppress)
+from support.payload import MqttMessage
+
+
+def msg(topic, value, broker="default"):
+    return MqttMessage(topic, str(value), value, 0.0, broker)
+
+
+def run(filter_, values):
+    return [value for value in values if filter_(value)]
+
+
+@pytest.mark.parametrize("spec, rule", [
+    (None, None), (False, None), ("none", None),
+    (True, EXACT), ("exact", EXACT), (0, EXACT), ({"deadband": 0}, EXACT),
+    (0.5, ("deadband", 0.5)), ({"deadband": 2}, ("deadband", 2.0)),
+])
+def test_parse_suppress(spec, rule):
+    assert parse_suppress(spec) == rule
+
+
+@pytest.mark.parametrize("spec", [-1, "sometimes", [1]])
+def test_parse_suppress_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_suppress(spec)
+
+
+def test_merge_suppress_loosest_wins():
+    assert merge_suppress([]) is None
+    assert merge_suppress([EXACT, None]) is None
+    assert merge_suppress([("deadband", 1.0), EXACT]) == EXACT
+    assert merge_suppress([("deadband", 1.0), ("deadband", 0.2)]) == ("deadband", 0.2)
+
+
+def test_exact_drops_repeats_only():
+    f = ChangeFilter(EXACT)
+    assert run(f, [1, 1, 2, 2, 1, "on", "on"]) == [1, 2, 1, "on"]
+    assert (f.passed, f.suppressed) == (4, 3)
+
+
+def test_exact_compares_payload_value_not_record():
+    f = ChangeFilter(EXACT)
+    assert f(msg("a", 70))
+    assert not f(msg("a", 70))  # a new record object carrying the same value
+    assert f(msg("a", 71))
+
+
+def test_deadband_against_last_passed_value():
+    f = ChangeFilter(("deadband", 0.5))
+    # 20.4 is within 0.5 of 20.0 and dropped; 20.6 is compared with 20.0, not 20.4
+    assert run(f, [20.0, 20.4, 20.6, 20.2, 21.1]) == [20.0, 20.6, 21.1]
+
+
+def test_deadband_non_numeric_falls_back_to_exact():
+    f = ChangeFilter(("deadband", 1.0))
+    assert run(f, ["idle", "idle", "busy", 3, 3.5, 5, True, True]) == ["idle", "busy", 3, 5, True]
+    # payload text is parsed upstream — a string is never read as a number
+    assert run(ChangeFilter(("deadband", 1.0)), [3.0, "3.5", "3.5", 3.5]) == [3.0, "3.5", 3.5]
+
+
+def test_first_value_always_passes():
+    assert ChangeFilter(EXACT)(None)
+
+
+def test_topic_filter_keeps_a_last_value_per_topic():
+    f = TopicChangeFilter(EXACT)
+    records = [msg("temp/kitchen", 70), msg("temp/garage", 70), msg("temp/kitchen", 70),
+               msg("temp/garage", 70), msg("temp/garage", 71)]
+    assert [(m.topic, m.value) for m in run(f, records)] == [
+        ("temp/kitchen", 70), ("temp/garage", 70), ("temp/garage", 71)]
+    assert len(f.lasts) == 2
+    assert "2 topic(s)" in f.stats()
+
+
+def test_topic_filter_separates_brokers():
+    f = TopicChangeFilter(EXACT)
+    assert f(msg("temp/a", 1, "home"))
+    assert f(msg("temp/a", 1, "lab"))
+    assert not f(msg("temp/a", 1, "home"))
+
+
+def test_topic_filter_deadband():
+    f = TopicChangeFilter(("deadband", 1.0))
+    assert f(msg("t/a", 10.0))
+    assert f(msg("t/b", 10.5))
+    assert not f(msg("t/a", 10.5))
+    assert f(msg("t/b", 11.5))
+
+
+def test_make_filter():
+    assert type(make_filter(EXACT)) is ChangeFilter
+    assert type(make_filter(EXACT, per_topic=True)) is TopicChangeFilter
@@ -0,0 +1,94 @@
+"""ChannelRouter — change suppression against the recorded series (history / archive) and stat windows."""
+
+import time
+import weakref
+
+import pytest
+
+from support.change_filter import EXACT, ChangeFilter
+from support.channel_router import ChannelRouter
+from support.payload import MqttMessage
+from support.rolling import EMPTY
+from support.subscription import Subscription
+
+pytest.importorskip("numpy")
+from support.history import TimeSeriesStore  # noqa: E402
+
+
+class ListArchive:
+    """Stands in for HistoryDB — append() only."""
+
+    def __init__(self):
+        self.samples = []
+
+    def append(self, cid, t, value):
+        self.samples.append((cid, value))
+
+
+def subscribe(router, key):
+    """Sink on key — returns (Subscription, received values); keep the Subscription alive."""
+    received = []
+    cid = router.channel_id(key)
+    sink, _ = router.find(cid, received.append)
+    sub = Subscription(None, key, received.append, cid, sink)
+    router.add(sub, weakref.ref(sub))
+    return sub, received
+
+
+def publish(router, topic, value):
+    router.route_mqtt(MqttMessage(topic, str(value), value, 0.0))
+
+
+@pytest.fixture
+def router():
+    router = ChannelRouter()
+    router.history = TimeSeriesStore(100)
+    router.archive = ListArchive()
+    return router
+
+
+def test_suppressed_values_are_still_recorded(router):
+    sub, received = subscribe(router, "mqtt:boiler/temp")
+    cid = sub.channel
+    router.set_filters({cid: ChangeFilter(EXACT)})
+    for value in (60, 60, 60, 61, 61):
+        publish(router, "boiler/temp", value)
+    assert [m.value for m in received] == [60, 61]
+    assert router.history.get(cid).last(10)[1].tolist() == [60, 60, 60, 61, 61]
+    assert [v.value for c, v in router.archive.samples if c == cid] == [60, 60, 60, 61, 61]
+
+
+def test_suppressed_record_still_records_its_fields(router):
+    sub, fields = subscribe(router, "mqtt:env|t")
+    base = router.channel_ids["mqtt:env"]
+    router.set_filters({base: ChangeFilter(EXACT)})
+    for _ in range(3):
+        publish(router, "env", {"t": 21.5, "h": 40})
+    assert [m.value for m in fields] == [21.5]
+    assert router.history.get(sub.channel).last(10)[1].tolist() == [21.5, 21.5, 21.5]
+
+
+def test_suppressed_named_channel_recorded(router):
+    sub, received = subscribe(router, "system:cpu")
+    router.set_filters({sub.channel: ChangeFilter(EXACT)})
+    for value in (5.0, 5.0, 7.5):
+        router.emit(sub.channel, value)
+    assert received == [5.0, 7.5]
+    assert len(router.history.get(sub.channel)) == 3
+
+
+def test_suppressed_values_still_feed_stat_windows():
+    router = ChannelRouter()  # stat windows work without history / archive
+    raw, shown = subscribe(router, "mqtt:boiler/temp")
+    stats = {stat: subscribe(router, f"mqtt:boiler/temp~{stat}@2s") for stat in ("count", "min", "max")}
+    router.set_filters({raw.channel: ChangeFilter(EXACT)})
+    for _ in range(8):
+        publish(router, "boiler/temp", 60)
+    assert [m.value for m in shown] == [60]
+    assert stats["count"][1][-1].value == 8
+    assert stats["min"][1][-1].value == stats["max"][1][-1].value == 60
+    router.expire_stats(time.time())  # samples are fresh — nothing ages out
+    assert stats["count"][1][-1].value == 8
+    router.expire_stats(time.time() + 3)
+    assert stats["count"][1][-1].value == 0
+    assert stats["max"][1][-1].text == EMPTY
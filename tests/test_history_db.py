@@ -0,0 +1,105 @@
+"""HistoryDB — batched writes, range queries, bucket downsampling, read-only CLI access."""
+
+import sqlite3
+
+import pytest
+
+from support.history_db import HistoryDB, main, parse_when
+
+KEYS = ["mqtt:boiler/temp", "system:cpu"]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "history.db")
+
+
+def filled(path, samples, **options):
+    """HistoryDB with samples [(cid, t, value)] committed."""
+    db = HistoryDB(path, KEYS, commit_ms=10, **options)
+    for cid, t, value in samples:
+        db.append(cid, t, value)
+    db.close()
+    return db
+
+
+def test_round_trip(path):
+    db = filled(path, [(0, 100.0 + i, float(i)) for i in range(10)] + [(1, 100.5, 42.0)])
+    assert db.history(KEYS[0], 100.0) == ([100.0 + i for i in range(10)], [float(i) for i in range(10)])
+    assert db.history(KEYS[0], 103.0, 106.0) == ([103.0, 104.0, 105.0], [3.0, 4.0, 5.0])  # end exclusive
+    assert db.history(KEYS[1], 0) == ([100.5], [42.0])
+    assert db.history("mqtt:unknown", 0) == ([], [])
+    assert [row[:2] for row in db.channels()] == [(KEYS[0], 10), (KEYS[1], 1)]
+    assert (db.written, db.dropped) == (11, 0)
+
+
+def test_non_numeric_values_are_skipped(path):
+    db = filled(path, [(0, 1.0, "on"), (0, 2.0, True), (0, 3.0, 7)])
+    assert db.history(KEYS[0], 0) == ([3.0], [7.0])
+    assert db.queued == 1
+
+
+def test_same_timestamp_samples_are_all_kept(path):
+    db = filled(path, [(0, 50.0, 1.0), (0, 50.0, 2.0), (0, 50.0, 2.0)])
+    ts, values = db.history(KEYS[0], 0)
+    assert ts == [50.0] * 3 and sorted(values) == [1.0, 2.0, 2.0]
+
+
+def test_downsampling_averages_buckets(path):
+    db = filled(path, [(0, float(t), float(t % 10)) for t in range(1000)])
+    assert len(db.history(KEYS[0], 0, max_points=1000)[0]) == 1000  # fits — raw points
+    ts, values = db.history(KEYS[0], 0, max_points=100)
+    assert len(ts) == 100
+    assert ts == sorted(ts)
+    assert ts[0] == pytest.approx(4.5) and values[0] == pytest.approx(4.5)  # t 0..9 in the first bucket
+    assert ts[-1] == pytest.approx(994.5)
+    assert sum(values) / len(values) == pytest.approx(4.5)
+
+
+def test_downsampling_omits_empty_buckets(path):
+    samples = [(0, float(t), 1.0) for t in range(100)] + [(0, 1000.0 + t, 3.0) for t in range(100)]
+    ts, values = filled(path, samples).history(KEYS[0], 0, max_points=10)
+    assert len(ts) == 2  # nothing between t=100 and t=1000
+    assert values == pytest.approx([1.0, 3.0])
+
+
+def test_readonly_never_creates_the_file(tmp_path):
+    missing = tmp_path / "missing.db"
+    with pytest.raises(FileNotFoundError):
+        HistoryDB(str(missing), [], readonly=True)
+    assert main([str(missing), "query", KEYS[0]]) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_readonly_queries_and_refuses_appends(path, capsys):
+    filled(path, [(0, 1000.0, 21.5), (0, 1001.0, 22.0)])
+    db = HistoryDB(path, [], readonly=True)
+    assert db.history(KEYS[0], 0) == ([1000.0, 1001.0], [21.5, 22.0])
+    with pytest.raises(RuntimeError):
+        db.append(0, 1002.0, 1.0)
+    assert main([path, "query", KEYS[0], "--start=0", "--end=2000"]) == 0
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == "time,value" and out[1].endswith(",21.5") and len(out) == 3
+
+
+def test_v1_schema_is_upgraded(path):
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE channels (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE);
+        CREATE TABLE samples (channel INTEGER NOT NULL, ts REAL NOT NULL, value REAL NOT NULL,
+                              PRIMARY KEY (channel, ts)) WITHOUT ROWID;
+        INSERT INTO channels (key) VALUES ('mqtt:boiler/temp');
+        INSERT INTO samples VALUES (1, 10.0, 5.0);
+    """)
+    conn.close()
+    db = filled(path, [(0, 10.0, 6.0)])  # same (channel, ts) — a UNIQUE error before the upgrade
+    assert db.dropped == 0
+    assert sorted(db.history(KEYS[0], 0)[1]) == [5.0, 6.0]
+
+
+def test_parse_when():
+    assert parse_when("now", now=1000.0) == 1000.0
+    assert parse_when("-90s", now=1000.0) == 910.0
+    assert parse_when("-2h", now=10000.0) == 2800.0
+    assert parse_when("1234.5") == 1234.5
+    assert parse_when("2026-03-10T12:00:00") > 0
@@ -0,0 +1,119 @@
+"""Stat channels — key parsing, RollingWindow / DailyWindow values and expiry, StatGroup."""
+
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from support.rolling import (TODAY, DailyWindow, RollingWindow, StatGroup, parse_stat, parse_stat_key,
+                             parse_window, stat_suffix)
+
+
+def brute(samples, stat):
+    xs = [x for _, x in samples]
+    if not xs:
+        return 0 if stat == "count" else None
+    mean = sum(xs) / len(xs)
+    return {"min": min(xs), "max": max(xs), "count": len(xs), "mean": mean,
+            "stddev": math.sqrt(sum((x - mean) ** 2 for x in xs) / len(xs))}[stat]
+
+
+@pytest.mark.parametrize("spec, seconds", [("90s", 90), ("5m", 300), ("1.5h", 5400), ("1d", 86400), (TODAY, TODAY)])
+def test_parse_window(spec, seconds):
+    assert parse_window(spec) == seconds
+
+
+@pytest.mark.parametrize("spec", ["0s", "5", "m", "5w", "-1m", "yesterday"])
+def test_parse_window_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_window(spec)
+
+
+def test_binding_and_key_round_trip():
+    assert parse_stat({}) is None
+    assert parse_stat({"stat": "max"}) == ("max", "1m")
+    assert stat_suffix({"stat": "mean", "window": "5m"}) == "~mean@5m"
+    assert stat_suffix({"stat": "median"}) == ""  # invalid — reported when the layout is bound
+    with pytest.raises(ValueError):
+        parse_stat({"stat": "median"})
+    assert parse_stat_key("mqtt:env|t~stddev@1h") == ("mqtt:env|t", "stddev", "1h")
+    assert parse_stat_key("mqtt:a/b~c") is None
+    assert parse_stat_key("mqtt:a~median@1m") is None
+
+
+def test_rolling_matches_brute_force_while_samples_age_out():
+    rng = random.Random(3)
+    window = RollingWindow(10.0)
+    kept = []
+    t = 1000.0
+    for _ in range(2000):
+        t += rng.uniform(0.0, 0.5)
+        x = rng.choice([rng.uniform(-50, 50), 1e6 + rng.random()])  # large offset exercises the re-sum
+        window.push(t, x)
+        kept = [(ts, v) for ts, v in kept + [(t, x)] if ts > t - 10.0]
+        for stat in ("min", "max", "count", "mean", "stddev"):
+            assert window.value(stat) == pytest.approx(brute(kept, stat), rel=1e-9, abs=1e-6)
+
+
+def test_rolling_expire_without_new_samples():
+    window = RollingWindow(60.0)
+    for t, x in ((0.0, 5.0), (30.0, 9.0), (50.0, 1.0)):
+        window.push(t, x)
+    window.expire(65.0)  # the sample at t=0 leaves
+    assert (window.value("count"), window.value("min"), window.value("max")) == (2, 1.0, 9.0)
+    window.expire(95.0)
+    assert (window.value("count"), window.value("max"), window.value("mean")) == (1, 1.0, 1.0)
+    window.expire(200.0)
+    assert window.value("count") == 0
+    assert window.value("min") is None and window.value("stddev") is None
+    window.push(201.0, 4.0)  # refills cleanly after emptying
+    assert (window.value("mean"), window.value("stddev")) == (4.0, 0.0)
+
+
+def test_daily_window_resets_at_local_midnight():
+    day = datetime(2026, 3, 10, 8, 0)
+    window = DailyWindow()
+    for hours, x in ((0, 12.0), (4, 20.0), (8, 14.0)):
+        window.push((day + timedelta(hours=hours)).timestamp(), x)
+    assert window.since(day.timestamp()) == datetime(2026, 3, 10).timestamp()
+    assert (window.value("min"), window.value("max"), window.value("count")) == (12.0, 20.0, 3)
+    assert window.value("mean") == pytest.approx(brute([(0, 12.0), (0, 20.0), (0, 14.0)], "mean"))
+    assert window.value("stddev") == pytest.approx(brute([(0, 12.0), (0, 20.0), (0, 14.0)], "stddev"))
+    window.expire(datetime(2026, 3, 10, 23, 59).timestamp())
+    assert window.value("count") == 3
+    window.expire(datetime(2026, 3, 11, 0, 0, 1).timestamp())
+    assert window.value("count") == 0 and window.value("max") is None
+    window.push(datetime(2026, 3, 11, 6, 0).timestamp(), 3.0)
+    assert (window.value("min"), window.value("max")) == (3.0, 3.0)
+
+
+def test_daily_window_push_after_midnight_starts_a_new_day():
+    window = DailyWindow()
+    window.push(datetime(2026, 3, 10, 23, 0).timestamp(), 30.0)
+    window.push(datetime(2026, 3, 11, 1, 0).timestamp(), 10.0)  # no expire() in between
+    assert (window.value("count"), window.value("max")) == (1, 10.0)
+
+
+def test_stat_group_shares_windows_and_reports_changes_only():
+    group = StatGroup()
+    assert group.add("1m", "max", 1) is not None  # new window — caller may seed it
+    assert group.add("1m", "min", 2) is None  # shares it
+    assert group.add("1m", "min", 2) is None  # duplicate cid ignored
+    assert group.add("today", "count", 3) is not None
+    assert len(group) == 3 and set(group.windows) == {"1m", "today"}
+    assert group.changes() == [(3, 0)]  # empty windows: count reported, the others not yet
+
+    now = datetime(2026, 3, 10, 12, 0).timestamp()
+    assert group.push(now, 10.0) == [(1, 10.0), (2, 10.0), (3, 1)]
+    assert group.push(now + 1, 7.0) == [(2, 7.0), (3, 2)]
+    assert group.push(now + 2, "n/a") == ()  # non-numeric values are not samples
+    assert group.expire(now + 30) == []
+
+    assert group.expire(now + 61) == [(1, None), (2, None)]  # window emptied — reported once
+    assert group.expire(now + 62) == []
+
+    group.remove(2)
+    assert len(group) == 2 and set(group.windows) == {"1m", "today"}
+    group.remove(1)
+    assert set(group.windows) == {"today"}
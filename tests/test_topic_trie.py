@@ -0,0 +1,84 @@
+"""TopicTrie — MQTT '+' / '#' matching, '$' topics, add / remove bookkeeping."""
+
+import pytest
+
+from support.topic_trie import TopicTrie, is_wildcard, validate_pattern
+
+
+def matches(trie, topic):
+    return sorted(trie.match(topic))
+
+
+@pytest.fixture
+def trie():
+    trie = TopicTrie()
+    for item, pattern in enumerate(("home/+/temp", "home/#", "home/kitchen/temp", "+/+/temp", "#", "office/+")):
+        trie.add(pattern, item)
+    return trie
+
+
+def test_plus_matches_one_level(trie):
+    assert matches(trie, "home/garage/temp") == [0, 1, 3, 4]
+    assert 0 not in trie.match("home/garage/temp/raw")
+    assert matches(trie, "office/desk") == [4, 5]
+    assert 5 not in trie.match("office")
+
+
+def test_exact_pattern(trie):
+    assert matches(trie, "home/kitchen/temp") == [0, 1, 2, 3, 4]
+
+
+def test_hash_matches_parent_and_below(trie):
+    assert matches(trie, "home") == [1, 4]
+    assert matches(trie, "home/a/b/c/d") == [1, 4]
+    assert matches(trie, "garden/shed") == [4]
+
+
+def test_dollar_topics_skip_leading_wildcards(trie):
+    assert trie.match("$SYS/broker/load") == []
+    trie.add("$SYS/#", "sys")
+    trie.add("$SYS/+/load", "load")
+    assert sorted(trie.match("$SYS/broker/load")) == ["load", "sys"]
+
+
+def test_empty_levels_are_levels():
+    trie = TopicTrie()
+    trie.add("a/+/c", 1)
+    assert trie.match("a//c") == [1]
+    assert trie.match("a/c") == []
+
+
+def test_add_is_idempotent_and_len_counts_pairs():
+    trie = TopicTrie()
+    trie.add("a/+", 1)
+    trie.add("a/+", 1)
+    trie.add("a/+", 2)
+    trie.add("a/#", 1)
+    assert len(trie) == 3
+    assert sorted(trie.match("a/b")) == [1, 1, 2]
+
+
+def test_remove_prunes_branches():
+    trie = TopicTrie()
+    trie.add("a/+/c", 1)
+    trie.add("a/#", 2)
+    assert trie.remove("a/+/c", 1)
+    assert not trie.remove("a/+/c", 1)
+    assert not trie.remove("x/y", 1)
+    assert trie.match("a/b/c") == [2]
+    assert trie.remove("a/#", 2)
+    assert len(trie) == 0
+    assert trie._root.is_empty()
+
+
+@pytest.mark.parametrize("pattern", ["a/#/b", "a/b+", "a#", "a/+b/c"])
+def test_invalid_patterns(pattern):
+    with pytest.raises(ValueError):
+        validate_pattern(pattern)
+    with pytest.raises(ValueError):
+        TopicTrie().add(pattern, 1)
+
+
+def test_is_wildcard():
+    assert is_wildcard("a/+/b") and is_wildcard("a/#")
+    assert not is_wildcard("a/b/c")
@@ -0,0 +1,95 @@
+"""
+History DB Benchmark — Standalone
+File version: v1.0.0
+Description: Insert throughput and query latency of the SQLite history backend (HistoryDB)
+Features:
+- Paced phase: --rate samples/s (default 5000) spread over --channels for --duration s, fed
+  through HistoryDB.append() exactly as ChannelRouter does — reports caller-side µs per append,
+  samples written per second, commit count / batch size / commit ms, backlog at the end
+- Burst phase: --burst samples appended unpaced, then close() — the writer's ceiling
+- Query phase: history(key, last hour) raw and with max_points=500
+Usage:
+    python tools/bench_history_db.py [--rate 5000] [--channels 100] [--duration 10] [--commit-ms 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from support.history_db import HistoryDB  # noqa: E402
+
+SLICE = 0.01  # s — pacing granularity
+
+
+def paced(db, rate, channels, duration, rng):
+    per_slice = rate * SLICE
+    owed = 0.0
+    appended, append_s = 0, 0.0
+    start = time.perf_counter()
+    next_slice = start
+    while next_slice - start < duration:
+        owed += per_slice
+        n = int(owed)
+        owed -= n
+        now = time.time()  # shared by the slice — same-timestamp samples are all kept
+        t0 = time.perf_counter()
+        for _ in range(n):
+            db.append(rng.randrange(channels), now, rng.uniform(0, 100))
+        append_s += time.perf_counter() - t0
+        appended += n
+        next_slice += SLICE
+        time.sleep(max(0.0, next_slice - time.perf_counter()))
+    return appended, append_s, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite history backend benchmark")
+    parser.add_argument("--rate", type=float, default=5000)
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--commit-ms", type=float, default=500)
+    parser.add_argument("--burst", type=int, default=200_000)
+    parser.add_argument("--db", default=None, help="database path (default: a temp file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix="bench_history_db_"), "history.db")
+    keys = [f"mqtt:bench/sensor/{i}" for i in range(args.channels)]
+    rng = random.Random(7)
+
+    db = HistoryDB(path, keys, args.commit_ms)
+    appended, append_s, elapsed = paced(db, args.rate, args.channels, args.duration, rng)
+    backlog = db.queued - db.written
+    print(f"Paced   : {appended} samples over {elapsed:.1f} s across {args.channels} channels "
+          f"(commit every {args.commit_ms:g} ms)")
+    print(f"  append  : {append_s / max(1, appended) * 1e6:.2f} µs per sample on the caller's thread")
+    print(f"  written : {db.written / elapsed:,.0f} samples/s, {db.commits} commits "
+          f"(largest {db.largest_batch}, avg {db.commit_ms / max(1, db.commits):.1f} ms, "
+          f"max {db.max_commit_ms:.1f} ms), backlog at end {backlog}")
+
+    t0 = time.perf_counter()
+    now = time.time()
+    for i in range(args.burst):
+        db.append(i % args.channels, now + i * 1e-6, float(i))
+    db.close()
+    burst = time.perf_counter() - t0
+    print(f"Burst   : {args.burst} samples appended + committed in {burst:.2f} s "
+          f"({args.burst / burst:,.0f} samples/s ceiling), {db.dropped} dropped")
+
+    key = keys[0]
+    for max_points in (None, 500):
+        t0 = time.perf_counter()
+        ts, _ = db.history(key, time.time() - 3600, None, max_points)
+        print(f"Query   : history({key!r}, last hour, max_points={max_points}) → {len(ts)} points "
+              f"in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    print(f"DB size : {sum(os.path.getsize(path + s) for s in ('', '-wal') if os.path.exists(path + s)) / 1e6:.1f} MB "
+          f"({path})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+End-to-End Ingest Benchmark — Standalone PyQt6 (offscreen)
+File version: v1.0.1
+Description: LoadGenerator → LocalBroker → MqttLiveClient → DataDispatcher → tile callbacks
+Features:
+- No network: broker stand-in bound to 127.0.0.1 on an ephemeral port
+- Real SimpleTextTile widgets bound to the generated topics (offscreen platform)
+- Reports throughput at every stage, coalesced counts and GUI timer lag (p50 / p99 / max)
+- Optional per-binding rate_limit (--rate-limit HZ --policy P) to measure backpressure
+Usage:
+    python tools/bench_ingest.py [--rate R] [--topics N] [--tiles T] [--duration S] [--coalesce-hz HZ]
+                                 [--rate-limit HZ] [--policy keep_latest|drop_oldest|average]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QTimer  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from controller.dispatcher import DataDispatcher  # noqa: E402
+from support.local_broker import LocalBroker  # noqa: E402
+from view.dashboard_view import DashboardView  # noqa: E402
+from mqtt_load_gen import LoadGenerator, topic_names  # noqa: E402
+
+
+def pump(app, seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.0005)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end MQTT ingest benchmark")
+    parser.add_argument("--rate", type=int, default=5000)
+    parser.add_argument("--topics", type=int, default=50)
+    parser.add_argument("--tiles", type=int, default=None, help="tiles bound (default: one per topic, max 200)")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--coalesce-hz", type=int, default=0, help="0 = per-message delivery")
+    parser.add_argument("--rate-limit", type=float, default=0, help="per-binding max_hz (0 = off)")
+    parser.add_argument("--policy", default="keep_latest")
+    parser.add_argument("--verbose", action="store_true", help="keep per-message LOG3 output")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    app = QApplication(sys.argv)
+    broker = LocalBroker()
+    port = broker.start()
+
+    prefs = {
+        "mqtt_coalesce_hz": args.coalesce_hz,
+        "mqtt_brokers": {"default": {"host": "127.0.0.1", "port": port}},
+    }
+    topics = topic_names(args.topics)
+    n_tiles = args.tiles if args.tiles is not None else min(len(topics), 200)
+    configs = [
+        {
+            "id": f"bench-{i}",
+            "hex_id": "BENCH",
+            "title": topics[i % len(topics)],
+            "size": [1, 1],
+            "bindings": {"value": {"type": "mqtt", "topic": topics[i % len(topics)],
+                                   "format": "{:.1f}°F → {:.1f}°C"}},
+        }
+        for i in range(n_tiles)
+    ]
+    if args.rate_limit:
+        for config in configs:
+            config["bindings"]["value"]["rate_limit"] = {"max_hz": args.rate_limit, "policy": args.policy}
+
+    dispatcher = DataDispatcher(prefs)
+    view = DashboardView(dispatcher)
+    view.load_config(configs)
+
+    delivered = [0]
+    def count(_msg):
+        delivered[0] += 1
+    dispatcher.start()
+    dispatcher.bind_config(configs)
+    for topic in topics:
+        dispatcher.register_cb(f"mqtt:{topic}", count)
+    client = dispatcher.mqtt_pool.get("default")
+
+    deadline = time.perf_counter() + 5
+    while not client.connected and time.perf_counter() < deadline:
+        pump(app, 0.05)
+    if not client.connected:
+        print("Client failed to connect to the local broker")
+        return 1
+    pump(app, 0.2)  # let SUBSCRIBE settle
+
+    lags = []
+    last = [time.perf_counter()]
+    def probe():
+        now = time.perf_counter()
+        lags.append(max(0.0, (now - last[0]) - 0.010) * 1000)
+        last[0] = now
+    probe_timer = QTimer()
+    probe_timer.timeout.connect(probe)
+    probe_timer.start(10)
+
+    gen = LoadGenerator("127.0.0.1", port, args.rate, topics)
+    t0 = time.perf_counter()
+    gen.start(args.duration)
+    pump(app, args.duration)
+    gen.stop()
+    pump(app, 0.5)  # drain in-flight traffic
+    elapsed = time.perf_counter() - t0
+    probe_timer.stop()
+
+    mode = f"coalescing @ {args.coalesce_hz} Hz" if args.coalesce_hz else "per-message"
+    print(f"Mode: {mode} — {args.topics} topics, {n_tiles} tiles, target {args.rate} msg/s")
+    print(f"Published          : {gen.sent:>9} ({gen.sent / args.duration:,.0f} msg/s)")
+    print(f"Broker received    : {broker.received:>9}")
+    print(f"Client received    : {client.messages:>9} ({client.messages / elapsed:,.0f} msg/s)")
+    print(f"Dispatcher emitted : {delivered[0]:>9} ({delivered[0] / elapsed:,.0f} msg/s)")
+    if dispatcher.ingest_buffer:
+        buf = dispatcher.ingest_buffer
+        print(f"Coalesced          : {buf.coalesced:>9} in {buf.drains} frames")
+    if args.rate_limit:
+        print("Rate limits        :")
+        for line in dispatcher.rate_limiter.stats_lines()[:5]:
+            print(f"  {line.strip()}")
+    print(f"GUI timer lag (ms) : p50 {percentile(lags, 50):.1f}  p99 {percentile(lags, 99):.1f}  "
+          f"max {max(lags, default=0):.1f}")
+
+    dispatcher.stop()
+    broker.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
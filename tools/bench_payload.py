@@ -0,0 +1,65 @@
+"""
+Payload Decode Benchmark — Standalone
+File version: v1.0.0
+Description: Compares payload size and decode cost of text, JSON and binary sensor frames
+Features:
+- Same three-reading frame (temp, humidity, pressure) encoded as text / JSON / struct / msgpack
+- Decodes through PayloadParser exactly as the MQTT thread does (random frames, so no cache hits)
+- Prints bytes per frame and µs per decode; msgpack rows skipped if the package is missing
+Usage:
+    python tools/bench_payload.py [frames]
+"""
+
+import json
+import os
+import random
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from support.payload import PayloadParser, compile_decoder  # noqa: E402
+
+STRUCT_SPEC = {"struct": "<hhf", "fields": ["t", "h", "p"]}
+
+
+def frames(count, rng):
+    return [(round(rng.uniform(60, 80), 1), rng.randrange(20, 60), round(rng.uniform(990, 1030), 1))
+            for _ in range(count)]
+
+
+def encoders():
+    packer = struct.Struct(STRUCT_SPEC["struct"])
+    rows = [
+        ("text (one float)", None, lambda f: f"{f[0]:.1f}".encode()),
+        ("json", None, lambda f: json.dumps({"t": f[0], "h": f[1], "p": f[2]}).encode()),
+        ("struct <hhf", STRUCT_SPEC, lambda f: packer.pack(int(f[0]), f[1], f[2])),
+    ]
+    try:
+        import msgpack
+        rows.append(("msgpack", "msgpack", lambda f: msgpack.packb({"t": f[0], "h": f[1], "p": f[2]})))
+    except ImportError:
+        print("msgpack not installed — skipping msgpack row")
+    return rows
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    data = frames(count, random.Random(42))
+    print(f"{'encoding':<18} {'bytes':>6} {'µs/decode':>10}")
+    for name, spec, encode in encoders():
+        payloads = [encode(f) for f in data]
+        parser = PayloadParser()
+        if spec is not None:
+            parser.set_decoders({"bench/frame": compile_decoder(spec)})
+        t0 = time.perf_counter()
+        for raw in payloads:
+            parser.decode("bench/frame", raw)
+        elapsed = time.perf_counter() - t0
+        size = sum(len(p) for p in payloads) / count
+        print(f"{name:<18} {size:>6.1f} {elapsed / count * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
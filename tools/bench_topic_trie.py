@@ -0,0 +1,99 @@
+"""
+Topic Trie Benchmark — Standalone
+File version: v1.0.0
+Description: Compares TopicTrie matching against a linear pattern scan
+Features:
+- Builds N wildcard subscriptions (default 10,000) shaped like sensor topics
+- Matches a stream of concrete topics with both matchers and checks they agree
+- Prints per-message match cost for each
+Usage:
+    python tools/bench_topic_trie.py [subscriptions] [messages]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from support.topic_trie import TopicTrie  # noqa: E402
+
+
+def linear_match(patterns, topic):
+    """Reference matcher — checks every pattern."""
+    levels = topic.split("/")
+    hits = []
+    for pattern in patterns:
+        plevels = pattern.split("/")
+        ok = True
+        for i, p in enumerate(plevels):
+            if p == "#":
+                break
+            if i >= len(levels) or (p != "+" and p != levels[i]):
+                ok = False
+                break
+        else:
+            ok = len(plevels) == len(levels)
+        if ok:
+            hits.append(pattern)
+    return hits
+
+
+def build_patterns(count, rng):
+    patterns = set()
+    while len(patterns) < count:
+        site = f"site{rng.randrange(50)}"
+        room = f"room{rng.randrange(40)}"
+        kind = rng.choice(["temp", "hum", "co2", "lux"])
+        dev = f"{rng.randrange(1 << 24):06X}"
+        shape = rng.random()
+        if shape < 0.6:
+            patterns.add(f"/{site}/{room}/{kind}/{dev}")
+        elif shape < 0.85:
+            patterns.add(f"/{site}/+/{kind}/{dev}")
+        elif shape < 0.97:
+            patterns.add(f"/{site}/{room}/+/+")
+        else:
+            patterns.add(f"/{site}/{room}/#")
+    return sorted(patterns)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    rng = random.Random(1234)
+
+    patterns = build_patterns(count, rng)
+    trie = TopicTrie()
+    t0 = time.perf_counter()
+    for pattern in patterns:
+        trie.add(pattern, pattern)
+    build_s = time.perf_counter() - t0
+
+    topics = []
+    for _ in range(messages):
+        pattern = rng.choice(patterns)
+        levels = [f"{rng.randrange(1 << 24):06X}" if lvl in ("+", "#") else lvl
+                  for lvl in pattern.split("/")]
+        topics.append("/".join(levels))
+
+    t0 = time.perf_counter()
+    trie_hits = [sorted(trie.match(t)) for t in topics]
+    trie_s = time.perf_counter() - t0
+
+    sample = topics[: max(1, messages // 20)]
+    t0 = time.perf_counter()
+    linear_hits = [sorted(linear_match(patterns, t)) for t in sample]
+    linear_s = time.perf_counter() - t0
+
+    assert linear_hits == trie_hits[: len(sample)], "trie and linear matcher disagree"
+
+    print(f"Subscriptions: {len(trie)} (trie built in {build_s * 1000:.1f} ms)")
+    print(f"TopicTrie : {trie_s / messages * 1e6:8.2f} µs/message over {messages} messages")
+    print(f"Linear    : {linear_s / len(sample) * 1e6:8.2f} µs/message over {len(sample)} messages")
+    print(f"Speed-up  : {(linear_s / len(sample)) / (trie_s / messages):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
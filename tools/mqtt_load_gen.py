@@ -0,0 +1,124 @@
+"""
+MQTT Load Generator — Standalone
+File version: v1.0.0
+Description: Publishes synthetic sensor traffic at a fixed rate to any MQTT broker
+Features:
+- Rates from 1 to 50k msgs/s, spread round-robin over N topics
+- Pre-encoded PUBLISH packets written in 10 ms bursts over a raw socket (no paho overhead)
+- Works against support.local_broker.LocalBroker or a real broker (e.g. mosquitto)
+- Numeric payloads (random walk around 70.0) so tiles exercise their numeric path
+Usage:
+    python tools/mqtt_load_gen.py [--host H] [--port P] [--rate R] [--topics N] [--duration S]
+"""
+
+import argparse
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from support.local_broker import encode_connect, encode_publish  # noqa: E402
+
+TICK = 0.01  # seconds per burst
+
+
+def topic_names(count, prefix="/bench/temp"):
+    return [f"{prefix}/{i:05d}" for i in range(count)]
+
+
+class LoadGenerator:
+    """Paced QoS 0 publisher running in its own thread."""
+
+    def __init__(self, host="127.0.0.1", port=1883, rate=1000, topics=None, seed=42):
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.topics = topics or topic_names(10)
+        self.rng = random.Random(seed)
+        self.sent = 0
+        self.running = False
+        self._thread = None
+        self._sock = None
+
+    def _payload(self, state):
+        state[0] += self.rng.uniform(-0.5, 0.5)
+        return f"{state[0]:.2f}".encode()
+
+    def start(self, duration=None):
+        self._sock = socket.create_connection((self.host, self.port))
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock.sendall(encode_connect(f"loadgen-{os.getpid()}"))
+        self._sock.recv(4)  # CONNACK
+        self.running = True
+        self._thread = threading.Thread(target=self._run, args=(duration,), name="loadgen", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._sock:
+            try:
+                self._sock.sendall(b"\xe0\x00")  # DISCONNECT
+                self._sock.close()
+            except OSError:
+                pass
+
+    def join(self):
+        if self._thread:
+            self._thread.join()
+
+    def _run(self, duration):
+        state = [70.0]
+        n_topics = len(self.topics)
+        index = 0
+        start = time.perf_counter()
+        owed = 0.0
+        next_tick = start
+        while self.running:
+            now = time.perf_counter()
+            if duration is not None and now - start >= duration:
+                break
+            owed += self.rate * TICK
+            burst = int(owed)
+            owed -= burst
+            if burst:
+                packets = []
+                for _ in range(burst):
+                    packets.append(encode_publish(self.topics[index], self._payload(state)))
+                    index = (index + 1) % n_topics
+                try:
+                    self._sock.sendall(b"".join(packets))
+                except OSError:
+                    break
+                self.sent += burst
+            next_tick += TICK
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.running = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic MQTT publisher")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1883)
+    parser.add_argument("--rate", type=int, default=1000, help="messages per second (1–50000)")
+    parser.add_argument("--topics", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    gen = LoadGenerator(args.host, args.port, args.rate, topic_names(args.topics))
+    gen.start(args.duration)
+    gen.join()
+    gen.stop()
+    print(f"Sent {gen.sent} messages over {args.topics} topics in {args.duration:.1f} s "
+          f"({gen.sent / args.duration:.0f} msg/s)")
+
+
+if __name__ == "__main__":
+    main()
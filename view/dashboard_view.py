@@ -5,8 +5,8 @@ Created on Thu Jan  6 16:04:05 2026
 # ================================
 # view/dashboard_view.py
 # ================================
-# File version: v1.3.6
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.3.8
+# Sync'd to dashboard release: v3.10.0
 # Description: DashboardView — manages tile layout and unified styling
 #
 # Features:
@@ -20,6 +20,10 @@ Created on Thu Jan  6 16:04:05 2026
 #		   
 # Feature Update: v1.3.6
 # ✅ Added support for 'weather' tile type in factory
+# Feature Update: v1.3.7
+# ✅ load_config() releases the old tiles' dispatcher subscriptions before rebuilding
+# Feature Update: v1.3.8
+# ✅ Added 'sparkline' tile type in factory
 # ================================
 """
 
@@ -32,6 +36,7 @@ from view.tiles.multiline import MultilineTile
 from view.tiles.dual_text import DualTextTile
 from view.tiles.system_out import SystemOutTile
 from view.tiles.weather import WeatherTile  # ← New import
+from view.tiles.sparkline import SparklineTile
 from config import load_config
 from style import DASHBOARD_STYLE, SCROLL_AREA_STYLE
 
@@ -49,6 +54,8 @@ def create_tile(config, dispatcher):
         return SystemOutTile(config, dispatcher)
     elif tile_type == "weather":
         return WeatherTile(config, dispatcher)
+    elif tile_type == "sparkline":
+        return SparklineTile(config, dispatcher)
     else:
         LOG3(400 + 50, f"Unknown tile type: {tile_type} — falling back to simple_text")
         return SimpleTextTile(config, dispatcher)
@@ -106,6 +113,8 @@ class DashboardView(QWidget):
         LOG3(400 + 1, f"Loading {len(configs)} tiles — rebinding in progress")
 				  
 		   
+        for tile in self.tiles.values():
+            tile.release_subscriptions()
         self._clear_layout()
         self.tiles.clear()
 
@@ -5,12 +5,25 @@ Created on Thu Jan  5 16:04:05 2026
 # ================================
 # view/tiles/base.py
 # ================================
-# File version: v1.0.3
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.0.8
+# Sync'd to dashboard release: v3.10.0
 # Description: BaseTile — common header and initialization for all tiles
 #
 # Feature Update: v1.0.3
 # ✅ Moved header (container, hex_id, title) into BaseTile
+# Feature Update: v1.0.4
+# ✅ subscribe() / subscribe_binding() — tile owns its dispatcher Subscriptions,
+#    release_subscriptions() on reload (and automatically when the widget is destroyed)
+# Feature Update: v1.0.5
+# ✅ subscribe_batch() — one on_batch({channel_key: value}) per frame for multi-channel tiles
+# Feature Update: v1.0.6
+# ✅ schedule() — periodic tile work on the dispatcher's TimingWheel, cancelled with the
+#    tile's subscriptions
+# Feature Update: v1.0.7
+# ✅ subscribe_display() — binding values formatted / classified on the transform pool,
+#    callback only applies the ready Display to widgets
+# Feature Update: v1.0.8
+# ✅ subscribe(key, callback, replay=False) — for event channels whose cached value is not state
 # ================================
 """
 
@@ -18,6 +31,7 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QInputDia
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QCursor
 
+from support.subscription import release_all
 from style import (
     HEADER_GRADIENT, 
     HEADER_STYLE_LINE_1, HEADER_STYLE_LINE_2, BODY_STYLE
@@ -29,6 +43,7 @@ class BaseTile(QWidget):
         self.config = config
         self.dispatcher = dispatcher
         self.tile_id = config["id"]
+        self._subscriptions = []  # dispatcher holds only weakrefs — the tile keeps these alive
         self.height_tiles = config["size"][0]
         self.width_tiles = config["size"][1]
 
@@ -89,4 +104,37 @@ class BaseTile(QWidget):
         new_title, ok = QInputDialog.getText(self, "Edit Title", "Title:", text=self.config["title"])
         if ok:
             self.config["title"] = new_title
-            self.title_label.setText(new_title)
\ No newline at end of file
+            self.title_label.setText(new_title)
+
+    def subscribe(self, key, callback, replay=True):
+        """Register a dispatcher callback owned by this tile (replay: deliver the cached last value)."""
+        sub = self.dispatcher.register_cb(key, callback, owner=self, replay=replay)
+        self._subscriptions.append(sub)
+        return sub
+
+    def subscribe_binding(self, binding, callback):
+        """Register an mqtt binding callback (per-binding options applied) owned by this tile."""
+        sub = self.dispatcher.register_binding(binding, callback, owner=self)
+        self._subscriptions.append(sub)
+        return sub
+
+    def subscribe_display(self, binding, callback, classify=None):
+        """Register a binding whose callback receives a ready Display (text + style state)."""
+        sub = self.dispatcher.register_display(binding, callback, owner=self, classify=classify)
+        self._subscriptions.append(sub)
+        return sub
+
+    def subscribe_batch(self, keys, on_batch):
+        """Receive updates on several channels as one dict per frame (one repaint pass)."""
+        subs = self.dispatcher.register_batch(keys, on_batch, owner=self)
+        self._subscriptions.extend(subs)
+        return subs
+
+    def schedule(self, name, interval, callback, **options):
+        """Periodic tile job on the shared scheduler (see TimingWheel.schedule)."""
+        job = self.dispatcher.scheduler.schedule(f"{self.tile_id}: {name}", interval, callback, **options)
+        self._subscriptions.append(job)
+        return job
+
+    def release_subscriptions(self):
+        release_all(self._subscriptions)
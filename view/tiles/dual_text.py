@@ -5,8 +5,8 @@ Created on Thu Jan  4 16:04:05 2026
 # ================================
 # view/tiles/dual_text.py
 # ================================
-# File version: v1.0.3
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.0.8
+# Sync'd to dashboard release: v3.10.0
 # Description: DualTextTile — dual-value display tile with header
 #
 # Features:
@@ -22,6 +22,18 @@ Created on Thu Jan  4 16:04:05 2026
 # Feature Update: v1.0.3
 # ✅ Refactored to use unified BaseTile (header handled in base)
 # ✅ Only body content remains here
+# Feature Update: v1.0.4
+# ✅ Callbacks consume the pre-parsed MqttMessage (no float() per tile)
+# Feature Update: v1.0.5
+# ✅ Channel keys from binding_channel_key() — honours each binding's "broker"
+# Feature Update: v1.0.6
+# ✅ Registers through dispatcher.register_binding() so per-binding options (rate_limit) apply
+# Feature Update: v1.0.7
+# ✅ Subscribes through BaseTile.subscribe_binding() — released on reload
+# Feature Update: v1.0.8
+# ✅ Format + colour classification run on the dispatcher's transform pool; callbacks
+#    only apply text / colour (stylesheet reset only when the band changes).
+#    Bands overridable per binding via "transform": {"classify": [[50, "cold"], ...]}
 # ================================
 """
 
@@ -39,6 +51,9 @@ from style import (
 
 )
 	 
+# Value bands (upper bound, state) and their colours — blue cold, green normal, red hot
+DEFAULT_BANDS = [[50, "cold"], [80, "normal"], [None, "hot"]]
+BAND_COLORS = {"cold": "#3b82f6", "normal": "#22c55e", "hot": "#ef4444"}
 
 
 class DualTextTile(BaseTile):
@@ -93,48 +108,22 @@ class DualTextTile(BaseTile):
 
         # Register callbacks for primary and secondary subscriptions
         if primary_binding.get("type") == "mqtt":
-            topic = primary_binding["topic"]
-            key = f"mqtt:{topic}"
-            format_str = primary_binding.get("format", "{}")
-            def primary_callback(payload):
-                try:
-                    fahrenheit = float(payload)
-                    celsius = (fahrenheit - 32) * 5 / 9
-                    formatted = format_str.format(fahrenheit, celsius)
-                    color = self.get_color(fahrenheit)
-                    self.primary_value.setStyleSheet(f"color: {color}; {FONT_VALUE}")
-                    self.primary_value.setText(formatted)
-                    # Update hex ID from last field of topic
-                    hex_id = topic.split("/")[-1]
-                    self.hex_id_label.setText(hex_id)
-                except ValueError:
-                    self.primary_value.setText(payload)
-            self.dispatcher.register_cb(key, primary_callback)
+            self.subscribe_display(primary_binding, lambda d: self.show_value(self.primary_value, d),
+                                   classify=DEFAULT_BANDS)
 
         if secondary_binding.get("type") == "mqtt":
-            topic = secondary_binding["topic"]
-            key = f"mqtt:{topic}"
-            format_str = secondary_binding.get("format", "{}")
-            def secondary_callback(payload):
-                try:
-                    fahrenheit = float(payload)
-                    celsius = (fahrenheit - 32) * 5 / 9
-                    formatted = format_str.format(fahrenheit, celsius)
-                    color = self.get_color(fahrenheit)
-                    self.secondary_value.setStyleSheet(f"color: {color}; {FONT_VALUE}")
-                    self.secondary_value.setText(formatted)
-                    # Update hex ID from last field of topic (use secondary if primary not available)
-                    hex_id = topic.split("/")[-1]
-                    self.hex_id_label.setText(hex_id)
-                except ValueError:
-                    self.secondary_value.setText(payload)
-            self.dispatcher.register_cb(key, secondary_callback)
-
-    def get_color(self, value):
-        """Simple value-based coloring (blue cold, green normal, red hot)."""
-        if value < 50:
-            return "#3b82f6"  # Blue
-        elif value < 80:
-            return "#22c55e"  # Green
-        else:
-            return "#ef4444"  # Red
+            self.subscribe_display(secondary_binding, lambda d: self.show_value(self.secondary_value, d),
+                                   classify=DEFAULT_BANDS)
+
+    def show_value(self, label, display):
+        """Apply a ready Display — text always, colour and hex ID for numeric values."""
+        label.setText(display.text)
+        if display.state is None:
+            return
+        if label.property("band") != display.state:
+            label.setProperty("band", display.state)
+            color = BAND_COLORS.get(display.state, display.state)
+            label.setStyleSheet(f"color: {color}; {FONT_VALUE}")
+        # Update hex ID from last field of topic
+        if display.msg is not None:
+            self.hex_id_label.setText(display.msg.topic.split("/")[-1])
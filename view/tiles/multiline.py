@@ -5,8 +5,8 @@ Created on Thu Jan  4 16:04:05 2026
 # ================================
 # view/tiles/multiline.py
 # ================================
-# File version: v1.1.6
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.1.8
+# Sync'd to dashboard release: v3.10.0
 # Description: MultilineTile — sink tile for up to 5 lines of labeled data
 #
 # Features:
@@ -24,6 +24,10 @@ Created on Thu Jan  4 16:04:05 2026
 # Feature Update: v1.1.6
 # ✅ Refactored to use unified BaseTile (header handled in base)
 # ✅ Only body content remains here
+# Feature Update: v1.1.7
+# ✅ Subscribes through BaseTile.subscribe() — released on reload
+# Feature Update: v1.1.8
+# ✅ Lines updated through subscribe_batch() — all changed lines set in one repaint per frame
 # ================================
 """
 
@@ -74,11 +78,21 @@ class MultilineTile(BaseTile):
 
         body_layout.addStretch()
 
-        # Register callbacks with dispatcher
-        for line_num in range(1, 6):
-            prop = props[line_num - 1]
+        # Register one batch callback for all bound lines
+        self.line_index = {}  # "system:<prop>": [line indexes showing it]
+        for idx, prop in enumerate(props):
             if prop:
-                key = f"system:{prop}"
-                callback = lambda v, idx=line_num - 1: self.value_labels[idx].setText(v)
-                self.dispatcher.register_cb(key, callback)
+                self.line_index.setdefault(f"system:{prop}", []).append(idx)
+        if self.line_index:
+            self.subscribe_batch(list(self.line_index), self.on_batch)
+
+    def on_batch(self, values):
+        """All lines that changed this frame, applied with one repaint."""
+        self.setUpdatesEnabled(False)
+        try:
+            for key, value in values.items():
+                for idx in self.line_index.get(key, ()):
+                    self.value_labels[idx].setText(value)
+        finally:
+            self.setUpdatesEnabled(True)
 
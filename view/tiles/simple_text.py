@@ -5,8 +5,8 @@ Created on Thu Jan  4 16:04:05 2026
 # ================================
 # view/tiles/simple_text.py
 # ================================
-# File version: v1.1.2
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.1.7
+# Sync'd to dashboard release: v3.10.0
 # Description: SimpleTextTile — single-value display tile with header
 #
 # Features:
@@ -22,6 +22,17 @@ Created on Thu Jan  4 16:04:05 2026
 # Feature Update: v1.1.2
 # ✅ All styling now imported from style.py (HEADER_STYLE_LINE_1, HEADER_STYLE_LINE_2, BODY_STYLE)
 # ✅ Now uses body container from BaseTile (consistent architecture)
+# Feature Update: v1.1.3
+# ✅ MQTT callback consumes the pre-parsed MqttMessage (no float() per tile)
+# Feature Update: v1.1.4
+# ✅ Channel key from binding_channel_key() — honours the binding's "broker"
+# Feature Update: v1.1.5
+# ✅ Registers through dispatcher.register_binding() so per-binding options (rate_limit) apply
+# Feature Update: v1.1.6
+# ✅ Subscribes through BaseTile.subscribe_binding() — released on reload
+# Feature Update: v1.1.7
+# ✅ Formatting runs on the dispatcher's transform pool (subscribe_display) — the callback
+#    only sets the label; bindings may add a "transform" (convert / smooth)
 # ================================
 """
 
@@ -55,19 +66,8 @@ class SimpleTextTile(BaseTile):
         bindings = config.get("bindings", {})
         value_binding = bindings.get("value", {})
         if value_binding.get("type") == "mqtt":
-            topic = value_binding["topic"]
-            key = f"mqtt:{topic}"
-            format_str = value_binding.get("format", "{}")
-            def mqtt_callback(payload):
-                try:
-                    fahrenheit = float(payload)
-                    celsius = (fahrenheit - 32) * 5 / 9
-                    formatted = format_str.format(fahrenheit, celsius)
-                except ValueError:
-                    formatted = payload
-                self.body_label.setText(formatted)
-            self.dispatcher.register_cb(key, mqtt_callback)
-            LOG3(400 + 30, f"SimpleTextTile registered for MQTT key: {key}")	
+            sub = self.subscribe_display(value_binding, lambda display: self.body_label.setText(display.text))
+            LOG3(400 + 30, f"SimpleTextTile registered for MQTT key: {sub.key}")	
             
         # Static value (initial display)
         if value_binding.get("type") == "static":
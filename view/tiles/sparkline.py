@@ -0,0 +1,205 @@
+"""
+Created on Mon Oct 19 00:05:31 2026
+@author: kmac3
+# ================================
+# view/tiles/sparkline.py
+# ================================
+# File version: v1.0.2
+# Sync'd to dashboard release: v3.10.0
+# Description: SparklineTile — current value with a sparkline of its recent history
+#
+# Features:
+# ✅ Current value fed through subscribe_display() (binding "format" / "transform" apply),
+#    drawn inside the same opaque widget as the line — no styled QLabel to repaint
+# ✅ Sparkline drawn into a cached pixmap; each update paints only the new segment —
+#    once the line spans the width the pixmap is scrolled left by one step
+# ✅ Full redraw only on resize, when a value leaves the current y-range, or once per
+#    window width of points (to re-fit a range that has narrowed)
+# ✅ Pre-filled from the dispatcher's channel history (when kept and no transform is set)
+# ✅ Config: "step_px" (x distance between points, default 3), "points" (kept, default 600)
+# Feature Update: v1.0.1
+# ✅ After a restart with history files the line comes back from disk — the newest stored
+#    point is kept when there is no cached value to replay
+# Feature Update: v1.0.2
+# ✅ paintEvent blits only the dirty rect of the cached pixmap (a new segment, the value
+#    text) instead of the whole widget
+# ✅ Value font kept as .value_font — .font shadowed QWidget.font()
+# Known limitation: 100 tiles at 10 Hz cost ~20–23% of one core (tools/bench_sparkline.py,
+#    offscreen; full redraw per value: ~50%) — per update roughly 40 µs routing / format,
+#    60 µs drawing into the pixmap and ~120 µs of per-widget Qt repaint for line and text.
+#    The per-widget repaint is the floor; large walls should publish at a lower rate
+# ================================
+"""
+
+from collections import deque
+from itertools import islice
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QPointF, QRect
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QPixmap, QPolygonF
+
+from support.broker_pool import binding_channel_key
+from support.myLOG2 import LOG3
+from .base import BaseTile
+from style import DASHBOARD_BG, FONT_FAMILY, TILE_BORDER, TEXT_PRIMARY
+
+PAD = 4  # px above / below the line
+TEXT_HEIGHT = 30  # px reserved above the line for the current value
+
+
+class Sparkline(QWidget):
+    """
+    Current value over a line of recent values. The line is rendered incrementally into
+    a cached pixmap; the value text is drawn on top in paintEvent. One opaque widget per
+    tile, so an update repaints nothing beneath it (a styled QLabel repaints its parents).
+    """
+
+    def __init__(self, step_px=3, points=600, color=TILE_BORDER, background=DASHBOARD_BG, parent=None):
+        super().__init__(parent)
+        self.step = max(1, int(step_px))
+        self.values = deque(maxlen=max(2, int(points)))
+        self.pen = QPen(QColor(color), 2)
+        self.pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+        self.background = QColor(background)
+        self.text = "—"
+        self.text_pen = QPen(QColor(TEXT_PRIMARY))
+        self.value_font = QFont(FONT_FAMILY.split(",")[0])  # not .font — that is QWidget.font()
+        self.value_font.setPixelSize(22)
+        self.pixmap = None
+        self.lo = self.hi = 0.0
+        self.since_fit = 0
+        self.incremental = True  # False = full redraw per value (benchmark baseline)
+        self.full_redraws = 0
+        self.segments = 0
+        self.setMinimumHeight(TEXT_HEIGHT + 40)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+    def capacity(self):
+        """Points that fit across the current width."""
+        return max(2, min(self.values.maxlen, self.width() // self.step + 1))
+
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self.update(QRect(0, 0, self.width(), TEXT_HEIGHT))
+
+    def set_values(self, values):
+        self.values.clear()
+        self.values.extend(values)
+        self._rebuild()
+        self.update()
+
+    def append(self, value):
+        cap = self.capacity()
+        scrolled = len(self.values) >= cap
+        self.values.append(value)
+        self.since_fit += 1
+        if (not self.incremental or self.pixmap is None or not self.lo <= value <= self.hi
+                or self.since_fit >= cap or len(self.values) < 2):
+            self._rebuild()
+            self.update()
+            return
+
+        step = self.step
+        n = min(len(self.values), cap)
+        x1 = (n - 1) * step
+        painter = QPainter(self.pixmap)
+        if scrolled:
+            ratio = self.pixmap.devicePixelRatio()
+            self.pixmap.scroll(int(-step * ratio), 0, self.pixmap.rect())
+            painter.fillRect(QRect(x1 - step + 2, TEXT_HEIGHT, self.width() - x1 + step, self.height()), self.background)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(self.pen)
+        painter.drawLine(QPointF(x1 - step, self._y(self.values[-2])), QPointF(x1, self._y(value)))
+        painter.end()
+        self.segments += 1
+        if scrolled:
+            self.update(QRect(0, TEXT_HEIGHT, self.width(), self.height()))  # moved one step — one blit
+        else:
+            self.update(QRect(x1 - step - 4, TEXT_HEIGHT, step + 8, self.height()))
+
+    def _y(self, value):
+        top = TEXT_HEIGHT + PAD
+        span = self.hi - self.lo
+        usable = self.height() - top - PAD
+        if span <= 0:
+            return top + usable / 2
+        return top + usable * (1 - (value - self.lo) / span)
+
+    def _rebuild(self):
+        """Re-fit the y-range to the visible points and redraw the whole line."""
+        cap = self.capacity()
+        visible = list(islice(self.values, max(0, len(self.values) - cap), None))
+        if visible:
+            lo, hi = min(visible), max(visible)
+            margin = (hi - lo) * 0.1 or abs(hi) * 0.05 or 1.0
+            self.lo, self.hi = lo - margin, hi + margin
+        self.since_fit = 0
+        self.full_redraws += 1
+
+        ratio = self.devicePixelRatioF()
+        self.pixmap = QPixmap(max(1, int(self.width() * ratio)), max(1, int(self.height() * ratio)))
+        self.pixmap.setDevicePixelRatio(ratio)
+        self.pixmap.fill(self.background)
+        if len(visible) < 2:
+            return
+        painter = QPainter(self.pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(self.pen)
+        painter.drawPolyline(QPolygonF([QPointF(i * self.step, self._y(v)) for i, v in enumerate(visible)]))
+        painter.end()
+
+    def _source(self, rect):
+        """Widget rect → pixmap rect (the pixmap is in device pixels)."""
+        ratio = self.pixmap.devicePixelRatio()
+        if ratio == 1:
+            return rect
+        return QRect(int(rect.x() * ratio), int(rect.y() * ratio), int(rect.width() * ratio), int(rect.height() * ratio))
+
+    def resizeEvent(self, event):
+        self._rebuild()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if self.pixmap is None:
+            return
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.drawPixmap(rect, self.pixmap, self._source(rect))
+        if rect.top() < TEXT_HEIGHT:
+            painter.setPen(self.text_pen)
+            painter.setFont(self.value_font)
+            painter.drawText(QRect(0, 0, self.width(), TEXT_HEIGHT), Qt.AlignmentFlag.AlignCenter, self.text)
+        painter.end()
+
+
+class SparklineTile(BaseTile):
+    def __init__(self, config, dispatcher, parent=None):
+        super().__init__(config, dispatcher, parent)
+
+        body_layout = self.body.layout()
+        body_layout.setSpacing(0)
+
+        self.sparkline = Sparkline(config.get("step_px", 3), config.get("points", 600))
+        self.sparkline.setObjectName(f"sparkline-{self.tile_id}")
+        body_layout.addWidget(self.sparkline, stretch=1)
+
+        binding = config.get("bindings", {}).get("value", {})
+        if binding.get("type") == "mqtt":
+            if "transform" not in binding:
+                self.preload(binding_channel_key(binding))
+            sub = self.subscribe_display(binding, self.on_display)
+            LOG3(400 + 31, f"SparklineTile registered for MQTT key: {sub.key}")
+
+    def preload(self, key):
+        """Start from the channel's stored history (the newest point comes with the replay, if any)."""
+        series = self.dispatcher.history(key)
+        if series is not None and len(series) > 1:
+            replayed = self.dispatcher.last_value(key) is not None
+            _, values = series.last(self.sparkline.values.maxlen + replayed)
+            self.sparkline.set_values((values[:-1] if replayed else values).tolist())
+
+    def on_display(self, display):
+        self.sparkline.set_text(display.text)
+        if display.value is not None:
+            self.sparkline.append(display.value)
@@ -5,8 +5,8 @@ Created on Thu Jan  4 16:04:05 2026
 # ================================
 # view/tiles/system_out.py
 # ================================
-# File version: v1.0.4
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.0.6
+# Sync'd to dashboard release: v3.10.0
 # Description: SystemOutTile — scrollable console-style tile for debug/system output
 #
 # Features:
@@ -22,6 +22,11 @@ Created on Thu Jan  4 16:04:05 2026
 # ✅ Added objectName() naming for tile, header, console
 # Feature Update: v1.0.4
 # ✅ Refactored to use unified BaseTile (header in base, only body content here)													 
+# Feature Update: v1.0.5
+# ✅ Subscribes through BaseTile.subscribe() — released on reload
+# Feature Update: v1.0.6
+# ✅ No replay of the cached "debug:system_out" value — a reload no longer re-appends the
+#    previous registration dump
 # ================================
 """
 
@@ -64,7 +69,7 @@ class SystemOutTile(BaseTile):
         key = "debug:system_out"
         def output_callback(message: str):																				  
             self.append_output(message)
-        self.dispatcher.register_cb(key, output_callback)
+        self.subscribe(key, output_callback, replay=False)  # log lines, not state
 
     def append_output(self, message: str):
         """Append message and auto-scroll to bottom."""
@@ -5,8 +5,8 @@ Created on Thu Jan  6 16:04:05 2026
 # ================================
 # view/tiles/weather.py
 # ================================
-# File version: v1.0.0
-# Sync'd to dashboard release: v3.9.0
+# File version: v1.0.6
+# Sync'd to dashboard release: v3.10.0
 # Description: WeatherTile — current and forecast weather with local temp integration
 #
 # Features:
@@ -16,19 +16,39 @@ Created on Thu Jan  6 16:04:05 2026
 # ✅ Last updated timestamp
 # ✅ Integration with local indoor/outdoor MQTT temps
 # ✅ Uses WeatherAPI.com
+#
+# Feature Update: v1.0.1
+# ✅ Local temp callbacks receive the pre-parsed MqttMessage
+# Feature Update: v1.0.2
+# ✅ Local temp channel keys built with mqtt_channel_key()
+# Feature Update: v1.0.3
+# ✅ Local temperature feeds subscribed through BaseTile.subscribe() — released on reload
+# Feature Update: v1.0.4
+# ✅ 15-min poll runs on the shared scheduler (BaseTile.schedule) instead of its own QTimer
+# Feature Update: v1.0.5
+# ✅ requests imported on first fetch — layouts without a weather tile never load it
+# Feature Update: v1.0.6
+# ✅ One lazy import — every fetch goes through _http_get()
 # ================================
 """
 
-import requests
 from datetime import datetime
 from PyQt6.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QWidget, QGridLayout
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 
+from support.broker_pool import mqtt_channel_key
 from .base import BaseTile
 from style import BODY_STYLE, FONT_LABEL, TEXT_SECONDARY
 
 
+def _http_get(url, **kwargs):
+    """requests.get — requests is imported on the first fetch, not with the tile module."""
+    import requests
+
+    return requests.get(url, **kwargs)
+
+
 class WeatherTile(BaseTile):
     def __init__(self, config, dispatcher, parent=None):
         super().__init__(config, dispatcher, parent)
@@ -68,19 +88,16 @@ class WeatherTile(BaseTile):
         forecast_widget.setLayout(self.forecast_grid)
         body_layout.addWidget(forecast_widget)
 
-        # Poll timer
-        self.poll_timer = QTimer()
-        self.poll_timer.timeout.connect(self.fetch_weather)
-        self.poll_timer.start(900000)  # 15 min
-        self.fetch_weather()
+        # Poll job — shared scheduler, first fetch now
+        self.schedule("weather", 900, self.fetch_weather, jitter=30, run_now=True)
 
         # Register for local temps if configured
         if self.indoor_topic:
-            key = f"mqtt:{self.indoor_topic}"
-            self.dispatcher.register_cb(key, lambda v: self.update_local_temp("indoor", v))
+            key = mqtt_channel_key(self.indoor_topic)
+            self.subscribe(key, lambda v: self.update_local_temp("indoor", v))
         if self.outdoor_topic:
-            key = f"mqtt:{self.outdoor_topic}"
-            self.dispatcher.register_cb(key, lambda v: self.update_local_temp("outdoor", v))
+            key = mqtt_channel_key(self.outdoor_topic)
+            self.subscribe(key, lambda v: self.update_local_temp("outdoor", v))
 
     def fetch_weather(self):
         if not self.api_key:
@@ -89,7 +106,7 @@ class WeatherTile(BaseTile):
 
         url = f"http://api.weatherapi.com/v1/forecast.json?key={self.api_key}&q={self.location}&days=7&aqi=no&alerts=no"
         try:
-            response = requests.get(url, timeout=10)
+            response = _http_get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
             now = datetime.now().strftime("%b %d %H:%M")
@@ -106,7 +123,7 @@ class WeatherTile(BaseTile):
         self.current_desc.setText(desc)
 
         icon_url = "https:" + current["condition"]["icon"]
-        icon_data = requests.get(icon_url).content
+        icon_data = _http_get(icon_url).content
         pixmap = QPixmap()
         pixmap.loadFromData(icon_data)
         self.current_icon.setPixmap(pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio))
@@ -128,7 +145,7 @@ class WeatherTile(BaseTile):
             label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             label.setStyleSheet(f"color: {TEXT_SECONDARY}; {FONT_LABEL}")
 
-            icon_data = requests.get(icon_url).content
+            icon_data = _http_get(icon_url).content
             pixmap = QPixmap()
             pixmap.loadFromData(icon_data)
             icon = QLabel()
@@ -138,6 +155,6 @@ class WeatherTile(BaseTile):
             self.forecast_grid.addWidget(icon, 0, i)
             self.forecast_grid.addWidget(label, 1, i)
 
-    def update_local_temp(self, which, payload):
+    def update_local_temp(self, which, msg):
         # Placeholder — future: show indoor/outdoor in current section
-        print(f"{which.capitalize()} temp: {payload}")
\ No newline at end of file
+        print(f"{which.capitalize()} temp: {msg.value}")
\ No newline at end of file